@@ -2,7 +2,6 @@
 
 import sys
 import os
-import time
 
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
@@ -17,16 +16,13 @@ def demo_neurobloom_workflow():
     print("🧠 Neurobloom AI Analysis Demo")
     print("=" * 40)
     
-    # Start mock server
-    server = MockNeuroBloomServer(port=8082)
+    # Start mock server on a free port (start() waits until it is ready)
+    server = MockNeuroBloomServer()
     server.start()
     
     try:
-        # Wait for server readiness
-        time.sleep(1)
-        
         # Create client
-        client = NeuroBloomClient('http://127.0.0.1:8082')
+        client = NeuroBloomClient(server.url)
         
         # Test health check
         print("🏥 Health Check...")
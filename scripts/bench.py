@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Load-test NeuroBloomClient against MockNeuroBloomServer (or a live URL).
+
+Examples:
+    python scripts/bench.py
+    python scripts/bench.py --concurrency 1 8 32 --payload-rows 10 1000 \\
+        --latency lognormal:0.05,0.5 --output bench.json
+    python scripts/bench.py --baseline bench.json   # fail on regressions
+    python scripts/bench.py --engine fast --workers 4 --concurrency 64
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.neurobloom.bench import (
+    DEFAULT_MIX,
+    compare_results,
+    make_requests,
+    parse_mix,
+    run_load,
+    write_results,
+)
+from tests.integration.fast_mock_server import FastMockServer
+from tests.integration.mock_server import Latency, MockNeuroBloomServer
+
+
+def _latency_spec(spec: str) -> str:
+    """Validate a ``Latency.parse`` spec but keep the string (worker processes parse it)."""
+    try:
+        Latency.parse(spec)
+    except (ValueError, TypeError) as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return spec
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='benchmark a running server instead of the mock')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='requests per run (default: 200)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--payload-rows', type=int, nargs='+', default=[10])
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='analysis type weights, e.g. time_series=0.7,classification=0.3')
+    parser.add_argument('--latency', type=_latency_spec, default=None,
+                        help='mock latency: fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA')
+    parser.add_argument('--engine', choices=['flask', 'fast'], default='flask',
+                        help='mock engine: Flask, or multi-process asyncio (default: flask)')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='worker processes for --engine fast (default: 2)')
+    parser.add_argument('--output', help='write machine-readable results to this JSON file')
+    parser.add_argument('--baseline', help='compare against a previous --output file')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed fractional regression vs. baseline')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    server = None
+    url = args.url
+    if url is None:
+        if args.engine == 'fast':
+            latency = args.latency if args.latency is not None else 0.1
+            server = FastMockServer(workers=args.workers, latency=latency)
+        else:
+            latency = Latency.parse(args.latency) if args.latency else None
+            server = MockNeuroBloomServer(latency=latency)
+        server.start()
+        url = server.url
+
+    results = []
+    try:
+        for rows in args.payload_rows:
+            requests = make_requests(args.requests, payload_rows=rows, mix=args.mix)
+            for concurrency in args.concurrency:
+                result = run_load(
+                    url, requests, concurrency=concurrency,
+                    name=f'analyze/rows={rows}/c={concurrency}',
+                    config={'payload_rows': rows, 'mix': args.mix}
+                )
+                print(result.format())
+                results.append(result)
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.output:
+        write_results(results, args.output)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(args.baseline, results, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
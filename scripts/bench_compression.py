@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Bytes on the wire and latency per request body encoding.
+
+Sends analyses of several payload sizes to MockNeuroBloomServer (or a
+live URL) uncompressed and with each supported encoding.
+
+Usage: python scripts/bench_compression.py [--url URL] [--rows 100 1000 10000]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.neurobloom import jsonutil
+from src.neurobloom.client import NeuroBloomClient
+from src.neurobloom.compression import ENCODINGS, compress
+from src.neurobloom.models import AnalysisRequest
+from tests.integration.mock_server import MockNeuroBloomServer
+
+
+def make_request(rows: int) -> AnalysisRequest:
+    data = [
+        {"timestamp": f"2024-01-{i % 28 + 1:02d}T{i % 24:02d}:00:00", "value": i * 0.37,
+         "region": ("north", "south", "east", "west")[i % 4]}
+        for i in range(rows)
+    ]
+    return AnalysisRequest(data=data, analysis_type="time_series")
+
+
+def bench(url: str, rows_list, iterations: int):
+    print(f"{'rows':>7} {'encoding':<9} {'wire bytes':>11} {'ratio':>6} "
+          f"{'encode ms':>10} {'p50 ms':>8}")
+    for rows in rows_list:
+        request = make_request(rows)
+        body = jsonutil.dumps(request.to_dict())
+        for encoding in (None,) + ENCODINGS:
+            start = time.perf_counter()
+            wire = compress(body, encoding) if encoding else body
+            encode = time.perf_counter() - start
+
+            client = NeuroBloomClient(url, compression=encoding)
+            latencies = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                client.analyze_data(request)
+                latencies.append(time.perf_counter() - start)
+            client.close()
+
+            print(f"{rows:>7} {encoding or 'identity':<9} {len(wire):>11} "
+                  f"{len(body) / len(wire):>6.1f} {encode * 1000:>10.2f} "
+                  f"{statistics.median(latencies) * 1000:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='benchmark a running server instead of the mock')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args(argv)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    if args.url:
+        bench(args.url, args.rows, args.iterations)
+        return
+    server = MockNeuroBloomServer()
+    server.start()
+    try:
+        bench(server.url, args.rows, args.iterations)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
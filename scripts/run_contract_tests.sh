@@ -15,9 +15,13 @@ pytest tests/unit/ -v
 echo "📋 Running integration tests..."
 pytest tests/integration/ -v
 
-# Run contract tests (when implemented)
-echo "📋 Running contract tests..."
-# pytest tests/contract/ -v
+# Run contract tests: consumer tests write pact-contracts/, then providers
+# verify them (unchanged interactions are skipped via .pact-cache/)
+echo "📋 Running consumer contract tests..."
+pytest tests/contract/consumer/ -v
+
+echo "📋 Running provider verification..."
+pytest tests/contract/provider/ -v
 
 # Generate coverage report
 echo "📊 Generating coverage report..."
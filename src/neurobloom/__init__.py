@@ -0,0 +1,58 @@
+"""NeuroBloom AI client, service and tooling.
+
+The public names below are imported from their submodules on first
+access, so importing the package (or just its models) does not load
+``requests``, ``openai``, ``httpx`` or ``numpy``.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AnalysisRequest": "models",
+    "AnalysisResponse": "models",
+    "BatchItemResult": "models",
+    "ValidationError": "models",
+    "NeuroBloomClient": "client",
+    "AsyncNeuroBloomClient": "async_client",
+    "PooledNeuroBloomClient": "pool",
+    "NeuroBloomService": "service",
+    "create_app": "server",
+    "Metrics": "metrics",
+    "MemoryCache": "cache",
+    "SQLiteCache": "cache",
+    "RateLimiter": "ratelimit",
+    "RetryPolicy": "ratelimit",
+    "PromptBuilder": "prompts",
+    "ModelRouter": "routing",
+    "Tier": "routing",
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .async_client import AsyncNeuroBloomClient
+    from .cache import MemoryCache, SQLiteCache
+    from .client import NeuroBloomClient
+    from .metrics import Metrics
+    from .models import AnalysisRequest, AnalysisResponse, BatchItemResult, ValidationError
+    from .pool import PooledNeuroBloomClient
+    from .prompts import PromptBuilder
+    from .ratelimit import RateLimiter, RetryPolicy
+    from .routing import ModelRouter, Tier
+    from .server import create_app
+    from .service import NeuroBloomService
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,155 @@
+"""Command line tools: ``python -m src.neurobloom {health,analyze,bench,verify}``.
+
+Only argparse is loaded up front; each subcommand imports what it uses,
+so ``--help`` and argument errors return without loading ``requests``.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Iterator, Optional
+
+DEFAULT_URL = os.environ.get("NEUROBLOOM_URL", "http://localhost:8080")
+
+
+def _read_rows(path: str, ndjson: bool):
+    """Rows from a JSON array file, or lazily from an NDJSON file (``-``: stdin)."""
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    if not ndjson:
+        with source:
+            return json.load(source)
+
+    def rows() -> Iterator[dict]:
+        with source:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+    return rows()
+
+
+def _client(args):
+    from .client import NeuroBloomClient
+    return NeuroBloomClient(args.url, timeout=args.timeout, compression=args.compression)
+
+
+def health(args) -> int:
+    """Print the server's health; exit 1 unless it is healthy."""
+    client = _client(args)
+    try:
+        status = client.health_check()
+    finally:
+        client.close()
+    print(json.dumps(status, indent=2))
+    return 0 if status.get("status") == "healthy" else 1
+
+
+def analyze(args) -> int:
+    """Analyze rows from a file and print the response as JSON."""
+    from .models import AnalysisRequest
+
+    request = AnalysisRequest(
+        data=_read_rows(args.file, args.ndjson),
+        analysis_type=args.type,
+        model=args.model,
+    )
+    client = _client(args)
+    try:
+        result = client.analyze_data(request)
+    finally:
+        client.close()
+    print(json.dumps(result.to_dict(), indent=2))
+    return 0
+
+
+def bench(args) -> int:
+    """Load-test a running server and print throughput and latency."""
+    from .bench import DEFAULT_MIX, make_requests, parse_mix, run_load
+
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    requests = make_requests(args.requests, payload_rows=args.payload_rows, mix=mix)
+    for concurrency in args.concurrency:
+        result = run_load(
+            args.url, requests, concurrency=concurrency,
+            name=f"analyze/rows={args.payload_rows}/c={concurrency}",
+        )
+        print(result.format())
+    return 0
+
+
+def verify(args) -> int:
+    """Verify Pact files against every ``--env``; exit 1 if any interaction fails."""
+    from .contracts import VerificationMatrix, pact_files
+
+    environments = {"default": args.url}
+    if args.env:
+        environments = dict(env.split("=", 1) for env in args.env)
+    paths = pact_files(args.pacts)
+    if not paths:
+        raise ValueError(f"no pact files in {args.pacts}")
+    report = VerificationMatrix(
+        environments, max_concurrency=args.concurrency, timeout=args.timeout
+    ).verify_files(paths)
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+    return 0 if report.passed else 1
+
+
+def _environment(value: str) -> str:
+    if "=" not in value:
+        raise argparse.ArgumentTypeError(f"expected NAME=URL, got {value!r}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.neurobloom", description="NeuroBloom AI command line tools."
+    )
+    parser.add_argument("--url", default=DEFAULT_URL,
+                        help="server base URL (default: $NEUROBLOOM_URL or %(default)s)")
+    parser.add_argument("--timeout", type=int, default=30, help="request timeout in seconds")
+    parser.add_argument("--compression", choices=["gzip", "zstd"],
+                        help="compress request bodies")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("health", help="check the server's /health").set_defaults(run=health)
+
+    analyze_parser = commands.add_parser("analyze", help="analyze rows from a file")
+    analyze_parser.add_argument("file",
+                                help="JSON array of rows, or NDJSON with --ndjson; - for stdin")
+    analyze_parser.add_argument("--type", default="time_series", help="analysis type")
+    analyze_parser.add_argument("--model", default="gpt-4")
+    analyze_parser.add_argument("--ndjson", action="store_true",
+                                help="stream one row per line instead of loading a JSON array")
+    analyze_parser.set_defaults(run=analyze)
+
+    bench_parser = commands.add_parser("bench", help="load-test a running server")
+    bench_parser.add_argument("--requests", type=int, default=200, help="requests per run")
+    bench_parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    bench_parser.add_argument("--payload-rows", type=int, default=10)
+    bench_parser.add_argument("--mix",
+                              help="analysis type weights, e.g. time_series=0.7,classification=0.3")
+    bench_parser.set_defaults(run=bench)
+
+    verify_parser = commands.add_parser("verify", help="verify pacts against several environments")
+    verify_parser.add_argument("--env", action="append", type=_environment, metavar="NAME=URL",
+                               help="provider environment, repeatable (default: --url)")
+    verify_parser.add_argument("--pacts", default="pact-contracts", help="directory of pact files")
+    verify_parser.add_argument("--concurrency", type=int, default=32,
+                               help="interactions in flight across all environments")
+    verify_parser.add_argument("--json", action="store_true", help="print the matrix as JSON")
+    verify_parser.set_defaults(run=verify)
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    """CLI entry point; returns the exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
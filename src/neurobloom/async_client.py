@@ -0,0 +1,132 @@
+"""Asyncio HTTP client for Neurobloom AI service."""
+
+import asyncio
+from typing import AsyncIterator, Dict, Iterable
+
+import httpx
+
+from . import jsonutil
+from .models import AnalysisRequest, AnalysisResponse
+from .streaming import NDJSON_CONTENT_TYPE, encode_ndjson
+
+
+_DONE = object()
+
+
+async def _aiter(chunks):
+    """Adapt a sync chunk iterator for httpx's async transport.
+
+    Chunks are produced on a worker thread, so encoding rows (or a slow
+    source generator) never blocks the event loop.
+    """
+    chunks = iter(chunks)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, _DONE)
+        if chunk is _DONE:
+            return
+        yield chunk
+
+
+class AsyncNeuroBloomClient:
+    """Async HTTP client with a pooled keep-alive transport."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 30,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20
+    ):
+        """Initialize client with base URL, timeout and pool limits."""
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = httpx.AsyncClient(
+            headers={
+                'Content-Type': 'application/json',
+                'User-Agent': 'neurobloom-client/1.0'
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            timeout=timeout
+        )
+
+    async def analyze_data(self, request: AnalysisRequest) -> AnalysisResponse:
+        """Send data for AI analysis."""
+        url = f"{self.base_url}/api/v1/analyze"
+
+        try:
+            if request.is_streaming:
+                response = await self.session.post(
+                    url,
+                    content=_aiter(encode_ndjson(request)),
+                    headers={'Content-Type': NDJSON_CONTENT_TYPE}
+                )
+            else:
+                response = await self.session.post(
+                    url, content=jsonutil.dumps(request.to_dict())
+                )
+
+            if response.status_code == 200:
+                return AnalysisResponse.from_json(response.content)
+            else:
+                raise Exception(
+                    f"Analysis failed: {response.status_code} - {response.text}"
+                )
+
+        except httpx.HTTPError as e:
+            raise Exception(f"Request failed: {str(e)}")
+
+    async def analyze_many(
+        self,
+        requests: Iterable[AnalysisRequest],
+        concurrency: int = 10
+    ) -> AsyncIterator[AnalysisResponse]:
+        """Analyze many requests, yielding responses as they complete.
+
+        At most ``concurrency`` requests are in flight at once; the input
+        iterable is consumed lazily so it may be arbitrarily long.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        pending = set()
+        source = iter(requests)
+        try:
+            while True:
+                for request in source:
+                    pending.add(asyncio.ensure_future(self.analyze_data(request)))
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def health_check(self) -> Dict:
+        """Check service health."""
+        url = f"{self.base_url}/health"
+
+        try:
+            response = await self.session.get(url, timeout=5)
+            return response.json()
+        except httpx.HTTPError as e:
+            raise Exception(f"Health check failed: {str(e)}")
+
+    async def close(self):
+        """Close the session."""
+        await self.session.aclose()
+
+    async def __aenter__(self) -> 'AsyncNeuroBloomClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
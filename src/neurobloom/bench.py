@@ -0,0 +1,199 @@
+"""Load generation and latency statistics for NeuroBloomClient."""
+
+import json
+import platform
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .client import NeuroBloomClient
+from .models import AnalysisRequest
+
+
+DEFAULT_MIX = {"time_series": 0.5, "classification": 0.3, "sales_forecasting": 0.2}
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and latency summary for one load run."""
+    name: str
+    requests: int
+    errors: int
+    duration: float
+    throughput: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    config: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def format(self) -> str:
+        """One-line human-readable summary (latencies in ms)."""
+        return (
+            f"{self.name}: {self.requests} req, {self.errors} err, "
+            f"{self.throughput:.1f} req/s, p50={self.p50 * 1e3:.1f}ms "
+            f"p95={self.p95 * 1e3:.1f}ms p99={self.p99 * 1e3:.1f}ms"
+        )
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile (``q`` in 0..100) of sorted values."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize_latencies(
+    name: str,
+    latencies: List[float],
+    errors: int,
+    duration: float,
+    config: Optional[Dict] = None
+) -> BenchmarkResult:
+    """Build a BenchmarkResult from raw per-request latencies (seconds)."""
+    ordered = sorted(latencies)
+    total = len(ordered) + errors
+    return BenchmarkResult(
+        name=name,
+        requests=total,
+        errors=errors,
+        duration=duration,
+        throughput=total / duration if duration else 0.0,
+        mean=sum(ordered) / len(ordered) if ordered else 0.0,
+        p50=percentile(ordered, 50),
+        p95=percentile(ordered, 95),
+        p99=percentile(ordered, 99),
+        max=ordered[-1] if ordered else 0.0,
+        config=config or {}
+    )
+
+
+def make_requests(
+    count: int,
+    payload_rows: int = 10,
+    mix: Optional[Dict[str, float]] = None,
+    seed: int = 0
+) -> List[AnalysisRequest]:
+    """Build a reproducible request set with a weighted analysis-type mix."""
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    types = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    rows = [
+        {"timestamp": f"2024-01-{i % 28 + 1:02d}", "value": i * 10, "region": "north"}
+        for i in range(payload_rows)
+    ]
+    return [AnalysisRequest(data=rows, analysis_type=t, model="gpt-4") for t in types]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``"time_series=0.5,classification=0.5"`` into weights."""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def run_load(
+    base_url: str,
+    requests: Sequence[AnalysisRequest],
+    concurrency: int = 8,
+    name: str = "analyze",
+    client_factory: Callable[[str], NeuroBloomClient] = NeuroBloomClient,
+    config: Optional[Dict] = None
+) -> BenchmarkResult:
+    """Send ``requests`` with ``concurrency`` worker threads and time each call.
+
+    Every worker owns one client (and therefore one keep-alive session).
+    """
+    local = threading.local()
+    clients = []
+    clients_lock = threading.Lock()
+
+    def call(request: AnalysisRequest):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = client_factory(base_url)
+            with clients_lock:
+                clients.append(client)
+        start = time.perf_counter()
+        try:
+            client.analyze_data(request)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(call, requests))
+    duration = time.perf_counter() - started
+
+    for client in clients:
+        client.close()
+
+    latencies = [o for o in outcomes if o is not None]
+    config = dict(config or {}, concurrency=concurrency)
+    return summarize_latencies(
+        name, latencies, len(outcomes) - len(latencies), duration, config
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results: List[BenchmarkResult], path: str):
+    """Write results plus environment metadata as JSON."""
+    document = {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [r.to_dict() for r in results],
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def compare_results(baseline_path: str, results: List[BenchmarkResult],
+                    tolerance: float = 0.10) -> List[str]:
+    """Return regressions versus a previous ``write_results`` file.
+
+    A run regresses when its p95 grows or its throughput drops by more than
+    ``tolerance`` (fractional) against the same-named baseline run.
+    """
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        old = baseline.get(result.name)
+        if old is None:
+            continue
+        if old["p95"] and result.p95 > old["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: p95 {old['p95'] * 1e3:.1f}ms -> {result.p95 * 1e3:.1f}ms"
+            )
+        if old["throughput"] and result.throughput < old["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: throughput {old['throughput']:.1f} -> "
+                f"{result.throughput:.1f} req/s"
+            )
+    return regressions
@@ -0,0 +1,171 @@
+"""Response caches for OpenAI analysis results."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional
+
+from . import jsonutil
+
+
+def make_cache_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+    """Return a canonical content hash for one completion request."""
+    canonical = json.dumps(
+        [prompt, model, float(temperature), int(max_tokens)],
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache(ABC):
+    """Base class for insight caches.
+
+    Subclasses implement ``_get``/``_set``; hit and miss counting lives here
+    so every backend reports the same stats.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Return cached insights for ``key`` or None."""
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, insights: List[str]):
+        """Store insights under ``key``."""
+        self._set(key, insights)
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters."""
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[List[str]]:
+        """Stored insights for ``key``, or None when absent or expired."""
+
+    @abstractmethod
+    def _set(self, key: str, insights: List[str]):
+        """Store ``insights`` under ``key``."""
+
+
+class MemoryCache(AnalysisCache):
+    """In-memory LRU cache with per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        """Initialize with a maximum entry count and TTL in seconds."""
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, insights = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(insights)
+
+    def _set(self, key: str, insights: List[str]):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, list(insights))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache(AnalysisCache):
+    """On-disk cache in a SQLite file that survives restarts.
+
+    Expired rows are purged on open and every ``purge_every`` writes, so
+    keys that are never read again do not accumulate.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 86400, purge_every: int = 1000):
+        """Open (or create) the cache database at ``path``."""
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS insights ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+        self.purge()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM insights").fetchone()[0]
+
+    def purge(self) -> int:
+        """Delete every expired row; return how many were removed."""
+        with self._lock:
+            return self._purge()
+
+    def _purge(self) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM insights WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),)
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def _get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM insights WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute("DELETE FROM insights WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return jsonutil.loads(value)
+
+    def _set(self, key: str, insights: List[str]):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO insights (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, jsonutil.dumps(insights), expires_at)
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
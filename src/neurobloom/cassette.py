@@ -0,0 +1,264 @@
+"""Record/replay cassettes for the OpenAI HTTP backend.
+
+A ``Cassette`` is an append-only on-disk store of HTTP responses keyed by
+a canonical request hash. ``CassetteTransport`` is an httpx transport that
+answers from the cassette and/or records what an upstream transport
+returns; give it to the service through ``openai_http_client``:
+
+    cassette = Cassette("recordings/openai.cassette")
+    transport = CassetteTransport(cassette, mode="replay")
+    service = NeuroBloomService("unused", openai_http_client=httpx.Client(transport=transport))
+
+Layout: the data file is a sequence of records ``digest | length | meta
+line | body``; ``<path>.idx`` holds fixed-size ``digest | offset | length``
+entries, loaded into a dict on open. Replay reads records through a
+memory map, so a lookup is one dict probe plus one slice. A later record
+for the same request supersedes earlier ones.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+
+
+_RECORD_HEADER = struct.Struct(">32sI")
+_INDEX_ENTRY = struct.Struct(">32sQI")
+
+# Describe the stored (already decoded) body, so they must not be replayed
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+# Transient upstream failures are passed through but never recorded
+_TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+
+MODES = ("replay", "record", "auto")
+
+
+class CassetteMiss(LookupError):
+    """A replay-only cassette has no recording for a request."""
+
+
+def request_key(request: httpx.Request) -> bytes:
+    """SHA-256 digest of the request's method, path, query and body.
+
+    Headers (API keys, user agents) and the host are left out, and JSON
+    bodies are hashed with sorted keys, so a recording replays against any
+    base URL and for any key order.
+    """
+    body = request.read()
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':')).encode()
+    except ValueError:
+        pass
+    url = request.url
+    query = sorted(parse_qsl(url.query.decode() if isinstance(url.query, bytes) else url.query))
+    canonical = json.dumps([request.method, url.path, query], separators=(',', ':'))
+    return hashlib.sha256(canonical.encode() + b"\n" + body).digest()
+
+
+@dataclass
+class Recording:
+    """One stored response."""
+    status: int
+    headers: List[Tuple[str, str]]
+    content: bytes
+    elapsed: float = 0.0
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status, headers=self.headers, content=self.content, request=request
+        )
+
+
+class Cassette:
+    """Append-only, indexed store of recorded responses."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._map: Optional[mmap.mmap] = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Opened in append mode so a crash can never truncate earlier records
+        self._data = open(path, "ab")
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._index
+
+    def get(self, key: bytes) -> Optional[Recording]:
+        """The latest recording for ``key``, or None."""
+        location = self._index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        data = self._mapped(offset + length)
+        record = data[offset + _RECORD_HEADER.size:offset + length]
+        meta, content = record.split(b"\n", 1)
+        meta = json.loads(meta)
+        return Recording(
+            meta["status"], [tuple(h) for h in meta["headers"]], content, meta["elapsed"]
+        )
+
+    def put(self, key: bytes, recording: Recording):
+        """Append a recording; it supersedes any earlier one for ``key``."""
+        meta = json.dumps({
+            "status": recording.status,
+            "headers": recording.headers,
+            "elapsed": recording.elapsed,
+        }, separators=(',', ':')).encode()
+        payload = meta + b"\n" + recording.content
+        record = _RECORD_HEADER.pack(key, len(payload)) + payload
+        with self._lock:
+            offset = self._data.tell()
+            self._data.write(record)
+            self._data.flush()
+            with open(self.index_path, "ab") as index:
+                index.write(_INDEX_ENTRY.pack(key, offset, len(record)))
+            self._index[key] = (offset, len(record))
+
+    def close(self):
+        with self._lock:
+            self._data.close()
+            self._map = None
+
+    def _mapped(self, end: int) -> mmap.mmap:
+        """A read-only map of the data file covering at least ``end`` bytes."""
+        data = self._map
+        if data is None or len(data) < end:
+            with self._lock:
+                if self._map is None or len(self._map) < end:
+                    # Readers may still hold the old map; it closes when released
+                    with open(self.path, "rb") as f:
+                        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._map
+        return data
+
+    def _load_index(self):
+        """Load ``<path>.idx``, then index any records it is missing.
+
+        Records are written before their index entry, so after a crash the
+        data file may run ahead of the index; the tail is rescanned and a
+        torn final record is truncated away.
+        """
+        indexed_end = 0
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b""
+        usable = len(raw) - len(raw) % _INDEX_ENTRY.size
+        for key, offset, length in _INDEX_ENTRY.iter_unpack(raw[:usable]):
+            self._index[key] = (offset, length)
+            indexed_end = max(indexed_end, offset + length)
+        if usable != len(raw):
+            with open(self.index_path, "r+b") as f:
+                f.truncate(usable)
+
+        size = self._data.tell()
+        if size <= indexed_end:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(indexed_end)
+            tail = f.read()
+        position, missing = 0, []
+        while position + _RECORD_HEADER.size <= len(tail):
+            key, payload_length = _RECORD_HEADER.unpack_from(tail, position)
+            length = _RECORD_HEADER.size + payload_length
+            if position + length > len(tail):
+                break
+            missing.append((key, indexed_end + position, length))
+            position += length
+        if position != len(tail):
+            self._data.truncate(indexed_end + position)
+            self._data.seek(0, os.SEEK_END)
+        if missing:
+            with open(self.index_path, "ab") as index:
+                for key, offset, length in missing:
+                    index.write(_INDEX_ENTRY.pack(key, offset, length))
+                    self._index[key] = (offset, length)
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """httpx transport replaying and/or recording through a ``Cassette``.
+
+    ``mode`` is ``"replay"`` (never touch the network; unknown requests
+    raise ``CassetteMiss``), ``"record"`` (always forward to ``transport``
+    and store the response) or ``"auto"`` (replay when recorded, otherwise
+    record). Transient upstream failures (429, 5xx) are not recorded, so
+    the retried request's answer is what gets replayed. Replayed responses
+    are delayed by ``latency`` seconds, or by the originally recorded
+    duration with ``realtime=True``.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = "replay",
+        transport: Optional[httpx.BaseTransport] = None,
+        latency: Optional[float] = None,
+        realtime: bool = False
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+        self.transport = transport or httpx.HTTPTransport()
+        self.latency = latency
+        self.realtime = realtime
+        self.replayed = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        if self.mode != "record":
+            recording = self.cassette.get(key)
+            if recording is not None:
+                delay = recording.elapsed if self.realtime else self.latency
+                if delay:
+                    time.sleep(delay)
+                with self._lock:
+                    self.replayed += 1
+                return recording.to_response(request)
+            if self.mode == "replay":
+                raise CassetteMiss(
+                    f"No recording for {request.method} {request.url.path} ({key.hex()[:12]})"
+                )
+        return self._record(key, request)
+
+    def _record(self, key: bytes, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        recording = Recording(
+            response.status_code,
+            [(name, value) for name, value in response.headers.items()
+             if name.lower() not in _DROPPED_HEADERS],
+            content,
+            time.perf_counter() - start,
+        )
+        if recording.status not in _TRANSIENT_STATUSES:
+            self.cassette.put(key, recording)
+            with self._lock:
+                self.recorded += 1
+        return recording.to_response(request)
+
+    def close(self):
+        self.transport.close()
@@ -1,36 +1,172 @@
 """HTTP client for Neurobloom AI service."""
 
+import threading
+import time
 import requests
-from typing import Dict
-from .models import AnalysisRequest, AnalysisResponse
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from . import jsonutil
+from .compression import DEFAULT_MIN_SIZE, ENCODINGS, compress, compress_stream
+from .metrics import NULL_METRICS, Metrics
+from .models import AnalysisRequest, AnalysisResponse, BatchItemResult, ValidationError
+from .streaming import NDJSON_CONTENT_TYPE, encode_ndjson
+
+
+REQUEST_SECONDS = "neurobloom_client_request_seconds"
+
+_connect_time = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_time.seconds = getattr(_connect_time, 'seconds', 0.0) + (
+            time.perf_counter() - start
+        )
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect_time.seconds = getattr(_connect_time, 'seconds', 0.0) + (
+            time.perf_counter() - start
+        )
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """Adapter whose connections record TCP/TLS connect time per thread."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
 
 
 class NeuroBloomClient:
     """HTTP client for interacting with Neurobloom AI service."""
     
-    def __init__(self, base_url: str, timeout: int = 30):
-        """Initialize client with base URL and timeout."""
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 30,
+        metrics: Optional[Metrics] = None,
+        max_retries: int = 0,
+        compression: Optional[str] = None,
+        compress_min_size: int = DEFAULT_MIN_SIZE
+    ):
+        """Initialize client with base URL and timeout.
+        
+        ``max_retries`` retries connection errors with exponential backoff,
+        and 502/503/504 responses to idempotent requests (GETs). POSTs are
+        only retried when the connection failed before the request was
+        sent, since a proxy error may follow an analysis the server
+        already accepted. Streamed NDJSON bodies cannot be replayed, so
+        leave it at 0 when streaming. Pass ``metrics`` to record
+        connect/TTFB/total timings per endpoint plus status and retry counts.
+        ``compression`` (``"gzip"`` or ``"zstd"``) encodes request bodies of
+        at least ``compress_min_size`` bytes, and streamed bodies always;
+        compressed responses are decoded transparently.
+        """
+        if compression is not None and compression not in ENCODINGS:
+            raise ValueError(f"compression must be one of {ENCODINGS}, got {compression!r}")
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.compression = compression
+        self.compress_min_size = compress_min_size
+        self.metrics = metrics or NULL_METRICS
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'neurobloom-client/1.0'
         })
+        adapter = _TimedAdapter(max_retries=Retry(
+            total=max_retries,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        ))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def _send(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, recording timings when metrics are enabled.
+        
+        Phases: ``connect`` (0 when a keep-alive connection is reused),
+        ``ttfb`` (request sent until response headers parsed) and ``total``
+        (including reading the body, unless ``stream=True``).
+        """
+        if not self.metrics.enabled:
+            return self.session.request(method, url, **kwargs)
+        
+        _connect_time.seconds = 0.0
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.metrics.inc("neurobloom_client_requests_total", endpoint=endpoint, status="error")
+            raise
+        total = time.perf_counter() - start
+        
+        metrics = self.metrics
+        metrics.observe(REQUEST_SECONDS, _connect_time.seconds, endpoint=endpoint, phase="connect")
+        metrics.observe(REQUEST_SECONDS, response.elapsed.total_seconds(),
+                        endpoint=endpoint, phase="ttfb")
+        metrics.observe(REQUEST_SECONDS, total, endpoint=endpoint, phase="total")
+        metrics.inc("neurobloom_client_requests_total",
+                    endpoint=endpoint, status=str(response.status_code))
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None and retries.history:
+            metrics.inc("neurobloom_client_retries_total", len(retries.history), endpoint=endpoint)
+        return response
+    
+    def _encode(self, body, headers: Optional[Dict] = None):
+        """Compress a request body (bytes, or NDJSON chunks) when configured."""
+        if self.compression is None:
+            return body, headers
+        if isinstance(body, bytes):
+            if len(body) < self.compress_min_size:
+                return body, headers
+            body = compress(body, self.compression)
+        else:
+            body = compress_stream(body, self.compression)
+        return body, dict(headers or {}, **{'Content-Encoding': self.compression})
     
     def analyze_data(self, request: AnalysisRequest) -> AnalysisResponse:
-        """Send data for AI analysis."""
+        """Send data for AI analysis.
+        
+        Iterable (non-list) data is streamed as chunked NDJSON so the full
+        body is never built in memory.
+        """
         url = f"{self.base_url}/api/v1/analyze"
         
         try:
-            response = self.session.post(
-                url,
-                json=request.to_dict(),
-                timeout=self.timeout
+            if request.is_streaming:
+                body, headers = self._encode(
+                    encode_ndjson(request), {'Content-Type': NDJSON_CONTENT_TYPE}
+                )
+            else:
+                body, headers = self._encode(jsonutil.dumps(request.to_dict()))
+            response = self._send(
+                "analyze", "POST", url, data=body, headers=headers, timeout=self.timeout
             )
             
             if response.status_code == 200:
-                return AnalysisResponse.from_dict(response.json())
+                return AnalysisResponse.from_json(response.content)
             else:
                 raise Exception(
                     f"Analysis failed: {response.status_code} - {response.text}"
@@ -39,12 +175,185 @@ class NeuroBloomClient:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {str(e)}")
     
+    def analyze_stream(self, request: AnalysisRequest) -> Iterator[str]:
+        """Yield insights as the service produces them.
+        
+        Each insight arrives as soon as its bullet is complete rather than
+        after the whole completion. Raises if the analysis fails, after
+        yielding any insights received before the failure.
+        """
+        url = f"{self.base_url}/api/v1/analyze/stream"
+        
+        try:
+            if request.is_streaming:
+                body, headers = self._encode(
+                    encode_ndjson(request), {'Content-Type': NDJSON_CONTENT_TYPE}
+                )
+            else:
+                body, headers = self._encode(jsonutil.dumps(request.to_dict()))
+            response = self._send(
+                "analyze_stream", "POST", url,
+                data=body, headers=headers, timeout=self.timeout, stream=True
+            )
+            
+            with response:
+                if response.status_code != 200:
+                    raise Exception(
+                        f"Analysis failed: {response.status_code} - {response.text}"
+                    )
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = jsonutil.loads(line)
+                    if "insight" in event:
+                        yield event["insight"]
+                    elif "result" in event:
+                        result = AnalysisResponse.from_dict(event["result"], "result.")
+                        if result.status != "completed":
+                            raise Exception(
+                                f"Analysis failed: {result.raw_data.get('error', result.status)}"
+                            )
+                        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+    
+    def submit(self, request: AnalysisRequest) -> str:
+        """Queue an analysis on the server and return its id without waiting.
+        
+        Use ``wait`` or ``wait_many`` to collect results. Streamed
+        (iterable) data is not supported here; use ``analyze_data``.
+        """
+        if request.is_streaming:
+            raise ValueError("submit() needs list data; use analyze_data() to stream")
+        url = f"{self.base_url}/api/v1/analyze"
+        
+        try:
+            body, headers = self._encode(
+                jsonutil.dumps(dict(request.to_dict(), **{"async": True}))
+            )
+            response = self._send(
+                "submit", "POST", url, data=body, headers=headers, timeout=self.timeout
+            )
+            
+            if response.status_code == 202:
+                return AnalysisResponse.from_json(response.content).id
+            else:
+                raise Exception(
+                    f"Submit failed: {response.status_code} - {response.text}"
+                )
+                
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+    
+    def get_analysis(self, analysis_id: str) -> AnalysisResponse:
+        """Fetch a submitted analysis; ``done`` is False while it is pending."""
+        url = f"{self.base_url}/api/v1/analyses/{analysis_id}"
+        
+        try:
+            response = self._send("get_analysis", "GET", url, timeout=self.timeout)
+            
+            if response.status_code == 200:
+                return AnalysisResponse.from_json(response.content)
+            else:
+                raise Exception(
+                    f"Analysis lookup failed: {response.status_code} - {response.text}"
+                )
+                
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+    
+    def wait(
+        self,
+        analysis_id: str,
+        timeout: Optional[float] = None,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 5.0
+    ) -> AnalysisResponse:
+        """Poll until a submitted analysis finishes and return it.
+        
+        The polling interval grows by half each round up to
+        ``max_poll_interval``. Raises TimeoutError after ``timeout`` seconds.
+        """
+        return self.wait_many([analysis_id], timeout, poll_interval, max_poll_interval)[0]
+    
+    def wait_many(
+        self,
+        analysis_ids: List[str],
+        timeout: Optional[float] = None,
+        poll_interval: float = 0.5,
+        max_poll_interval: float = 5.0
+    ) -> List[AnalysisResponse]:
+        """Poll until every submitted analysis finishes; results keep input order."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        finished: Dict[str, AnalysisResponse] = {}
+        pending = list(dict.fromkeys(analysis_ids))
+        interval = poll_interval
+        
+        while True:
+            still_pending = []
+            for analysis_id in pending:
+                result = self.get_analysis(analysis_id)
+                if result.done:
+                    finished[analysis_id] = result
+                else:
+                    still_pending.append(analysis_id)
+            pending = still_pending
+            if not pending:
+                return [finished[analysis_id] for analysis_id in analysis_ids]
+            
+            sleep = interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"{len(pending)} analyses still pending after {timeout}s"
+                    )
+                sleep = min(sleep, remaining)
+            time.sleep(sleep)
+            interval = min(interval * 1.5, max_poll_interval)
+    
+    def analyze_batch(
+        self, requests_: List[AnalysisRequest]
+    ) -> List[BatchItemResult]:
+        """Send many analyses in one request; results keep input order.
+        
+        The batch is one JSON body, so iterable ``data`` is read into a list.
+        """
+        url = f"{self.base_url}/api/v1/analyze/batch"
+        items = [
+            dict(r.to_dict(), data=list(r.data)) if r.is_streaming else r.to_dict()
+            for r in requests_
+        ]
+        
+        try:
+            body, headers = self._encode(jsonutil.dumps({"requests": items}))
+            response = self._send(
+                "analyze_batch", "POST", url, data=body, headers=headers, timeout=self.timeout
+            )
+            
+            if response.status_code == 200:
+                body = jsonutil.loads(response.content)
+                if not isinstance(body, dict) or not isinstance(body.get("results"), list):
+                    raise ValidationError("results", "expected list")
+                results = [
+                    BatchItemResult.from_dict(item, f"results[{i}].")
+                    for i, item in enumerate(body["results"])
+                ]
+                return sorted(results, key=lambda r: r.index)
+            else:
+                raise Exception(
+                    f"Batch analysis failed: {response.status_code} - {response.text}"
+                )
+                
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+    
     def health_check(self) -> Dict:
         """Check service health."""
         url = f"{self.base_url}/health"
         
         try:
-            response = self.session.get(url, timeout=5)
+            response = self._send("health", "GET", url, timeout=5)
             return response.json()
         except requests.exceptions.RequestException as e:
             raise Exception(f"Health check failed: {str(e)}")
@@ -0,0 +1,265 @@
+"""HTTP body compression: gzip and, when ``zstandard`` is installed, zstd.
+
+The client compresses request bodies above a size threshold (streamed
+NDJSON bodies always, chunk by chunk). On the server side ``install``
+decompresses request bodies with a cap on the decompressed size, so a
+small "zip bomb" cannot expand without bound, and compresses responses
+the client accepts.
+"""
+
+import io
+import zlib
+from typing import Iterable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# Preferred first when negotiating response encodings
+ENCODINGS = (ZSTD, GZIP) if zstandard is not None else (GZIP,)
+
+DEFAULT_MAX_DECOMPRESSED_SIZE = 256 * 1024 * 1024
+DEFAULT_MIN_SIZE = 1024
+
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_READ_SIZE = 64 * 1024
+# zstd input is fed in slices this small: its decompressobj has no output
+# cap, and one compressed byte may expand to a few hundred KB
+_ZSTD_SLICE = 1024
+_DECOMPRESSED = "neurobloom.decompressed"
+
+
+class DecompressionError(Exception):
+    """A compressed request body was rejected; ``status`` is the HTTP answer."""
+    status = 400
+
+
+class DecompressionLimitExceeded(DecompressionError):
+    status = 413
+
+
+class UnsupportedEncoding(DecompressionError):
+    status = 415
+
+
+def _check(encoding: str):
+    if encoding not in ENCODINGS:
+        raise UnsupportedEncoding(f"Unsupported Content-Encoding: {encoding}")
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress ``data`` in one shot."""
+    _check(encoding)
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, _GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str,
+                    level: Optional[int] = None) -> Iterator[bytes]:
+    """Compress an iterable of chunks lazily, for chunked request bodies."""
+    _check(encoding)
+    if encoding == ZSTD:
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+        finish = compressor.flush
+    else:
+        compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, _GZIP_WBITS)
+        finish = compressor.flush
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield finish()
+
+
+def decompress(data: bytes, encoding: str,
+               max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE) -> bytes:
+    """Decompress ``data``, raising once the output would exceed ``max_size``."""
+    return open_decompressed(io.BytesIO(data), encoding, max_size).read()
+
+
+class _RawDecompressor(io.RawIOBase):
+    """Decompresses a file-like ``source`` on read, never past ``max_size``."""
+
+    def __init__(self, source, encoding: str, max_size: int):
+        _check(encoding)
+        self.encoding = encoding
+        self.max_size = max_size
+        self.produced = 0
+        self._source = source
+        if encoding == ZSTD:
+            self._inflater = zstandard.ZstdDecompressor().decompressobj()
+            self._input, self._input_offset = b"", 0
+            self._output, self._output_offset = b"", 0
+        else:
+            self._inflater = zlib.decompressobj(_GZIP_WBITS)
+            self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        # Ask for one byte more than allowed so overflow is detected exactly
+        size = min(len(buffer), self.max_size - self.produced + 1)
+        errors = (zlib.error, EOFError) + ((zstandard.ZstdError,) if zstandard else ())
+        try:
+            data = self._read(size)
+        except errors as e:
+            raise DecompressionError(f"Invalid {self.encoding} body: {e}")
+        self.produced += len(data)
+        if self.produced > self.max_size:
+            raise DecompressionLimitExceeded(
+                f"Decompressed body exceeds {self.max_size} bytes"
+            )
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _read(self, size: int) -> bytes:
+        if self.encoding == ZSTD:
+            return self._read_zstd(size)
+        while True:
+            if self._pending:
+                data = self._inflater.decompress(self._pending, size)
+                self._pending = self._inflater.unconsumed_tail
+            else:
+                chunk = self._source.read(_READ_SIZE)
+                if not chunk:
+                    if not self._inflater.eof:
+                        raise EOFError("truncated stream")
+                    return b""
+                data = self._inflater.decompress(chunk, size)
+                self._pending = self._inflater.unconsumed_tail
+            if data:
+                return data
+            if self._inflater.eof:
+                return b""
+
+    def _read_zstd(self, size: int) -> bytes:
+        while self._output_offset >= len(self._output):
+            if self._inflater.eof:
+                return b""
+            if self._input_offset >= len(self._input):
+                self._input, self._input_offset = self._source.read(_READ_SIZE), 0
+                if not self._input:
+                    raise EOFError("truncated stream")
+            end = self._input_offset + _ZSTD_SLICE
+            self._output = self._inflater.decompress(
+                memoryview(self._input)[self._input_offset:end]
+            )
+            self._output_offset, self._input_offset = 0, end
+        end = self._output_offset + size
+        data = self._output[self._output_offset:end]
+        self._output_offset = end
+        return data
+
+
+def open_decompressed(source, encoding: str,
+                      max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE) -> io.BufferedReader:
+    """Buffered, line-iterable reader of the decompressed ``source``."""
+    return io.BufferedReader(_RawDecompressor(source, encoding, max_size), _READ_SIZE)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """The preferred supported encoding the ``Accept-Encoding`` header allows.
+
+    An explicitly listed coding wins over ``*``, so ``gzip;q=0, *`` never
+    picks gzip.
+    """
+    qualities = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = params.strip()
+        try:
+            value = float(quality[2:]) if quality.startswith('q=') else 1.0
+        except ValueError:
+            continue
+        qualities[name.strip().lower()] = value
+    wildcard = qualities.get('*', 0)
+    for encoding in ENCODINGS:
+        if qualities.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def install(
+    app,
+    max_decompressed_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE,
+    min_size: int = DEFAULT_MIN_SIZE
+):
+    """Add request decompression and response compression to a Flask app.
+
+    Compressed request bodies are decompressed as they are read; the
+    compressed size is still bounded by ``MAX_CONTENT_LENGTH``. Errors
+    answer 400 (corrupt), 413 (too large) or 415 (unknown encoding).
+    Buffered responses of at least ``min_size`` bytes are compressed;
+    streamed ones are left alone so events are not held back.
+    """
+    from flask import jsonify, request
+    from werkzeug.wsgi import LimitedStream
+
+    wsgi_app = app.wsgi_app
+
+    def decompressing_app(environ, start_response):
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding and encoding != 'identity':
+            length = environ.get('CONTENT_LENGTH')
+            max_length = app.config.get('MAX_CONTENT_LENGTH')
+            error = None
+            if encoding not in ENCODINGS:
+                error = UnsupportedEncoding(f"Unsupported Content-Encoding: {encoding}")
+            elif length and max_length is not None and int(length) > max_length:
+                error = DecompressionLimitExceeded(f"Compressed body exceeds {max_length} bytes")
+            if error is not None:
+                with app.request_context(environ):
+                    return app.make_response(_error(error))(environ, start_response)
+
+            source = environ['wsgi.input']
+            if length:
+                source = LimitedStream(source, int(length))
+            environ['wsgi.input'] = open_decompressed(source, encoding, max_decompressed_size)
+            environ['wsgi.input_terminated'] = True
+            environ[_DECOMPRESSED] = True
+            environ.pop('CONTENT_LENGTH', None)
+            del environ['HTTP_CONTENT_ENCODING']
+        return wsgi_app(environ, start_response)
+
+    @app.before_request
+    def lift_content_limit():
+        # MAX_CONTENT_LENGTH was checked against the compressed size above.
+        # None would fall back to it, and Werkzeug silently truncates at the
+        # limit, so leave room for the decompressor to raise past its cap.
+        if request.environ.get(_DECOMPRESSED):
+            request.max_content_length = max_decompressed_size + 1
+
+    def _error(e: DecompressionError):
+        response = jsonify({'error': str(e)})
+        response.status_code = e.status
+        return response
+
+    app.wsgi_app = decompressing_app
+    app.register_error_handler(DecompressionError, _error)
+
+    @app.after_request
+    def compress_response(response):
+        if (response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.status_code < 200 or response.status_code in (204, 304)):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    return app
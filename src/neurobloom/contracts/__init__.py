@@ -0,0 +1,31 @@
+"""Pact contract tooling: in-process consumer mocking, matching and provider verification."""
+
+from .matchers import EachLike, Like, Term
+from .matrix import MatrixReport, VerificationMatrix
+from .pactfile import fingerprint_paths, interaction_hash, load_pact, pact_files, write_pact
+from .transport import InProcessPact, PactTransport
+from .verifier import (
+    InteractionResult,
+    ProviderVerifier,
+    VerificationCache,
+    VerificationReport,
+)
+
+__all__ = [
+    "EachLike",
+    "InProcessPact",
+    "InteractionResult",
+    "Like",
+    "MatrixReport",
+    "PactTransport",
+    "ProviderVerifier",
+    "Term",
+    "VerificationCache",
+    "VerificationMatrix",
+    "VerificationReport",
+    "fingerprint_paths",
+    "interaction_hash",
+    "load_pact",
+    "pact_files",
+    "write_pact",
+]
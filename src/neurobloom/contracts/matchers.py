@@ -0,0 +1,82 @@
+"""Flexible-match markers for contract bodies (Pact v3 matching rules).
+
+Wrap example values in ``Like``, ``EachLike`` or ``Term`` when declaring
+an interaction; ``extract`` turns the marked-up body into the concrete
+example plus the matching rules recorded in the Pact file.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Tuple
+
+
+class Matcher(ABC):
+    """Base class for flexible-match markers."""
+
+    @abstractmethod
+    def example(self) -> Any:
+        """The concrete value sent or served in place of the marker."""
+
+    @abstractmethod
+    def rule(self) -> Dict:
+        """The Pact matching rule recorded for the marker's path."""
+
+
+class Like(Matcher):
+    """Any value of the same JSON type as ``value`` (cascades into objects)."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def example(self):
+        return self.value
+
+    def rule(self) -> Dict:
+        return {"match": "type"}
+
+
+class EachLike(Matcher):
+    """An array of at least ``minimum`` items, each like ``value``."""
+
+    def __init__(self, value, minimum: int = 1):
+        self.value = value
+        self.minimum = minimum
+
+    def example(self):
+        return [self.value] * max(self.minimum, 1)
+
+    def rule(self) -> Dict:
+        return {"match": "type", "min": self.minimum}
+
+
+class Term(Matcher):
+    """A string fully matching ``regex``; ``example`` is sent/served."""
+
+    def __init__(self, regex: str, example: str):
+        self.regex = regex
+        self.value = example
+
+    def example(self):
+        return self.value
+
+    def rule(self) -> Dict:
+        return {"match": "regex", "regex": self.regex}
+
+
+def extract(body, path: str = "$") -> Tuple[Any, Dict[str, Dict]]:
+    """Split a marked-up body into ``(example, rules)`` keyed by JSON path."""
+    rules: Dict[str, Dict] = {}
+
+    def walk(value, path):
+        if isinstance(value, Matcher):
+            rules[path] = value.rule()
+            if isinstance(value, EachLike):
+                item = walk(value.value, f"{path}[*]")
+                return [item] * max(value.minimum, 1)
+            return walk(value.example(), path)
+        if isinstance(value, dict):
+            return {key: walk(item, f"{path}.{key}") for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item, f"{path}[{i}]") for i, item in enumerate(value)]
+        return value
+
+    return walk(body, path), rules
@@ -0,0 +1,131 @@
+"""Pact body and header matching.
+
+Values are compared for equality unless a matching rule applies to their
+path. ``type`` rules (optionally with ``min``/``max`` for arrays) and
+``regex`` rules are supported, plus the v3 ``integer``/``decimal``/
+``number`` matchers. A rule cascades to everything below its path, and
+the most specific rule wins. Objects may carry keys the contract does not
+mention.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+
+class Rules:
+    """Matching rules looked up by concrete JSON path (``$.a[0].b``)."""
+
+    def __init__(self, rules: Dict[str, Dict]):
+        # Deeper paths first, then concrete indexes/keys before wildcards
+        self._rules = sorted(
+            ((_path_pattern(path), (-len(path), path.count('*')), rule)
+             for path, rule in rules.items()),
+            key=lambda item: item[1]
+        )
+
+    def lookup(self, path: str) -> Optional[Dict]:
+        """The most specific rule whose path matches ``path``."""
+        for pattern, _, rule in self._rules:
+            if pattern.fullmatch(path):
+                return rule
+        return None
+
+
+def _path_pattern(path: str):
+    pattern = re.escape(path)
+    pattern = pattern.replace(r'\[\*\]', r'\[\d+\]').replace(r'\.\*', r'\.[^.\[]+')
+    return re.compile(pattern)
+
+
+def _json_type(value) -> str:
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    if isinstance(value, dict):
+        return 'object'
+    return 'null'
+
+
+def compare_body(expected, actual, rules: Rules, path: str = '$',
+                 inherited: Optional[Dict] = None) -> List[str]:
+    """Return mismatch descriptions (empty when ``actual`` satisfies ``expected``)."""
+    rule = rules.lookup(path) or inherited
+    match = rule.get('match') if rule else None
+
+    if match == 'regex':
+        if not isinstance(actual, str) or not re.fullmatch(rule['regex'], actual):
+            return [f"{path}: expected to match /{rule['regex']}/, got {actual!r}"]
+        return []
+    if match == 'integer':
+        if isinstance(actual, bool) or not isinstance(actual, int):
+            return [f"{path}: expected an integer, got {actual!r}"]
+        return []
+    if match in ('decimal', 'number'):
+        if _json_type(actual) != 'number':
+            return [f"{path}: expected a number, got {actual!r}"]
+        return []
+
+    if _json_type(expected) != _json_type(actual):
+        return [f"{path}: expected {_json_type(expected)}, got {_json_type(actual)}"]
+
+    by_type = match == 'type' or (rule is not None and ('min' in rule or 'max' in rule))
+    if isinstance(expected, dict):
+        errors = []
+        for key, value in expected.items():
+            if key not in actual:
+                errors.append(f"{path}.{key}: missing")
+            else:
+                errors.extend(compare_body(
+                    value, actual[key], rules, f"{path}.{key}", rule if by_type else None
+                ))
+        return errors
+
+    if isinstance(expected, list):
+        if by_type:
+            errors = []
+            if 'min' in rule and len(actual) < rule['min']:
+                errors.append(f"{path}: expected at least {rule['min']} items, got {len(actual)}")
+            if 'max' in rule and len(actual) > rule['max']:
+                errors.append(f"{path}: expected at most {rule['max']} items, got {len(actual)}")
+            if expected:
+                for i, item in enumerate(actual):
+                    errors.extend(compare_body(expected[0], item, rules, f"{path}[{i}]", rule))
+            return errors
+        if len(expected) != len(actual):
+            return [f"{path}: expected {len(expected)} items, got {len(actual)}"]
+        errors = []
+        for i, (want, got) in enumerate(zip(expected, actual)):
+            errors.extend(compare_body(want, got, rules, f"{path}[{i}]"))
+        return errors
+
+    if by_type or expected == actual:
+        return []
+    return [f"{path}: expected {expected!r}, got {actual!r}"]
+
+
+def compare_headers(expected: Dict[str, str], actual, rules: Dict[str, Dict]) -> List[str]:
+    """Check expected headers are present in ``actual`` (case-insensitive names)."""
+    errors = []
+    lowered = {name.lower(): value for name, value in actual.items()}
+    lowered_rules = {name.lower(): rule for name, rule in rules.items()}
+    for name, value in expected.items():
+        got = lowered.get(name.lower())
+        if got is None:
+            errors.append(f"header {name}: missing")
+            continue
+        rule = lowered_rules.get(name.lower())
+        if rule and rule.get('match') == 'regex':
+            if not re.fullmatch(rule['regex'], got):
+                errors.append(f"header {name}: expected to match /{rule['regex']}/, got {got!r}")
+        elif _normalize_header(value) != _normalize_header(got):
+            errors.append(f"header {name}: expected {value!r}, got {got!r}")
+    return errors
+
+
+def _normalize_header(value: str) -> str:
+    return re.sub(r'\s*([;,])\s*', r'\1', value.strip())
@@ -0,0 +1,170 @@
+"""Verifying one set of Pact files against many provider environments at once.
+
+    matrix = VerificationMatrix({'staging': staging_url, 'prod': prod_url})
+    report = matrix.verify_files(pact_files('pact-contracts'))
+    print(report.format())
+
+Every (environment, interaction) pair is a task on one thread pool, so
+``max_concurrency`` bounds the requests in flight across all environments.
+Each environment gets its own session whose connection pool holds at most
+``connections_per_endpoint`` connections. Tasks are ordered interaction by
+interaction, so all environments make progress together and checking ten
+environments takes about as long as checking one.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .pactfile import interaction_hash, load_pact
+from .verifier import InteractionResult, ProviderVerifier, VerificationReport
+
+
+EnvironmentStateHandler = Callable[[str, str], None]
+
+
+@dataclass
+class MatrixReport:
+    """Results per environment, each aligned with ``interactions``."""
+    environments: List[str]
+    interactions: List[str]
+    results: Dict[str, List[InteractionResult]] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return all(r.passed for results in self.results.values() for r in results)
+
+    @property
+    def failures(self) -> List[Tuple[str, InteractionResult]]:
+        """(environment, result) for every failed interaction."""
+        return [
+            (environment, result)
+            for environment in self.environments
+            for result in self.results[environment]
+            if not result.passed
+        ]
+
+    def report(self, environment: str) -> VerificationReport:
+        """One environment's results as a ``VerificationReport``."""
+        return VerificationReport(list(self.results[environment]))
+
+    def format(self) -> str:
+        """A pass/fail table with latency per cell, followed by every failure."""
+        width = max([len('interaction')] + [len(i) for i in self.interactions])
+        columns = [max(len(e), len('FAIL 9999ms')) for e in self.environments]
+        lines = ['  '.join(
+            ['interaction'.ljust(width)] + [e.ljust(c) for e, c in zip(self.environments, columns)]
+        )]
+        for index, description in enumerate(self.interactions):
+            cells = []
+            for environment, column in zip(self.environments, columns):
+                result = self.results[environment][index]
+                cell = f"{'PASS' if result.passed else 'FAIL'} {result.duration * 1000:.0f}ms"
+                cells.append(cell.ljust(column))
+            lines.append('  '.join([description.ljust(width)] + cells))
+        lines.append(
+            f"{len(self.environments)} environments x {len(self.interactions)} interactions "
+            f"in {self.elapsed:.2f}s, {len(self.failures)} failed"
+        )
+        for environment, result in self.failures:
+            lines.append(f"FAILED [{environment}] {result.description}")
+            lines.extend(f"  {error}" for error in result.errors)
+        return "\n".join(line.rstrip() for line in lines)
+
+    def to_dict(self) -> Dict:
+        return {
+            'passed': self.passed,
+            'elapsed': self.elapsed,
+            'interactions': self.interactions,
+            'environments': {
+                environment: [
+                    {'passed': r.passed, 'duration': r.duration, 'errors': r.errors}
+                    for r in self.results[environment]
+                ]
+                for environment in self.environments
+            },
+        }
+
+
+class VerificationMatrix:
+    """Verifies Pact files against every environment in ``environments``.
+
+    ``environments`` maps a name to the provider's base URL.
+    ``state_handler`` is called with the environment name and each provider
+    state before that environment replays the interaction; it must tolerate
+    concurrent calls.
+    """
+
+    def __init__(
+        self,
+        environments: Dict[str, str],
+        max_concurrency: int = 32,
+        connections_per_endpoint: int = 8,
+        state_handler: Optional[EnvironmentStateHandler] = None,
+        timeout: float = 10
+    ):
+        if not environments:
+            raise ValueError("at least one environment is required")
+        self.environments = dict(environments)
+        self.max_concurrency = max_concurrency
+        self.connections_per_endpoint = connections_per_endpoint
+        self.state_handler = state_handler
+        self.timeout = timeout
+
+    def _session(self) -> requests.Session:
+        # pool_block makes extra threads wait for a connection rather than
+        # opening (and then discarding) more than the pool holds
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.connections_per_endpoint, pool_block=True
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _verifier(self, name: str, base_url: str) -> ProviderVerifier:
+        handler = partial(self.state_handler, name) if self.state_handler else None
+        return ProviderVerifier(
+            base_url, state_handler=handler, timeout=self.timeout, session=self._session()
+        )
+
+    def verify_files(self, paths: Iterable[str]) -> MatrixReport:
+        """Verify every interaction in the given Pact files in every environment."""
+        return self.verify_pacts([load_pact(path) for path in paths])
+
+    def verify_pacts(self, pacts: List[Dict]) -> MatrixReport:
+        """Verify loaded Pact documents in every environment."""
+        interactions = [i for pact in pacts for i in pact.get('interactions', [])]
+        keys = [interaction_hash(i) for i in interactions]
+        verifiers = {
+            name: self._verifier(name, url) for name, url in self.environments.items()
+        }
+        tasks = [(name, index) for index in range(len(interactions)) for name in verifiers]
+
+        start = time.perf_counter()
+        try:
+            workers = max(1, min(self.max_concurrency, len(tasks)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(
+                    lambda task: verifiers[task[0]].verify_interaction(
+                        interactions[task[1]], keys[task[1]]
+                    ),
+                    tasks
+                ))
+        finally:
+            for verifier in verifiers.values():
+                verifier.session.close()
+
+        report = MatrixReport(
+            list(verifiers), [i.get('description', '') for i in interactions],
+            {name: [] for name in verifiers}, time.perf_counter() - start
+        )
+        for (name, _), result in zip(tasks, outcomes):
+            report.results[name].append(result)
+        return report
@@ -0,0 +1,133 @@
+"""Reading Pact files and fingerprinting interactions and provider code."""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List
+
+
+PACT_SPECIFICATION = "3.0.0"
+
+
+def load_pact(path: str) -> Dict:
+    """Load one Pact file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_pact(
+    path: str,
+    consumer: str,
+    provider: str,
+    interactions: List[Dict],
+    merge: bool = False
+):
+    """Write a Pact v3 file atomically.
+
+    With ``merge`` the file's existing interactions are kept unless one
+    with the same description and provider states is being written.
+    """
+    if merge and os.path.exists(path):
+        keys = {interaction_identity(i) for i in interactions}
+        existing = load_pact(path).get('interactions', [])
+        kept = [i for i in existing if interaction_identity(i) not in keys]
+        interactions = kept + list(interactions)
+
+    document = {
+        'consumer': {'name': consumer},
+        'provider': {'name': provider},
+        'interactions': list(interactions),
+        'metadata': {'pactSpecification': {'version': PACT_SPECIFICATION}},
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def interaction_identity(interaction: Dict):
+    """What makes two interactions "the same" in a file: description and states."""
+    return interaction.get('description'), tuple(provider_states(interaction))
+
+
+def pact_files(directory: str) -> List[str]:
+    """Pact files in ``directory``, sorted by name."""
+    return sorted(glob.glob(os.path.join(directory, '*.json')))
+
+
+def spec_version(pact: Dict) -> str:
+    """The file's Pact specification version (v2 when not stated)."""
+    metadata = pact.get('metadata', {})
+    spec = metadata.get('pactSpecification') or metadata.get('pact-specification') or {}
+    return spec.get('version', '2.0.0')
+
+
+def interaction_hash(interaction: Dict) -> str:
+    """Stable hash of an interaction's full contract (key order ignored)."""
+    canonical = json.dumps(interaction, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def provider_states(interaction: Dict) -> List[str]:
+    """Names of the provider states an interaction needs (v2 or v3 form)."""
+    if 'providerStates' in interaction:
+        return [state['name'] for state in interaction['providerStates']]
+    state = interaction.get('providerState')
+    return [state] if state else []
+
+
+def matching_rules(part: Dict, section: str) -> Dict[str, Dict]:
+    """Matching rules of a request/response ``section`` keyed by path.
+
+    ``section`` is ``'body'`` (paths like ``$.insights[*]``) or
+    ``'header'`` (header names). v2 rules (``$.body.x``) and v3 rules
+    (``{"body": {"$.x": {"matchers": [...]}}}``) are both normalized to
+    a single rule dict per path.
+    """
+    rules = part.get('matchingRules') or {}
+    if any(not key.startswith('$') for key in rules):
+        normalized = {}
+        for path, rule in rules.get(section, {}).items():
+            matchers = rule.get('matchers', [rule])
+            normalized[path] = dict(matchers[0]) if matchers else {}
+        return normalized
+
+    prefix = '$.body' if section == 'body' else '$.headers.'
+    normalized = {}
+    for path, rule in rules.items():
+        if not path.startswith(prefix):
+            continue
+        if section == 'body':
+            normalized['$' + path[len(prefix):]] = rule
+        else:
+            normalized[path[len(prefix):]] = rule
+    return normalized
+
+
+def fingerprint_paths(paths: Iterable[str]) -> str:
+    """Hash the Python sources under ``paths`` (files or directories).
+
+    Used as the provider code fingerprint: any source change invalidates
+    cached verification results.
+    """
+    files = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for name in glob.glob(os.path.join(path, '**', '*.py'), recursive=True):
+                label = os.path.join(os.path.basename(os.path.normpath(path)),
+                                     os.path.relpath(name, path))
+                files[label] = name
+        else:
+            files[os.path.basename(path)] = path
+
+    digest = hashlib.sha256()
+    for label in sorted(files):
+        digest.update(label.encode())
+        with open(files[label], 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
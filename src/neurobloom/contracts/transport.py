@@ -0,0 +1,250 @@
+"""In-process Pact mock provider for ``requests`` sessions.
+
+``PactTransport`` is a transport adapter that answers requests from Pact
+interactions without any network or subprocess; mount it on a client's
+session. ``InProcessPact`` builds on it to declare interactions, check
+the client made exactly those requests, and write Pact v3 files.
+
+    pact = InProcessPact('neurobloom-client', 'neurobloom-ai', 'pact-contracts')
+    client = NeuroBloomClient(pact.uri)
+    pact.mount(client.session)
+    (pact.given('the service is healthy')
+         .upon_receiving('a health check')
+         .with_request('GET', '/health')
+         .will_respond_with(200, body={'status': 'healthy'}))
+    with pact:
+        client.health_check()
+    pact.write()
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .matchers import extract
+from .matching import Rules, compare_body, compare_headers
+from .pactfile import interaction_identity, load_pact, matching_rules, write_pact
+
+
+def _read_body(request: PreparedRequest):
+    body = request.body
+    if body is None:
+        return None
+    if not isinstance(body, (bytes, str)):
+        body = b"".join(c if isinstance(c, bytes) else c.encode() for c in body)
+    if isinstance(body, bytes):
+        body = body.decode()
+    mimetype = request.headers.get('Content-Type', '').split(';')[0].strip()
+    if mimetype == 'application/json' or mimetype.endswith('+json'):
+        try:
+            return json.loads(body)
+        except ValueError:
+            pass
+    return body
+
+
+def request_errors(expected: Dict, request: PreparedRequest) -> List[str]:
+    """Mismatches between a contract request and an actual prepared request."""
+    url = urlsplit(request.url)
+    errors = []
+    if request.method.upper() != expected.get('method', 'GET').upper():
+        errors.append(f"method: expected {expected.get('method')}, got {request.method}")
+    if url.path != expected.get('path', '/'):
+        errors.append(f"path: expected {expected.get('path')}, got {url.path}")
+
+    query = expected.get('query') or {}
+    if isinstance(query, str):
+        query = parse_qs(query)
+    if parse_qs(url.query) != {key: list(values) for key, values in query.items()}:
+        errors.append(f"query: expected {query}, got {parse_qs(url.query)}")
+
+    errors.extend(compare_headers(
+        expected.get('headers') or {}, request.headers, matching_rules(expected, 'header')
+    ))
+    if 'body' in expected:
+        errors.extend(compare_body(
+            expected['body'], _read_body(request), Rules(matching_rules(expected, 'body'))
+        ))
+    return errors
+
+
+def build_response(expected: Dict, request: PreparedRequest) -> Response:
+    """A ``requests`` response carrying a contract's example response."""
+    response = Response()
+    response.status_code = expected.get('status', 200)
+    response.headers = CaseInsensitiveDict(expected.get('headers') or {})
+    body = expected.get('body')
+    if body is None:
+        content = b""
+    elif isinstance(body, str):
+        content = body.encode()
+    else:
+        content = json.dumps(body).encode()
+        response.headers.setdefault('Content-Type', 'application/json')
+    response._content = content
+    response._content_consumed = True
+    response.encoding = 'utf-8'
+    response.url = request.url
+    response.request = request
+    response.reason = 'OK' if response.status_code < 400 else 'Error'
+    return response
+
+
+class PactTransport(BaseAdapter):
+    """Transport adapter answering from Pact interactions in process.
+
+    Each request is matched against ``interactions`` in order; the first
+    whose request matches is served and recorded in ``received``. A
+    request nothing matches gets a 500 describing why, and is recorded in
+    ``unmatched``.
+    """
+
+    def __init__(self, interactions: Optional[List[Dict]] = None):
+        super().__init__()
+        self.interactions = list(interactions or [])
+        self.received: List[Dict] = []
+        self.unmatched: List[str] = []
+
+    @classmethod
+    def from_pact(cls, pact: Union[Dict, str]) -> 'PactTransport':
+        """Replay the interactions of a Pact document or file."""
+        if isinstance(pact, str):
+            pact = load_pact(pact)
+        return cls(pact.get('interactions', []))
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        mismatches = {}
+        for interaction in self.interactions:
+            errors = request_errors(interaction['request'], request)
+            if not errors:
+                self.received.append(interaction)
+                return build_response(interaction['response'], request)
+            mismatches[interaction.get('description', '')] = errors
+
+        summary = f"{request.method} {urlsplit(request.url).path}"
+        self.unmatched.append(summary)
+        return build_response({
+            'status': 500,
+            'body': {'error': f"No interaction matched {summary}", 'mismatches': mismatches},
+        }, request)
+
+    def close(self):
+        pass
+
+
+class InProcessPact:
+    """Declares interactions, serves them in process and writes Pact v3 files.
+
+    ``with pact:`` serves the interactions declared since the last block
+    and, on exit, fails if any was not requested or an unexpected request
+    arrived. Interactions from passing blocks are written by ``write``.
+    """
+
+    def __init__(
+        self,
+        consumer: str,
+        provider: str,
+        pact_dir: str,
+        file_write_mode: str = 'overwrite'
+    ):
+        self.consumer = consumer
+        self.provider = provider
+        self.pact_dir = pact_dir
+        self.file_write_mode = file_write_mode
+        self.uri = f"http://{provider}.pact"
+        self.transport = PactTransport()
+        self.interactions: List[Dict] = []
+        self._pending: List[Dict] = []
+        self._states: List[str] = []
+        self._description = ''
+        self._request: Dict = {}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.pact_dir, f"{self.consumer}-{self.provider}.json")
+
+    def mount(self, session):
+        """Route the session's requests for ``uri`` to the in-process provider."""
+        session.mount(self.uri, self.transport)
+
+    def given(self, state: str) -> 'InProcessPact':
+        self._states.append(state)
+        return self
+
+    def upon_receiving(self, description: str) -> 'InProcessPact':
+        self._description = description
+        return self
+
+    def with_request(self, method: str, path: str, query: Optional[Dict] = None,
+                     headers: Optional[Dict] = None, body=None) -> 'InProcessPact':
+        self._request = _part({'method': method.upper(), 'path': path}, headers, body)
+        if query:
+            self._request['query'] = {
+                key: list(value) if isinstance(value, (list, tuple)) else [str(value)]
+                for key, value in query.items()
+            }
+        return self
+
+    def will_respond_with(self, status: int, headers: Optional[Dict] = None,
+                          body=None) -> 'InProcessPact':
+        interaction = {'description': self._description}
+        if self._states:
+            interaction['providerStates'] = [{'name': state} for state in self._states]
+        interaction['request'] = self._request
+        interaction['response'] = _part({'status': status}, headers, body)
+        self._pending.append(interaction)
+        self._states, self._description, self._request = [], '', {}
+        return self
+
+    def __enter__(self) -> 'InProcessPact':
+        self.transport.interactions = list(self._pending)
+        self.transport.received = []
+        self.transport.unmatched = []
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pending, self._pending = self._pending, []
+        if exc_type is not None:
+            return False
+        received = {id(i) for i in self.transport.received}
+        missing = [i['description'] for i in pending if id(i) not in received]
+        if missing or self.transport.unmatched:
+            problems = [f"missing request for: {d}" for d in missing]
+            problems += [f"unexpected request: {r}" for r in self.transport.unmatched]
+            raise AssertionError("Pact verification failed:\n  " + "\n  ".join(problems))
+        self.interactions.extend(pending)
+        return False
+
+    def write(self) -> str:
+        """Write the verified interactions to ``pact_dir``; return the path."""
+        latest = {}
+        for interaction in self.interactions:
+            latest[interaction_identity(interaction)] = interaction
+        write_pact(self.path, self.consumer, self.provider, list(latest.values()),
+                   merge=self.file_write_mode == 'merge')
+        return self.path
+
+
+def _part(part: Dict, headers: Optional[Dict], body) -> Dict:
+    """Fill a request/response with headers, example body and matching rules."""
+    rules = {}
+    if headers:
+        part['headers'] = {}
+        header_rules = {}
+        for name, value in headers.items():
+            part['headers'][name], found = extract(value, name)
+            header_rules.update(found)
+        if header_rules:
+            rules['header'] = {name: {'matchers': [rule]} for name, rule in header_rules.items()}
+    if body is not None:
+        part['body'], body_rules = extract(body)
+        if body_rules:
+            rules['body'] = {path: {'matchers': [rule]} for path, rule in body_rules.items()}
+    if rules:
+        part['matchingRules'] = rules
+    return part
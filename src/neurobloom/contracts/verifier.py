@@ -0,0 +1,235 @@
+"""Incremental, parallel provider verification of Pact files.
+
+Each interaction is replayed against a running provider and its response
+checked against the contract. An interaction that passed before is skipped
+while both its contract hash and the provider code fingerprint are
+unchanged; the remaining interactions are verified on a thread pool.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import requests
+
+from .matching import Rules, compare_body, compare_headers
+from .pactfile import interaction_hash, load_pact, matching_rules, provider_states
+
+
+StateHandler = Callable[[str], None]
+
+
+@dataclass
+class InteractionResult:
+    """Outcome of verifying one interaction."""
+    description: str
+    key: str
+    passed: bool
+    skipped: bool = False
+    errors: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+
+@dataclass
+class VerificationReport:
+    """Outcome of verifying one or more Pact files."""
+    results: List[InteractionResult] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return all(r.passed for r in self.results)
+
+    @property
+    def verified(self) -> int:
+        """Interactions actually replayed against the provider."""
+        return sum(1 for r in self.results if not r.skipped)
+
+    @property
+    def skipped(self) -> int:
+        """Interactions skipped because a cached pass still applies."""
+        return sum(1 for r in self.results if r.skipped)
+
+    @property
+    def failures(self) -> List[InteractionResult]:
+        return [r for r in self.results if not r.passed]
+
+    def format(self) -> str:
+        """Human-readable summary listing every failure."""
+        lines = [
+            f"{len(self.results)} interactions: {self.verified} verified, "
+            f"{self.skipped} cached, {len(self.failures)} failed"
+        ]
+        for result in self.failures:
+            lines.append(f"FAILED {result.description}")
+            lines.extend(f"  {error}" for error in result.errors)
+        return "\n".join(lines)
+
+
+class VerificationCache:
+    """Passed (interaction hash, provider fingerprint) pairs, persisted as JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self._passed = set(json.load(f).get('passed', []))
+        except (OSError, ValueError):
+            self._passed = set()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._passed
+
+    def add(self, key: str):
+        with self._lock:
+            self._passed.add(key)
+
+    def save(self):
+        """Write atomically so a crashed run never leaves a corrupt cache."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            document = {'passed': sorted(self._passed)}
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(document, f, indent=0)
+        os.replace(tmp, self.path)
+
+
+class ProviderVerifier:
+    """Replays Pact interactions against a provider at ``base_url``.
+
+    ``provider_fingerprint`` identifies the provider code (see
+    ``fingerprint_paths``); with a ``cache`` only interactions not yet
+    passed under that fingerprint are replayed. ``state_handler`` is called
+    with each provider state name before its interaction runs; with more
+    than one worker it must tolerate concurrent calls. A shared ``session``
+    replaces the default session per thread.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        provider_fingerprint: str = '',
+        cache: Optional[VerificationCache] = None,
+        workers: int = 8,
+        state_handler: Optional[StateHandler] = None,
+        timeout: float = 10,
+        session: Optional[requests.Session] = None
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.provider_fingerprint = provider_fingerprint
+        self.cache = cache
+        self.workers = workers
+        self.state_handler = state_handler
+        self.timeout = timeout
+        self.session = session
+        self._local = threading.local()
+
+    def verify_files(self, paths: Iterable[str]) -> VerificationReport:
+        """Verify every interaction in the given Pact files."""
+        report = VerificationReport()
+        for path in paths:
+            report.results.extend(self.verify_pact(load_pact(path)).results)
+        return report
+
+    def verify_pact(self, pact: Union[Dict, str]) -> VerificationReport:
+        """Verify one Pact (a loaded document or a file path)."""
+        if isinstance(pact, str):
+            pact = load_pact(pact)
+        interactions = pact.get('interactions', [])
+        keys = [f"{interaction_hash(i)}:{self.provider_fingerprint}" for i in interactions]
+
+        results: List[Optional[InteractionResult]] = [None] * len(interactions)
+        pending = []
+        for index, (interaction, key) in enumerate(zip(interactions, keys)):
+            if self.cache is not None and key in self.cache:
+                results[index] = InteractionResult(
+                    interaction.get('description', ''), key, passed=True, skipped=True
+                )
+            else:
+                pending.append(index)
+
+        if pending:
+            workers = max(1, min(self.workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                verified = executor.map(
+                    lambda i: self.verify_interaction(interactions[i], keys[i]), pending
+                )
+                for index, result in zip(pending, verified):
+                    results[index] = result
+
+            if self.cache is not None:
+                for result in results:
+                    if result.passed and not result.skipped:
+                        self.cache.add(result.key)
+                self.cache.save()
+
+        return VerificationReport(results)
+
+    def verify_interaction(self, interaction: Dict, key: str = '') -> InteractionResult:
+        """Replay one interaction and compare the response with the contract."""
+        description = interaction.get('description', '')
+        start = time.perf_counter()
+        try:
+            if self.state_handler is not None:
+                for state in provider_states(interaction):
+                    self.state_handler(state)
+            response = self._send(interaction['request'])
+            errors = self._check(interaction['response'], response)
+        except Exception as e:
+            errors = [f"{type(e).__name__}: {e}"]
+        return InteractionResult(
+            description, key, passed=not errors, errors=errors,
+            duration=time.perf_counter() - start
+        )
+
+    def _session(self) -> requests.Session:
+        if self.session is not None:
+            return self.session
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, expected_request: Dict) -> requests.Response:
+        url = self.base_url + expected_request.get('path', '/')
+        query = expected_request.get('query')
+        params = None
+        if isinstance(query, str) and query:
+            url = f"{url}?{query}"
+        elif isinstance(query, dict):
+            params = query
+
+        body = expected_request.get('body')
+        if body is not None and not isinstance(body, str):
+            body = json.dumps(body)
+        return self._session().request(
+            expected_request.get('method', 'GET').upper(), url,
+            params=params, headers=expected_request.get('headers'),
+            data=body, timeout=self.timeout
+        )
+
+    def _check(self, expected: Dict, response: requests.Response) -> List[str]:
+        errors = []
+        if response.status_code != expected.get('status', 200):
+            errors.append(f"status: expected {expected.get('status')}, got {response.status_code}")
+
+        errors.extend(compare_headers(
+            expected.get('headers') or {}, response.headers, matching_rules(expected, 'header')
+        ))
+
+        if 'body' in expected:
+            try:
+                actual = response.json()
+            except ValueError:
+                actual = response.text
+            errors.extend(compare_body(
+                expected['body'], actual, Rules(matching_rules(expected, 'body'))
+            ))
+        return errors
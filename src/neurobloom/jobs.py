@@ -0,0 +1,105 @@
+"""Background analysis jobs: a bounded queue drained by worker threads."""
+
+import collections
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+QUEUED = "queued"
+RUNNING = "running"
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobQueue:
+    """Runs submitted analyses on a fixed pool of worker threads.
+
+    Job state lives in this process only. Finished results are kept for
+    ``ttl`` seconds (pruned on submit), and while a job is unfinished
+    ``get`` returns a placeholder response with ``status`` ``"queued"``
+    or ``"running"`` so callers can always parse it as an analysis.
+    Workers start on the first submit.
+    """
+
+    def __init__(
+        self,
+        run: Callable[..., Dict],
+        workers: int = 4,
+        max_pending: int = 100,
+        ttl: float = 3600
+    ):
+        self.run = run
+        self.workers = workers
+        self.ttl = ttl
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._jobs: Dict[str, Dict] = {}
+        self._finished: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, job_id: str, *args, **kwargs) -> Dict:
+        """Queue ``run(*args, **kwargs)`` under ``job_id``; return its placeholder."""
+        pending = _pending(job_id, QUEUED)
+        with self._lock:
+            self._start_workers()
+            self._prune()
+            self._jobs[job_id] = pending
+            try:
+                self._queue.put_nowait((job_id, args, kwargs))
+            except queue.Full:
+                del self._jobs[job_id]
+                raise QueueFull(f"{self._queue.maxsize} analyses already queued")
+        return pending
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the job's current response, or None if unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > cutoff:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+    def _work(self):
+        while True:
+            job_id, args, kwargs = self._queue.get()
+            with self._lock:
+                self._jobs[job_id] = _pending(job_id, RUNNING)
+            try:
+                result = dict(self.run(*args, **kwargs), id=job_id)
+            except Exception as e:
+                result = dict(_pending(job_id, "failed"), raw_data={"error": str(e)})
+            with self._lock:
+                self._jobs[job_id] = result
+                self._finished[job_id] = time.monotonic()
+            self._queue.task_done()
+
+
+def _pending(job_id: str, status: str) -> Dict:
+    return {
+        "id": job_id,
+        "status": status,
+        "insights": [],
+        "confidence_score": 0.0,
+        "raw_data": {}
+    }
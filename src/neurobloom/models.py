@@ -1,16 +1,105 @@
 """Data models for Neurobloom AI analysis."""
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Union
 
+from . import jsonutil
+
+
+# Statuses of background analyses that have not finished yet
+PENDING_STATUSES = ("queued", "running")
+
+
+class ValidationError(ValueError):
+    """Raised when a payload does not match the model schema."""
+
+    def __init__(self, field: str, message: str):
+        self.field = field
+        super().__init__(f"{field}: {message}")
+
+
+def _type_name(value) -> str:
+    return type(value).__name__
+
+
+def _require(data: Dict, field: str, path: str):
+    """Return ``data[field]`` or raise a ValidationError naming it."""
+    try:
+        return data[field]
+    except KeyError:
+        raise ValidationError(f"{path}{field}", "required field missing")
+
+
+def _check_str(value, field: str) -> str:
+    if not isinstance(value, str):
+        raise ValidationError(field, f"expected str, got {_type_name(value)}")
+    return value
+
+
+def _check_number(value, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValidationError(field, f"expected number, got {_type_name(value)}")
+    return value
+
+
+def _check_dict(value, field: str) -> Dict:
+    if not isinstance(value, dict):
+        raise ValidationError(field, f"expected object, got {_type_name(value)}")
+    return value
+
+
+def _check_list(value, field: str) -> List:
+    if not isinstance(value, list):
+        raise ValidationError(field, f"expected list, got {_type_name(value)}")
+    return value
+
+
+def _check_object(data, path: str) -> Dict:
+    if not isinstance(data, dict):
+        raise ValidationError(path.rstrip('.') or "<root>",
+                              f"expected object, got {_type_name(data)}")
+    return data
+
+
+class _Model:
+    """Slots-based value object with field-wise equality and repr."""
+
+    __slots__ = ()
+    __hash__ = None
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class AnalysisRequest(_Model):
+    """Request model for AI analysis.
+
+    ``data`` may be a list or any iterable of rows; iterables (e.g.
+    generators) are streamed by the client instead of materialized.
+    """
+
+    __slots__ = ("data", "analysis_type", "model")
+
+    def __init__(
+        self,
+        data: Union[List[Dict], Iterable[Dict]],
+        analysis_type: str,
+        model: Optional[str] = "gpt-4"
+    ):
+        self.data = data
+        self.analysis_type = analysis_type
+        self.model = model
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether ``data`` is a lazy iterable rather than a list."""
+        return not isinstance(self.data, (list, tuple))
 
-@dataclass
-class AnalysisRequest:
-    """Request model for AI analysis."""
-    data: List[Dict]
-    analysis_type: str
-    model: Optional[str] = "gpt-4"
-    
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -19,23 +108,118 @@ class AnalysisRequest:
             "model": self.model
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict, path: str = "") -> 'AnalysisRequest':
+        """Create from a validated dictionary (JSON deserialization)."""
+        _check_object(data, path)
+        rows = _check_list(_require(data, "data", path), f"{path}data")
+        for i, row in enumerate(rows):
+            _check_dict(row, f"{path}data[{i}]")
+        model = data.get("model", "gpt-4")
+        if model is not None:
+            _check_str(model, f"{path}model")
+        return cls(
+            data=rows,
+            analysis_type=_check_str(
+                _require(data, "analysis_type", path), f"{path}analysis_type"
+            ),
+            model=model
+        )
+
 
-@dataclass
-class AnalysisResponse:
+class AnalysisResponse(_Model):
     """Response model for AI analysis results."""
-    id: str
-    status: str
-    insights: List[str]
-    confidence_score: float
-    raw_data: Dict
-    
+
+    __slots__ = ("id", "status", "insights", "confidence_score", "raw_data")
+
+    def __init__(
+        self,
+        id: str,
+        status: str,
+        insights: List[str],
+        confidence_score: float,
+        raw_data: Dict
+    ):
+        self.id = id
+        self.status = status
+        self.insights = insights
+        self.confidence_score = confidence_score
+        self.raw_data = raw_data
+
+    @property
+    def done(self) -> bool:
+        """False while a background analysis is still queued or running."""
+        return self.status not in PENDING_STATUSES
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "insights": self.insights,
+            "confidence_score": self.confidence_score,
+            "raw_data": self.raw_data
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, path: str = "") -> 'AnalysisResponse':
+        """Create from dictionary (JSON deserialization).
+
+        Every field is type-checked; the first mismatch raises a
+        ValidationError naming the offending field.
+        """
+        _check_object(data, path)
+        insights = _check_list(_require(data, "insights", path), f"{path}insights")
+        for i, insight in enumerate(insights):
+            _check_str(insight, f"{path}insights[{i}]")
+        return cls(
+            id=_check_str(_require(data, "id", path), f"{path}id"),
+            status=_check_str(_require(data, "status", path), f"{path}status"),
+            insights=insights,
+            confidence_score=_check_number(
+                _require(data, "confidence_score", path), f"{path}confidence_score"
+            ),
+            raw_data=_check_dict(data.get("raw_data", {}), f"{path}raw_data")
+        )
+
+    @classmethod
+    def from_json(cls, body: Union[bytes, str]) -> 'AnalysisResponse':
+        """Decode and validate a JSON response body."""
+        return cls.from_dict(jsonutil.loads(body))
+
+
+class BatchItemResult(_Model):
+    """Outcome of one item in a batch analysis."""
+
+    __slots__ = ("index", "response", "error")
+
+    def __init__(
+        self,
+        index: int,
+        response: Optional[AnalysisResponse] = None,
+        error: Optional[str] = None
+    ):
+        self.index = index
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item produced a response."""
+        return self.error is None
+
     @classmethod
-    def from_dict(cls, data: Dict) -> 'AnalysisResponse':
+    def from_dict(cls, data: Dict, path: str = "") -> 'BatchItemResult':
         """Create from dictionary (JSON deserialization)."""
+        _check_object(data, path)
+        index = _require(data, "index", path)
+        if isinstance(index, bool) or not isinstance(index, int):
+            raise ValidationError(f"{path}index", f"expected int, got {_type_name(index)}")
+        if "error" in data:
+            return cls(index=index, error=_check_str(data["error"], f"{path}error"))
         return cls(
-            id=data["id"],
-            status=data["status"],
-            insights=data["insights"],
-            confidence_score=data["confidence_score"],
-            raw_data=data.get("raw_data", {})
+            index=index,
+            response=AnalysisResponse.from_dict(
+                _require(data, "result", path), f"{path}result."
+            )
         )
@@ -0,0 +1,374 @@
+"""Multi-endpoint client with health-aware load balancing.
+
+``PooledNeuroBloomClient`` spreads requests over several NeuroBloom
+servers (e.g. one per region). Each request goes to an endpoint picked by
+power-of-two-choices or least-outstanding-requests. Endpoints that keep
+failing are ejected by a per-endpoint circuit breaker, and a background
+prober takes endpoints whose ``/health`` fails out of rotation until they
+recover.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from .client import NeuroBloomClient
+from .metrics import Metrics
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STRATEGIES = ("p2c", "least_outstanding")
+
+# Statuses meaning the endpoint, not the request, is at fault
+_ENDPOINT_FAILURE_STATUSES = (500, 502, 503, 504)
+
+# The only one of those promising the request was not processed, so the
+# only one a non-idempotent request may be resent elsewhere after
+_NOT_PROCESSED_STATUSES = (503,)
+
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+_POOL_BASE_URL = "http://neurobloom.pool"
+
+
+class NoEndpointAvailable(requests.exceptions.ConnectionError):
+    """Every endpoint is unhealthy or has an open circuit.
+
+    A connection error, so client methods report it as ``Request failed``
+    like any other transport failure.
+    """
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    After ``reset_timeout`` seconds an open breaker is half-open and lets
+    one trial request through: success closes it, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def available(self) -> bool:
+        """Whether a request could be admitted now (without admitting it)."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._trial)
+
+    def admit(self) -> bool:
+        """Admit a request; only one at a time while half-open."""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+    def reset(self):
+        self.record_success()
+
+
+class Endpoint:
+    """One server in the pool with its load and health state."""
+
+    def __init__(self, url: str, breaker: CircuitBreaker):
+        self.url = url.rstrip('/')
+        self.breaker = breaker
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.healthy and self.breaker.available()
+
+    def score(self) -> float:
+        """Expected wait: outstanding requests times the latency estimate."""
+        return (self.outstanding + 1) * (self.latency or 0.0)
+
+    def begin(self):
+        with self._lock:
+            self.outstanding += 1
+            self.requests += 1
+
+    def end(self, ok: bool, elapsed: float):
+        with self._lock:
+            self.outstanding -= 1
+            if ok:
+                # EWMA so a region that slows down sheds load quickly
+                self.latency = elapsed if self.latency is None else (
+                    0.7 * self.latency + 0.3 * elapsed
+                )
+            else:
+                self.failures += 1
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def status(self) -> Dict:
+        return {
+            "healthy": self.healthy,
+            "circuit": self.breaker.state,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency": self.latency,
+        }
+
+
+class PooledNeuroBloomClient(NeuroBloomClient):
+    """NeuroBloomClient spreading requests over a pool of endpoints.
+
+    ``strategy`` is ``"p2c"`` (power of two choices over outstanding
+    requests weighted by each endpoint's latency EWMA) or
+    ``"least_outstanding"``. A GET failing with a connection error or 5xx
+    is retried on another endpoint. A POST is retried elsewhere only when
+    it never reached the server (refused or timed-out connect) or got a
+    503, and its body can be replayed. Submitted analyses are polled on
+    the endpoint that accepted them; up to ``max_tracked_analyses`` owners
+    are remembered for ``analysis_ttl`` seconds. ``/health`` is probed
+    every ``health_interval`` seconds (0 disables the prober; call
+    ``probe`` yourself).
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[str],
+        strategy: str = "p2c",
+        timeout: int = 30,
+        metrics: Optional[Metrics] = None,
+        health_interval: float = 5.0,
+        health_timeout: float = 2.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+        max_tracked_analyses: int = 10000,
+        analysis_ttl: float = 3600.0
+    ):
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+        super().__init__(_POOL_BASE_URL, timeout=timeout, metrics=metrics)
+        self.strategy = strategy
+        self.endpoints = [
+            Endpoint(url, CircuitBreaker(failure_threshold, reset_timeout)) for url in endpoints
+        ]
+        self.health_timeout = health_timeout
+        self.max_tracked_analyses = max_tracked_analyses
+        self.analysis_ttl = analysis_ttl
+        # Analysis id -> (owning endpoint, expiry), oldest first
+        self._owners: "OrderedDict[str, tuple]" = OrderedDict()
+        self._owners_lock = threading.Lock()
+        self._last = threading.local()
+        self._random = random.Random()
+        self._probe_session = requests.Session()
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+        if health_interval > 0:
+            self._prober = threading.Thread(
+                target=self._probe_loop, args=(health_interval,),
+                name="neurobloom-pool-health", daemon=True
+            )
+            self._prober.start()
+
+    def select(self, exclude: Sequence[Endpoint] = ()) -> Endpoint:
+        """Pick an endpoint for the next request and admit it."""
+        excluded = list(exclude)
+        while True:
+            candidates = [e for e in self.endpoints if e.available and e not in excluded]
+            if not candidates:
+                raise NoEndpointAvailable(
+                    f"No healthy endpoint among {len(self.endpoints)}"
+                )
+            if self.strategy == "p2c" and len(candidates) > 2:
+                candidates = self._random.sample(candidates, 2)
+            if self.strategy == "p2c":
+                endpoint = min(candidates, key=lambda e: (e.score(), e.outstanding))
+            else:
+                endpoint = min(candidates, key=lambda e: (e.outstanding, e.latency or 0.0))
+            if endpoint.breaker.admit():
+                return endpoint
+            # Lost the half-open trial to another thread
+            excluded.append(endpoint)
+
+    def submit(self, request) -> str:
+        analysis_id = super().submit(request)
+        now = time.monotonic()
+        with self._owners_lock:
+            self._owners[analysis_id] = (self._last.endpoint, now + self.analysis_ttl)
+            # Forget ids that were never polled to completion
+            while self._owners and (
+                len(self._owners) > self.max_tracked_analyses
+                or next(iter(self._owners.values()))[1] <= now
+            ):
+                self._owners.popitem(last=False)
+        return analysis_id
+
+    def get_analysis(self, analysis_id: str):
+        result = super().get_analysis(analysis_id)
+        if result.done:
+            with self._owners_lock:
+                self._owners.pop(analysis_id, None)
+        return result
+
+    def health_check(self) -> Dict:
+        """Pool status: healthy while any endpoint can take requests."""
+        return {
+            "status": "healthy" if any(e.available for e in self.endpoints) else "unhealthy",
+            "endpoints": {e.url: e.status() for e in self.endpoints},
+        }
+
+    def probe(self):
+        """Check every endpoint's ``/health`` once; eject or re-admit it."""
+        for endpoint in self.endpoints:
+            try:
+                response = self._probe_session.get(
+                    f"{endpoint.url}/health", timeout=self.health_timeout
+                )
+                healthy = response.status_code == 200 and (
+                    response.json().get("status") == "healthy"
+                )
+            except (requests.exceptions.RequestException, ValueError):
+                healthy = False
+            if healthy and not endpoint.healthy:
+                endpoint.breaker.reset()
+            endpoint.healthy = healthy
+
+    def close(self):
+        """Stop the prober and close the sessions."""
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join()
+        self._probe_session.close()
+        super().close()
+
+    def _probe_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            self.probe()
+
+    def _send(self, endpoint: str, method: str, url: str, **kwargs) -> requests.Response:
+        path = url[len(_POOL_BASE_URL):]
+        pinned = self._pinned(endpoint, path)
+        # Streamed (generator) bodies are consumed by the first attempt
+        replayable = not pinned and isinstance(kwargs.get("data"), (str, bytes, type(None)))
+        idempotent = method.upper() in _IDEMPOTENT_METHODS
+        tried: List[Endpoint] = []
+
+        while True:
+            target = pinned or self.select(tried)
+            tried.append(target)
+            target.begin()
+            start = time.perf_counter()
+            try:
+                response = super()._send(endpoint, method, target.url + path, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                target.end(False, time.perf_counter() - start)
+                if (replayable and (idempotent or _never_sent(e))
+                        and self._has_untried(tried)):
+                    continue
+                raise
+            failed = response.status_code in _ENDPOINT_FAILURE_STATUSES
+            if failed or not kwargs.get("stream"):
+                target.end(not failed, time.perf_counter() - start)
+            else:
+                _end_when_consumed(response, target, start)
+            if (failed and replayable and self._has_untried(tried)
+                    and (idempotent or response.status_code in _NOT_PROCESSED_STATUSES)):
+                response.close()
+                continue
+            self._last.endpoint = target
+            return response
+
+    def _pinned(self, endpoint: str, path: str) -> Optional[Endpoint]:
+        """The endpoint that owns a submitted analysis being polled."""
+        if endpoint != "get_analysis":
+            return None
+        analysis_id = urlsplit(path).path.rsplit('/', 1)[-1]
+        with self._owners_lock:
+            owner = self._owners.get(analysis_id)
+        if owner is None or owner[1] <= time.monotonic():
+            return None
+        return owner[0]
+
+    def _has_untried(self, tried: Sequence[Endpoint]) -> bool:
+        return any(e.available and e not in tried for e in self.endpoints)
+
+
+def _never_sent(error: requests.exceptions.RequestException) -> bool:
+    """Whether a transport error happened before the request reached the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def _end_when_consumed(response: requests.Response, target: Endpoint, start: float):
+    """Finish ``target``'s accounting once a streamed body is read or closed."""
+    lock = threading.Lock()
+    finished = []
+
+    def finish(ok: bool):
+        with lock:
+            if finished:
+                return
+            finished.append(ok)
+        target.end(ok, time.perf_counter() - start)
+
+    close, iter_content = response.close, response.iter_content
+
+    def closing():
+        try:
+            close()
+        finally:
+            finish(True)
+
+    def iterating(*args, **kwargs):
+        try:
+            yield from iter_content(*args, **kwargs)
+        except Exception:
+            finish(False)
+            raise
+        finish(True)
+
+    response.close = closing
+    response.iter_content = iterating
@@ -0,0 +1,147 @@
+"""Analysis prompt templates and token budgeting.
+
+Templates are registered once per analysis type with their token cost
+precomputed, so building a prompt renders only the template in use. The
+dataset summary is then fitted to the model's budget: sample rows and
+columns are dropped step by step until the estimate fits, and as a last
+resort whole lines are cut.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .summary import DatasetSummary
+
+
+# One token per run of up to 6 letters or 3 digits (BPE vocabularies split
+# numbers into 3-digit groups) and per punctuation character; errs high.
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+# Chat framing added around the system and user messages
+_MESSAGE_OVERHEAD = 11
+
+CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106-preview": 128000,
+    "gpt-4o": 128000,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 4096
+
+DEFAULT_TEMPLATES = {
+    "time_series": "Analyze this time series data for trends and patterns:",
+    "classification": "Classify and analyze patterns in this data:",
+    "sales_forecasting": "Analyze sales data and provide forecasting insights:",
+}
+FALLBACK_TEMPLATE = "Provide insights and analysis for this {analysis_type} data:"
+
+# (max_columns, sample_rows) tried in order until the data section fits
+_REDUCTIONS = ((40, None), (40, 2), (40, 0), (20, 0), (10, 0), (5, 0))
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the token count of ``text``."""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def context_window(model: str, windows: Dict[str, int] = CONTEXT_WINDOWS) -> int:
+    """Context size of ``model``, matched on the longest known name prefix."""
+    best = None
+    for name in windows:
+        if model.startswith(name) and (best is None or len(name) > len(best)):
+            best = name
+    return windows[best] if best is not None else DEFAULT_CONTEXT_WINDOW
+
+
+def truncate_to_tokens(text: str, limit: int) -> str:
+    """Keep the leading whole lines of ``text`` that fit in ``limit`` tokens."""
+    kept, used = [], 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost > limit:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """An instruction line followed by the data section."""
+    instruction: str
+    tokens: int = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "tokens", estimate_tokens(self.instruction) + 1)
+
+    def render(self, data_section: str) -> str:
+        return f"{self.instruction}\n{data_section}"
+
+
+class PromptBuilder:
+    """Builds analysis prompts that fit each model's token budget.
+
+    The prompt budget is the model's context window minus the system
+    prompt, message framing and ``completion_tokens``; ``budgets`` may cap
+    it lower per model to bound cost.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str = "",
+        completion_tokens: int = 500,
+        budgets: Optional[Dict[str, int]] = None,
+        context_windows: Optional[Dict[str, int]] = None
+    ):
+        self.completion_tokens = completion_tokens
+        self.system_tokens = estimate_tokens(system_prompt)
+        self.budgets = dict(budgets or {})
+        self.context_windows = context_windows or CONTEXT_WINDOWS
+        self.templates: Dict[str, PromptTemplate] = {}
+        for analysis_type, instruction in DEFAULT_TEMPLATES.items():
+            self.register(analysis_type, instruction)
+
+    def register(self, analysis_type: str, instruction: str):
+        """Use ``instruction`` as the prompt header for ``analysis_type``."""
+        self.templates[analysis_type] = PromptTemplate(instruction)
+
+    def template(self, analysis_type: str) -> PromptTemplate:
+        template = self.templates.get(analysis_type)
+        if template is None:
+            template = PromptTemplate(FALLBACK_TEMPLATE.format(analysis_type=analysis_type))
+        return template
+
+    def budget(self, model: str) -> int:
+        """Tokens available for the user prompt sent to ``model``."""
+        available = (
+            context_window(model, self.context_windows)
+            - self.completion_tokens - self.system_tokens - _MESSAGE_OVERHEAD
+        )
+        cap = self.budgets.get(model)
+        return min(available, cap) if cap is not None else available
+
+    def request_tokens(self, prompt: str) -> int:
+        """Estimated total tokens a request with ``prompt`` may consume."""
+        return (
+            estimate_tokens(prompt) + self.system_tokens
+            + _MESSAGE_OVERHEAD + self.completion_tokens
+        )
+
+    def build(self, summary: DatasetSummary, analysis_type: str, model: str) -> str:
+        """Render the prompt for ``analysis_type``, trimmed to ``model``'s budget."""
+        template = self.template(analysis_type)
+        available = self.budget(model) - template.tokens
+        if available <= 0:
+            raise ValueError(
+                f"Prompt budget for {model} leaves no room for data ({available} tokens)"
+            )
+
+        for max_columns, sample_rows in _REDUCTIONS:
+            section = summary.to_prompt(max_columns=max_columns, sample_rows=sample_rows)
+            # Every token spans at least one character, so short text always fits
+            if len(section) <= available or estimate_tokens(section) <= available:
+                return template.render(section)
+        return template.render(truncate_to_tokens(section, available))
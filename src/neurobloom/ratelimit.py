@@ -0,0 +1,163 @@
+"""Client-side rate limiting and retry policy for the OpenAI call path."""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call cannot be admitted or retried before its deadline."""
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset durations ("20ms", "6m0s", "1.5") into seconds."""
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``capacity`` per ``period`` seconds.
+
+    Not thread-safe on its own; RateLimiter serializes access.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def sync(self, remaining: float, reset_after: Optional[float], now: float):
+        """Align with the server's view of the remaining budget."""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+        if remaining <= 0 and reset_after:
+            self.blocked_until = max(self.blocked_until, now + reset_after)
+
+
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 40000
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget for one API key.
+
+    ``acquire`` blocks until both buckets admit the call. The buckets adapt
+    to ``x-ratelimit-*`` response headers and to 429 ``retry-after`` hints,
+    so every thread sharing the limiter backs off together.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float, deadline: Optional[float] = None):
+        """Block until one request using ``tokens`` tokens may be sent.
+
+        ``deadline`` is a ``time.monotonic()`` timestamp; DeadlineExceeded is
+        raised as soon as it is clear the budget will not free up in time.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+            if deadline is not None and now + wait > deadline:
+                raise DeadlineExceeded(f"Rate limit budget unavailable for {wait:.2f}s")
+            time.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adapt to ``x-ratelimit-*`` headers from an OpenAI response."""
+        with self._lock:
+            now = time.monotonic()
+            for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                if limit is not None:
+                    try:
+                        limit = float(limit)
+                    except ValueError:
+                        limit = None
+                    if limit and limit != bucket.capacity:
+                        bucket.capacity = limit
+                        bucket.rate = limit / 60.0
+                        bucket.level = min(bucket.level, limit)
+
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is not None:
+                    try:
+                        remaining = float(remaining)
+                    except ValueError:
+                        continue
+                    reset_after = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                    bucket.sync(remaining, reset_after, now)
+
+    def pause(self, seconds: float):
+        """Hold all requests for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self.requests.blocked_until = max(self.requests.blocked_until, until)
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff bounded by attempts and a deadline."""
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    deadline: float = 60.0
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {self.max_attempts}")
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number ``attempt`` (0-based), "full jitter" style.
+
+        A server ``retry-after`` hint is a floor, never shortened by jitter.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            return max(backoff, retry_after)
+        return backoff
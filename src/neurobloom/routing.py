@@ -0,0 +1,294 @@
+"""Per-request model routing with fallback chains and hedged requests.
+
+A ``ModelRouter`` holds an ordered list of ``Tier`` s. Each request goes
+to the first tier that accepts its dataset size and analysis type and is
+currently healthy by the router's rolling latency/error stats. A tier that
+errors hands over to its configured fallbacks; one passed over for errors
+gets a single probe request per cooldown and recovers when a call to its
+model succeeds. With a hedge tier set, a request still unanswered after
+the primary model's p95 latency (or a fixed delay) is duplicated to the
+hedge tier and the first answer wins.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class Tier:
+    """A named model choice and the requests it accepts.
+
+    ``max_rows`` and ``analysis_types`` restrict which requests the tier
+    takes; ``max_p95`` skips it while its observed p95 latency is higher.
+    """
+    name: str
+    model: str
+    max_rows: Optional[int] = None
+    analysis_types: Optional[Sequence[str]] = None
+    max_p95: Optional[float] = None
+
+    def accepts(self, rows: int, analysis_type: str) -> bool:
+        if self.max_rows is not None and rows > self.max_rows:
+            return False
+        return self.analysis_types is None or analysis_type in self.analysis_types
+
+
+class ModelStats:
+    """Rolling window of latencies and outcomes for one model."""
+
+    def __init__(self, window: int = 100):
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        """Record one call; only successful calls contribute latency."""
+        with self._lock:
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(latency)
+
+    @property
+    def calls(self) -> int:
+        return len(self._outcomes)
+
+    def p95(self, min_samples: int = 1) -> Optional[float]:
+        """95th percentile latency, or None with fewer than ``min_samples``."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < max(min_samples, 1):
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def reset(self):
+        """Forget every recorded call."""
+        with self._lock:
+            self._latencies.clear()
+            self._outcomes.clear()
+
+    def error_rate(self, min_samples: int = 1) -> float:
+        """Share of failed calls in the window (0.0 with too few calls)."""
+        with self._lock:
+            outcomes = list(self._outcomes)
+        if len(outcomes) < max(min_samples, 1):
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+
+@dataclass
+class Route:
+    """Tiers to try for one request, in order, plus an optional hedge."""
+    chain: List[Tier]
+    hedge: Optional[Tier] = None
+    hedge_after: Optional[float] = None
+
+    @property
+    def primary(self) -> Tier:
+        return self.chain[0]
+
+
+class ModelRouter:
+    """Chooses a tier per request and runs calls with fallbacks and hedging.
+
+    ``fallbacks`` maps a tier name to the tier names tried, in order, when
+    it fails. ``hedge`` names the tier a slow primary call is duplicated
+    to after ``hedge_after`` seconds, or after the primary model's p95
+    once ``min_samples`` calls were observed. Tiers whose error rate
+    exceeds ``max_error_rate`` are passed over while another accepts the
+    request, except for one probe request every ``cooldown`` seconds; the
+    first successful call to the model clears its stats. Hedged calls run
+    on threads of their own, so they never queue behind other requests.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Tier],
+        fallbacks: Optional[Dict[str, Sequence[str]]] = None,
+        hedge: Optional[str] = None,
+        hedge_after: Optional[float] = None,
+        min_samples: int = 20,
+        max_error_rate: float = 0.5,
+        window: int = 100,
+        cooldown: float = 30.0
+    ):
+        if not tiers:
+            raise ValueError("At least one tier is required")
+        self.tiers = list(tiers)
+        self._by_name = {tier.name: tier for tier in self.tiers}
+        if len(self._by_name) != len(self.tiers):
+            raise ValueError("Tier names must be unique")
+        self.fallbacks = {name: list(chain) for name, chain in (fallbacks or {}).items()}
+        named = set(self.fallbacks).union(*self.fallbacks.values())
+        if hedge is not None:
+            named.add(hedge)
+        unknown = named - set(self._by_name)
+        if unknown:
+            raise ValueError(f"Unknown tiers: {', '.join(sorted(unknown))}")
+
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.cooldown = cooldown
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.fallbacks_used = 0
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+        # Model -> when its tier may next be probed, while it is passed over
+        self._probe_at: Dict[str, float] = {}
+        self._threads: Set[threading.Thread] = set()
+
+    def stats(self, model: str) -> ModelStats:
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None:
+                stats = self._stats[model] = ModelStats(self.window)
+            return stats
+
+    def route(self, rows: int, analysis_type: str) -> Route:
+        """Pick the tiers for a request of ``rows`` rows of ``analysis_type``."""
+        eligible = [t for t in self.tiers if t.accepts(rows, analysis_type)] or self.tiers[-1:]
+        primary = next((t for t in eligible if self._healthy(t)), eligible[0])
+        chain = [primary] + [
+            self._by_name[name] for name in self.fallbacks.get(primary.name, ())
+            if name != primary.name
+        ]
+
+        hedge = self._by_name.get(self.hedge) if self.hedge else None
+        hedge_after = None
+        if hedge is not None and hedge is not primary:
+            hedge_after = self.hedge_after
+            if hedge_after is None:
+                hedge_after = self.stats(primary.model).p95(self.min_samples)
+        if hedge_after is None:
+            hedge = None
+        return Route(chain, hedge, hedge_after)
+
+    def execute(self, route: Route, call: Callable[[Tier], T]) -> Tuple[T, Tier]:
+        """Run ``call(tier)`` along the route; return the answer and its tier.
+
+        The primary attempt is hedged when the route has a hedge. On error
+        the next untried tier in the chain is called; when every tier
+        fails the last error is raised.
+        """
+        tried: Set[str] = set()
+        error: Optional[Exception] = None
+        for index, tier in enumerate(route.chain):
+            if tier.name in tried:
+                continue
+            if index:
+                with self._lock:
+                    self.fallbacks_used += 1
+            try:
+                if index == 0 and route.hedge is not None:
+                    return self._hedged(route, call, tried)
+                tried.add(tier.name)
+                return self._attempt(tier, call), tier
+            except Exception as e:
+                error = e
+        raise error
+
+    def close(self, timeout: Optional[float] = None):
+        """Wait for losing hedged calls still running in the background."""
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(timeout)
+
+    def _healthy(self, tier: Tier) -> bool:
+        stats = self.stats(tier.model)
+        if stats.error_rate(self.min_samples) > self.max_error_rate:
+            return self._probe(tier.model)
+        if tier.max_p95 is not None:
+            p95 = stats.p95(self.min_samples)
+            return p95 is None or p95 <= tier.max_p95
+        return True
+
+    def _probe(self, model: str) -> bool:
+        """Whether an unhealthy model's tier may take one probe request now."""
+        now = time.monotonic()
+        with self._lock:
+            probe_at = self._probe_at.setdefault(model, now + self.cooldown)
+            if now < probe_at:
+                return False
+            # Half-open: this request probes, the rest wait another cooldown
+            self._probe_at[model] = now + self.cooldown
+            return True
+
+    def _attempt(self, tier: Tier, call: Callable[[Tier], T]) -> T:
+        stats = self.stats(tier.model)
+        start = time.perf_counter()
+        try:
+            result = call(tier)
+        except Exception:
+            stats.record(time.perf_counter() - start, False)
+            raise
+        with self._lock:
+            recovered = self._probe_at.pop(tier.model, None) is not None
+        if recovered:
+            stats.reset()
+        stats.record(time.perf_counter() - start, True)
+        return result
+
+    def _hedged(self, route: Route, call: Callable[[Tier], T], tried: Set[str]) -> Tuple[T, Tier]:
+        """Race the primary against the hedge tier once ``hedge_after`` passes.
+
+        The losing call is left to finish in the background so its latency
+        still feeds the stats.
+        """
+        primary, backup = route.primary, route.hedge
+        tried.add(primary.name)
+        futures = {self._start(primary, call): primary}
+        done, _ = wait(futures, timeout=route.hedge_after)
+        if not done:
+            tried.add(backup.name)
+            with self._lock:
+                self.hedged += 1
+            futures[self._start(backup, call)] = backup
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    tier = futures[future]
+                    if tier is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result(), tier
+        raise error
+
+    def _start(self, tier: Tier, call: Callable[[Tier], T]) -> Future:
+        """Run one attempt on its own thread, starting now.
+
+        A shared pool would let queueing eat into ``hedge_after`` and let
+        losing calls starve later requests of workers.
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            try:
+                future.set_result(self._attempt(tier, call))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._threads.discard(thread)
+
+        thread = threading.Thread(target=run, name="neurobloom-hedge", daemon=True)
+        with self._lock:
+            self._threads.add(thread)
+        thread.start()
+        return future
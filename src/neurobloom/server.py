@@ -0,0 +1,285 @@
+"""Production HTTP front end for NeuroBloomService.
+
+``create_app`` builds the WSGI app; ``serve`` runs it under gunicorn with
+pre-forked worker processes, each holding its own service instance.
+
+Usage:
+    OPENAI_API_KEY=... python -m src.neurobloom.server --workers 4 --port 8080
+"""
+
+import argparse
+import functools
+import os
+import time
+from typing import Callable, Optional
+
+from flask import Flask, Response, request, stream_with_context
+from werkzeug.exceptions import BadRequest, HTTPException
+
+from . import compression, jsonutil
+from .jobs import QueueFull
+from .models import AnalysisRequest, ValidationError
+from .ratelimit import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE, RateLimiter
+from .service import STAGE_SECONDS, NeuroBloomService
+from .streaming import NDJSON_CONTENT_TYPE, decode_ndjson
+
+
+DEFAULT_MAX_REQUEST_SIZE = 64 * 1024 * 1024
+
+
+def create_app(
+    service: NeuroBloomService,
+    max_request_size: int = DEFAULT_MAX_REQUEST_SIZE,
+    max_decompressed_size: int = compression.DEFAULT_MAX_DECOMPRESSED_SIZE,
+    compress_min_size: int = compression.DEFAULT_MIN_SIZE
+) -> Flask:
+    """Create the WSGI app serving ``service``.
+    
+    ``POST /api/v1/analyze`` with ``async=true`` queues the analysis and
+    answers 202 at once; poll ``GET /api/v1/analyses/<id>`` for the result.
+    Jobs live in the worker process that accepted them, so multi-worker
+    deployments need sticky routing (or ``--workers 1``) for polling.
+    ``/api/v1/analyze/stream`` answers with NDJSON events, one line per
+    insight as soon as it is parsed, then the full result.
+    ``/metrics`` exposes the service's metrics in Prometheus text format.
+    Under gunicorn each worker process reports its own series.
+    
+    Request bodies may be gzip/zstd encoded; ``max_request_size`` bounds
+    the bytes on the wire and ``max_decompressed_size`` what they expand
+    to. Responses of at least ``compress_min_size`` bytes are compressed
+    per ``Accept-Encoding``.
+    """
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = max_request_size
+    compression.install(app, max_decompressed_size, compress_min_size)
+    metrics = service.metrics
+
+    def _json(payload, status: int = 200) -> Response:
+        with metrics.span(STAGE_SECONDS, stage="serialization"):
+            body = jsonutil.dumps(payload)
+        return Response(body, status=status, mimetype='application/json')
+
+    @app.errorhandler(HTTPException)
+    def http_error(e):
+        return _json({'error': e.description}, e.code)
+
+    def _read_body():
+        """The parsed JSON body, or None for an NDJSON body left to stream."""
+        if request.mimetype == NDJSON_CONTENT_TYPE:
+            return None
+        return _read_json()
+
+    def _read_analysis(body):
+        """Turn a JSON body (None: NDJSON) into service arguments."""
+        if body is None:
+            try:
+                header, rows = decode_ndjson(request.stream)
+                return rows, header['analysis_type'], header.get('model'), False
+            except (ValueError, KeyError):
+                raise BadRequest('Missing required fields')
+
+        try:
+            analysis = AnalysisRequest.from_dict(body)
+        except ValidationError as e:
+            raise BadRequest(str(e))
+        return (analysis.data, analysis.analysis_type, analysis.model,
+                bool(body.get('bypass_cache', False)))
+
+    def _read_json():
+        try:
+            return jsonutil.loads(request.get_data())
+        except ValueError:
+            raise BadRequest('Invalid JSON body')
+
+    def _is_async(body) -> bool:
+        """``async=true`` in the query string or JSON body."""
+        if request.args.get('async', '').lower() == 'true':
+            return True
+        return isinstance(body, dict) and body.get('async') is True
+
+    @app.route('/api/v1/analyze', methods=['POST'])
+    def analyze():
+        body = _read_body()
+        run_async = _is_async(body)
+        if run_async and body is None:
+            raise BadRequest('async is not supported for NDJSON bodies')
+        data, analysis_type, model, bypass_cache = _read_analysis(body)
+        if not run_async:
+            return _json(service.process_analysis(
+                data, analysis_type, model, bypass_cache=bypass_cache
+            ))
+
+        try:
+            pending = service.submit_analysis(
+                data, analysis_type, model, bypass_cache=bypass_cache
+            )
+        except QueueFull as e:
+            response = _json({'error': f'Analysis queue is full: {e}'}, 503)
+            response.headers['Retry-After'] = '1'
+            return response
+        response = _json(pending, 202)
+        response.headers['Location'] = f"/api/v1/analyses/{pending['id']}"
+        return response
+
+    @app.route('/api/v1/analyses/<analysis_id>', methods=['GET'])
+    def get_analysis(analysis_id):
+        result = service.get_analysis(analysis_id)
+        if result is None:
+            return _json({'error': 'Analysis not found'}, 404)
+        return _json(result)
+
+    @app.route('/api/v1/analyze/stream', methods=['POST'])
+    def analyze_stream():
+        data, analysis_type, model, bypass_cache = _read_analysis(_read_body())
+        events = service.stream_analysis(data, analysis_type, model, bypass_cache)
+        lines = (jsonutil.dumps(event) + b'\n' for event in events)
+        return Response(stream_with_context(lines), mimetype=NDJSON_CONTENT_TYPE)
+
+    @app.route('/api/v1/analyze/batch', methods=['POST'])
+    def analyze_batch():
+        try:
+            body = jsonutil.loads(request.get_data())
+        except ValueError:
+            return _json({'error': 'Invalid JSON body'}, 400)
+        if not isinstance(body, dict) or not isinstance(body.get('requests'), list):
+            return _json({'error': 'Missing required fields'}, 400)
+
+        return _json(service.process_batch(body['requests']))
+
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        return Response(
+            metrics.render_prometheus(), mimetype='text/plain; version=0.0.4'
+        )
+
+    @app.route('/health', methods=['GET'])
+    def health():
+        return _json({
+            'status': 'healthy',
+            'service': 'neurobloom-ai',
+            'timestamp': int(time.time())
+        })
+
+    return app
+
+
+def service_from_env(workers: int = 1) -> NeuroBloomService:
+    """Build a service from ``OPENAI_API_KEY`` and related env vars.
+
+    ``OPENAI_REQUESTS_PER_MINUTE``/``OPENAI_TOKENS_PER_MINUTE`` are the API
+    key's budget; each of ``workers`` processes gets an equal share.
+    """
+    rpm = float(os.environ.get('OPENAI_REQUESTS_PER_MINUTE', DEFAULT_REQUESTS_PER_MINUTE))
+    tpm = float(os.environ.get('OPENAI_TOKENS_PER_MINUTE', DEFAULT_TOKENS_PER_MINUTE))
+    return NeuroBloomService(
+        openai_api_key=os.environ['OPENAI_API_KEY'],
+        default_model=os.environ.get('NEUROBLOOM_DEFAULT_MODEL', 'gpt-4'),
+        openai_base_url=os.environ.get('OPENAI_BASE_URL'),
+        rate_limiter=RateLimiter(rpm / workers, tpm / workers)
+    )
+
+
+def serve(
+    host: str = '0.0.0.0',
+    port: int = 8080,
+    workers: int = 2,
+    threads: int = 8,
+    keepalive: int = 5,
+    graceful_timeout: int = 30,
+    timeout: int = 120,
+    max_request_size: int = DEFAULT_MAX_REQUEST_SIZE,
+    max_decompressed_size: int = compression.DEFAULT_MAX_DECOMPRESSED_SIZE,
+    compress_min_size: int = compression.DEFAULT_MIN_SIZE,
+    service_factory: Optional[Callable[[], NeuroBloomService]] = None
+):
+    """Run the app under gunicorn until SIGTERM/SIGINT.
+
+    Each worker process calls ``service_factory`` after forking so no
+    HTTP connections are shared across processes. Every worker rate-limits
+    its own OpenAI calls, so the default factory (``service_from_env``)
+    gives each worker ``1/workers`` of the key's budget; a custom factory
+    must split the budget itself. On SIGTERM workers stop accepting
+    connections and get ``graceful_timeout`` seconds to finish in-flight
+    requests.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    if service_factory is None:
+        service_factory = functools.partial(service_from_env, workers=workers)
+
+    class _Application(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread',
+                'keepalive': keepalive,
+                'graceful_timeout': graceful_timeout,
+                'timeout': timeout,
+                'limit_request_line': 8190,
+                'limit_request_field_size': 8190,
+                'preload_app': False,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            service = service_factory()
+            # Import openai while the worker boots, not on its first request
+            service.openai_client
+            return create_app(
+                service,
+                max_request_size=max_request_size,
+                max_decompressed_size=max_decompressed_size,
+                compress_min_size=compress_min_size
+            )
+
+    _Application().run()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options for ``serve``."""
+    parser = argparse.ArgumentParser(description='Serve NeuroBloomService over HTTP.')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help='worker processes (default: CPU count); each gets an equal '
+                             'share of the OpenAI rate-limit budget')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='threads per worker for concurrent OpenAI calls')
+    parser.add_argument('--keepalive', type=int, default=5,
+                        help='seconds to hold idle keep-alive connections')
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='seconds workers get to finish requests on shutdown')
+    parser.add_argument('--timeout', type=int, default=120,
+                        help='seconds before a silent worker is restarted')
+    parser.add_argument('--max-request-size', type=int, default=DEFAULT_MAX_REQUEST_SIZE,
+                        help='maximum request body size in bytes, as sent')
+    parser.add_argument('--max-decompressed-size', type=int,
+                        default=compression.DEFAULT_MAX_DECOMPRESSED_SIZE,
+                        help='maximum size in bytes a compressed body may expand to')
+    parser.add_argument('--compress-min-size', type=int, default=compression.DEFAULT_MIN_SIZE,
+                        help='smallest response in bytes that is compressed')
+    return parser
+
+
+def main(argv: Optional[list] = None):
+    """CLI entry point."""
+    args = build_parser().parse_args(argv)
+    serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        threads=args.threads,
+        keepalive=args.keepalive,
+        graceful_timeout=args.graceful_timeout,
+        timeout=args.timeout,
+        max_request_size=args.max_request_size,
+        max_decompressed_size=args.max_decompressed_size,
+        compress_min_size=args.compress_min_size
+    )
+
+
+if __name__ == '__main__':
+    main()
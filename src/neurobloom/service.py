@@ -1,113 +1,552 @@
 """AI analysis service implementation."""
 
-import json
+import asyncio
+import functools
+import itertools
+import threading
 import time
-from typing import Dict, List, Optional
-import openai
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
+from .cache import AnalysisCache, make_cache_key
+from .jobs import JobQueue
+from .metrics import NULL_METRICS, Metrics
+from .models import AnalysisRequest, ValidationError
+from .prompts import PromptBuilder
+from .ratelimit import RateLimiter, RetryPolicy, parse_duration
+from .routing import ModelRouter, Route, Tier
+from .singleflight import SingleFlight
+from .summary import DatasetSummary, summarize
+
+if TYPE_CHECKING:
+    import httpx
+
+
+_analysis_counter = itertools.count(1)
+
+STAGE_SECONDS = "neurobloom_service_stage_seconds"
+
+
+@functools.lru_cache(maxsize=None)
+def _retryable_errors() -> tuple:
+    """Transient OpenAI failures worth another attempt, rate limits first.
+    
+    ``openai`` takes a quarter second to import, so it is loaded on the
+    first completion rather than with this module.
+    """
+    import openai
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+def _new_analysis_id() -> str:
+    """Return an analysis id that stays unique within a batch."""
+    return f"analysis_{int(time.time() * 1000)}_{next(_analysis_counter)}"
+
+
+def _parse_insight_line(line: str) -> Optional[str]:
+    """Return the insight in one line of completion text, if any."""
+    line = line.strip()
+    if not line or line.startswith(('Here', 'Based', 'Analysis')):
+        return None
+    return line.lstrip('•-*').strip()
+
+
+class InsightParser:
+    """Incremental bullet parser for streamed completion text.
+    
+    ``feed`` returns the insights whose lines were completed by a chunk;
+    ``close`` flushes the final unterminated line. At most ``limit``
+    insights are produced, matching the non-streaming parser.
+    """
+    
+    def __init__(self, limit: int = 5):
+        self.limit = limit
+        self.count = 0
+        self._buffer = ""
+    
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        return self._take(lines)
+    
+    def close(self) -> List[str]:
+        line, self._buffer = self._buffer, ""
+        return self._take([line])
+    
+    def _take(self, lines: List[str]) -> List[str]:
+        insights = []
+        for line in lines:
+            insight = _parse_insight_line(line)
+            if insight is not None and self.count < self.limit:
+                insights.append(insight)
+                self.count += 1
+        return insights
 
 
 class NeuroBloomService:
     """Service for processing AI analysis using OpenAI."""
     
-    def __init__(self, openai_api_key: str, default_model: str = "gpt-4"):
-        """Initialize service with OpenAI API key."""
-        self.openai_client = openai.OpenAI(api_key=openai_api_key)
+    system_prompt = "You are a data analysis expert. Provide 3-5 key insights in bullet points."
+    max_tokens = 500
+    temperature = 0.3
+    prompt_sample_size = 5
+    
+    def __init__(
+        self,
+        openai_api_key: str,
+        default_model: str = "gpt-4",
+        batch_workers: int = 8,
+        cache: Optional[AnalysisCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        openai_base_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        job_workers: int = 4,
+        max_queued_jobs: int = 100,
+        openai_http_client: Optional["httpx.Client"] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+        router: Optional[ModelRouter] = None
+    ):
+        """Initialize service with OpenAI API key and optional insight cache.
+        
+        Retries are handled here (see ``_call_openai``), so the OpenAI
+        client's own retries are disabled. Pass ``metrics`` to record
+        per-stage timings (``neurobloom_service_stage_seconds``) and
+        OpenAI attempt/retry counters. Background analyses (see
+        ``submit_analysis``) run on ``job_workers`` threads with at most
+        ``max_queued_jobs`` waiting. ``openai_http_client`` replaces the
+        OpenAI client's HTTP client, e.g. one using a ``CassetteTransport``
+        to record or replay completions. Prompts come from
+        ``prompt_builder``, which trims data to each model's token budget.
+        With a ``router``, requests that name no model are routed to a
+        tier, with its fallbacks and hedging; ``raw_data["tier"]`` reports
+        the tier that answered. The OpenAI client is created on first use.
+        """
+        self._openai_options = dict(
+            api_key=openai_api_key, base_url=openai_base_url, max_retries=0,
+            http_client=openai_http_client
+        )
+        self._openai_client = None
+        self._openai_lock = threading.Lock()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
         self.default_model = default_model
+        self.batch_workers = batch_workers
+        self.cache = cache
+        self.singleflight = SingleFlight()
+        self.metrics = metrics or NULL_METRICS
+        self.jobs = JobQueue(self.process_analysis, job_workers, max_queued_jobs)
+        self.prompt_builder = prompt_builder or PromptBuilder(self.system_prompt, self.max_tokens)
+        self.router = router
+    
+    @property
+    def openai_client(self):
+        """The OpenAI client, created (and ``openai`` imported) on first access."""
+        if self._openai_client is None:
+            with self._openai_lock:
+                if self._openai_client is None:
+                    import openai
+                    self._openai_client = openai.OpenAI(**self._openai_options)
+        return self._openai_client
+    
+    @openai_client.setter
+    def openai_client(self, client):
+        self._openai_client = client
+    
+    @property
+    def coalesced_count(self) -> int:
+        """Requests answered by sharing another in-flight call."""
+        return self.singleflight.coalesced
     
     def process_analysis(
         self, 
-        data: List[Dict], 
+        data: Iterable[Dict], 
         analysis_type: str, 
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> Dict:
-        """Process data analysis using OpenAI."""
+        """Process data analysis using OpenAI.
+        
+        ``data`` is consumed once and incrementally, so generators and
+        streamed NDJSON rows work without materializing the dataset; it is
+        reduced to a fixed-size columnar summary for the prompt.
+        
+        With a cache configured, identical prompts for the same model and
+        sampling settings are answered from the cache. ``bypass_cache`` skips
+        the lookup but still refreshes the stored entry. Identical requests
+        already in flight wait for that call instead of issuing their own.
+        """
         model_to_use = model or self.default_model
         start_time = time.time()
         
         try:
-            # Create analysis prompt based on type
-            prompt = self._create_analysis_prompt(data, analysis_type)
-            
-            # Call OpenAI API
-            insights = self._call_openai(prompt, model_to_use)
-            
-            # Calculate processing time
-            processing_time = round(time.time() - start_time, 2)
+            prepared = self._prepare(data, analysis_type, model)
+            model_to_use, flight = self._flight(prepared, analysis_type, model_to_use, bypass_cache)
+            outcome, coalesced = self.singleflight.do(*flight)
+            return self._flight_result(
+                prepared, outcome, coalesced, analysis_type, model_to_use, start_time
+            )
+        except Exception as e:
+            return self._failed_result(e, model_to_use, start_time)
+    
+    async def aprocess_analysis(
+        self, 
+        data: Iterable[Dict], 
+        analysis_type: str, 
+        model: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> Dict:
+        """Asyncio variant of ``process_analysis``.
+        
+        Summarizing the data and the blocking OpenAI call run in worker
+        threads; async and threaded callers coalesce with each other.
+        """
+        model_to_use = model or self.default_model
+        start_time = time.time()
+        
+        try:
+            prepared = await asyncio.to_thread(self._prepare, data, analysis_type, model)
+            model_to_use, flight = self._flight(prepared, analysis_type, model_to_use, bypass_cache)
+            outcome, coalesced = await self.singleflight.do_async(*flight)
+            return self._flight_result(
+                prepared, outcome, coalesced, analysis_type, model_to_use, start_time
+            )
+        except Exception as e:
+            return self._failed_result(e, model_to_use, start_time)
+    
+    def submit_analysis(
+        self,
+        data: Iterable[Dict],
+        analysis_type: str,
+        model: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> Dict:
+        """Queue an analysis and return its ``"queued"`` response immediately.
+        
+        Poll ``get_analysis`` with the returned ``id``. Raises ``QueueFull``
+        when ``max_queued_jobs`` analyses are already waiting. ``data`` is
+        read by a worker later, so it must stay valid until then.
+        """
+        return self.jobs.submit(
+            _new_analysis_id(), data, analysis_type, model, bypass_cache=bypass_cache
+        )
+    
+    def get_analysis(self, analysis_id: str) -> Optional[Dict]:
+        """Return a submitted analysis (possibly still pending), or None if unknown."""
+        return self.jobs.get(analysis_id)
+    
+    def stream_analysis(
+        self,
+        data: Iterable[Dict],
+        analysis_type: str,
+        model: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> Iterator[Dict]:
+        """Process data analysis, yielding each insight as soon as it is complete.
+        
+        Yields ``{"index", "insight"}`` events while the completion streams
+        in, then one ``{"result"}`` event holding the same response
+        ``process_analysis`` would return (``status`` is ``"failed"`` on
+        error). Streamed calls use and fill the cache but are not coalesced;
+        routed ones use the chosen tier without fallbacks or hedging.
+        """
+        model_to_use = model or self.default_model
+        start_time = time.time()
+        started = time.perf_counter()
+        insights = []
+        
+        try:
+            summary, prompt, route = self._prepare(data, analysis_type, model)
+            tier = None
+            if route is not None:
+                tier = route.primary
+                model_to_use = tier.model
+            cache_key = make_cache_key(prompt, model_to_use, self.temperature, self.max_tokens)
+            cached = None
+            if self.cache is not None and not bypass_cache:
+                cached = self.cache.get(cache_key)
             
-            # Generate response
-            return {
-                "id": f"analysis_{int(time.time() * 1000)}",
-                "status": "completed",
-                "insights": insights,
-                "confidence_score": self._calculate_confidence(insights, data),
-                "raw_data": {
-                    "model_used": model_to_use,
-                    "processing_time": processing_time,
-                    "data_points": len(data),
-                    "analysis_type": analysis_type
-                }
-            }
+            source = cached if cached is not None else self._stream_openai(prompt, model_to_use)
+            for insight in source:
+                if not insights:
+                    self.metrics.observe(
+                        "neurobloom_service_first_insight_seconds",
+                        time.perf_counter() - started
+                    )
+                yield {"index": len(insights), "insight": insight}
+                insights.append(insight)
             
+            if cached is None and self.cache is not None:
+                self.cache.set(cache_key, insights)
+            result = self._completed_result(
+                insights, summary, analysis_type, model_to_use,
+                start_time, cached is not None, False, tier
+            )
         except Exception as e:
-            return {
-                "id": f"analysis_{int(time.time() * 1000)}",
-                "status": "failed",
-                "insights": [],
-                "confidence_score": 0.0,
-                "raw_data": {
-                    "error": str(e),
-                    "model_used": model_to_use,
-                    "processing_time": round(time.time() - start_time, 2)
-                }
-            }
+            result = self._failed_result(e, model_to_use, start_time)
+        yield {"result": result}
     
-    def _create_analysis_prompt(self, data: List[Dict], analysis_type: str) -> str:
-        """Create analysis prompt based on data and type."""
-        data_summary = json.dumps(data[:5], indent=2)  # Limit for prompt size
+    def _prepare(self, data: Iterable[Dict], analysis_type: str, model: Optional[str]):
+        """Summarize the data, route it unless ``model`` is given, and build the prompt.
         
-        prompts = {
-            "time_series": f"Analyze this time series data for trends and patterns:\n{data_summary}",
-            "classification": f"Classify and analyze patterns in this data:\n{data_summary}",
-            "sales_forecasting": f"Analyze sales data and provide forecasting insights:\n{data_summary}",
-            "default": f"Provide insights and analysis for this {analysis_type} data:\n{data_summary}"
-        }
+        Returns the summary, the prompt for the model to call and the
+        router's ``Route`` (None when not routed).
+        """
+        with self.metrics.span(STAGE_SECONDS, stage="summarize"):
+            summary = summarize(data, self.prompt_sample_size)
+        route = None
+        if model is None and self.router is not None:
+            route = self.router.route(summary.rows, analysis_type)
+            model = route.primary.model
+        with self.metrics.span(STAGE_SECONDS, stage="prompt"):
+            prompt = self._create_analysis_prompt(
+                summary, analysis_type, model or self.default_model
+            )
+        return summary, prompt, route
+    
+    def _flight(self, prepared, analysis_type: str, model: str, bypass_cache: bool):
+        """The model to call and the ``SingleFlight`` arguments for a prepared analysis."""
+        summary, prompt, route = prepared
+        if route is not None:
+            model = route.primary.model
+        key = self._flight_key(prompt, model, bypass_cache)
+        complete = functools.partial(
+            self._complete, prompt, model, route, summary, analysis_type
+        )
+        return model, (key, self._fetch_insights, prompt, model, bypass_cache, complete)
+    
+    def _flight_result(self, prepared, outcome, coalesced: bool, analysis_type: str,
+                       model: str, start_time: float) -> Dict:
+        """The completed response for a ``SingleFlight`` outcome."""
+        summary, _, route = prepared
+        insights, cache_hit, tier = outcome
+        if tier is None and route is not None:
+            tier = route.primary
+        return self._completed_result(
+            insights, summary, analysis_type, model, start_time, cache_hit, coalesced, tier
+        )
+    
+    def _flight_key(self, prompt: str, model: str, bypass_cache: bool) -> str:
+        """Key identical in-flight requests share; bypassing ones never join cached ones."""
+        key = make_cache_key(prompt, model, self.temperature, self.max_tokens)
+        return f"{key}:bypass" if bypass_cache else key
+    
+    def _fetch_insights(self, prompt: str, model: str, bypass_cache: bool, complete):
+        """Serve repeats from the cache, otherwise call ``complete``.
+        
+        Returns ``(insights, cache_hit, tier)``; ``tier`` is the routing
+        tier that answered (None when not routed or served from cache).
+        """
+        insights = None
+        if self.cache is not None:
+            cache_key = make_cache_key(prompt, model, self.temperature, self.max_tokens)
+            if not bypass_cache:
+                insights = self.cache.get(cache_key)
+        if insights is not None:
+            return insights, True, None
         
-        return prompts.get(analysis_type, prompts["default"])
+        insights, tier = complete()
+        if self.cache is not None:
+            self.cache.set(cache_key, insights)
+        return insights, False, tier
+    
+    def _complete(
+        self,
+        prompt: str,
+        model: str,
+        route: Optional[Route],
+        summary: DatasetSummary,
+        analysis_type: str
+    ):
+        """Call OpenAI for ``model``, or along ``route`` with fallbacks and hedging."""
+        if route is None:
+            return self._call_openai(prompt, model), None
+        prompts = {model: prompt}
+        
+        def call(tier: Tier) -> List[str]:
+            # Tiers may use models with other budgets, so their prompts differ
+            if tier.model not in prompts:
+                prompts[tier.model] = self._create_analysis_prompt(
+                    summary, analysis_type, tier.model
+                )
+            return self._call_openai(prompts[tier.model], tier.model)
+        
+        insights, tier = self.router.execute(route, call)
+        return insights, tier
+    
+    def _completed_result(
+        self,
+        insights: List[str],
+        summary: DatasetSummary,
+        analysis_type: str,
+        model: str,
+        start_time: float,
+        cache_hit: bool,
+        coalesced: bool,
+        tier: Optional[Tier] = None
+    ) -> Dict:
+        """Build the response for a completed analysis."""
+        with self.metrics.span(STAGE_SECONDS, stage="confidence"):
+            confidence = self._calculate_confidence(insights, summary.rows)
+        result = {
+            "id": _new_analysis_id(),
+            "status": "completed",
+            "insights": list(insights),
+            "confidence_score": confidence,
+            "raw_data": {
+                "model_used": model,
+                "processing_time": round(time.time() - start_time, 2),
+                "data_points": summary.rows,
+                "analysis_type": analysis_type,
+                "cache_hit": cache_hit,
+                "coalesced": coalesced
+            }
+        }
+        if tier is not None:
+            result["raw_data"]["model_used"] = tier.model
+            result["raw_data"]["tier"] = tier.name
+        return result
+    
+    def _failed_result(self, error: Exception, model: str, start_time: float) -> Dict:
+        """Build the response for a failed analysis."""
+        return {
+            "id": _new_analysis_id(),
+            "status": "failed",
+            "insights": [],
+            "confidence_score": 0.0,
+            "raw_data": {
+                "error": str(error),
+                "model_used": model,
+                "processing_time": round(time.time() - start_time, 2)
+            }
+        }
+    
+    def process_batch(self, requests: List[Dict]) -> Dict:
+        """Process many analysis requests concurrently.
+
+        Each item gets its own entry in ``results``, in input order: either
+        ``{"index", "result"}`` or ``{"index", "error"}`` when the item itself
+        is malformed. Items are validated like single requests (see
+        ``AnalysisRequest.from_dict``). One bad item never fails the whole
+        batch.
+        """
+        def run(index: int, item: Dict) -> Dict:
+            if not isinstance(item, dict) or "data" not in item or "analysis_type" not in item:
+                return {"index": index, "error": "Missing required fields"}
+            try:
+                analysis = AnalysisRequest.from_dict(item, f"requests[{index}].")
+            except ValidationError as e:
+                return {"index": index, "error": str(e)}
+            result = self.process_analysis(
+                analysis.data, analysis.analysis_type, item.get("model"),
+                bypass_cache=bool(item.get("bypass_cache", False))
+            )
+            return {"index": index, "result": result}
+
+        if not requests:
+            return {"results": []}
+
+        workers = min(self.batch_workers, len(requests))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, range(len(requests)), requests))
+
+        return {"results": results}
+    
+    def _create_analysis_prompt(
+        self, summary: DatasetSummary, analysis_type: str, model: str
+    ) -> str:
+        """Create analysis prompt based on a dataset summary and type."""
+        return self.prompt_builder.build(summary, analysis_type, model)
     
     def _call_openai(self, prompt: str, model: str) -> List[str]:
         """Call OpenAI API and parse insights."""
+        response = self._create_completion(prompt, model)
+        with self.metrics.span(STAGE_SECONDS, stage="parse"):
+            return self._parse_insights(response.choices[0].message.content)
+    
+    def _stream_openai(self, prompt: str, model: str) -> Iterator[str]:
+        """Stream a completion, yielding insights as their lines complete.
+        
+        Only opening the stream is retried; an error mid-stream is raised
+        to the caller, which has already seen the earlier insights.
+        """
+        parser = InsightParser()
+        stream = self._create_completion(prompt, model, stream=True)
         try:
-            response = self.openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a data analysis expert. Provide 3-5 key insights in bullet points."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            content = response.choices[0].message.content
-            # Parse bullet points into list
-            insights = [
-                line.strip().lstrip('•-*').strip() 
-                for line in content.split('\n') 
-                if line.strip() and not line.strip().startswith(('Here', 'Based', 'Analysis'))
-            ]
-            
-            return insights[:5]  # Limit to 5 insights
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    yield from parser.feed(text)
+            yield from parser.close()
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+    
+    def _create_completion(self, prompt: str, model: str, stream: bool = False):
+        """Request a chat completion, retrying transient failures.
+        
+        Each attempt first takes budget from the rate limiter. Rate limits,
+        timeouts, connection errors and 5xx responses are retried with
+        jittered exponential backoff until the retry policy's attempts or
+        deadline run out, then the last error is raised.
+        """
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        estimated_tokens = self.prompt_builder.request_tokens(prompt)
+        retryable = _retryable_errors()
+        
+        for attempt in range(policy.max_attempts):
+            self.rate_limiter.acquire(estimated_tokens, deadline)
+            self.metrics.inc("neurobloom_service_openai_attempts_total", model=model)
+            if attempt:
+                self.metrics.inc("neurobloom_service_openai_retries_total", model=model)
+            try:
+                with self.metrics.span(STAGE_SECONDS, stage="openai"):
+                    raw = self.openai_client.chat.completions.with_raw_response.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        stream=stream
+                    )
+            except retryable as e:
+                headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                self.rate_limiter.update_from_headers(headers)
+                delay = policy.delay(attempt, parse_duration(headers.get("retry-after")))
+                
+                if attempt + 1 >= policy.max_attempts or time.monotonic() + delay > deadline:
+                    raise
+                if isinstance(e, retryable[0]):
+                    # Hold every caller sharing the limiter, not just this one
+                    self.rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
             
-        except Exception as e:
-            # Fallback to mock insights if OpenAI fails
-            return [f"Analysis completed for {len(data)} data points", 
-                   f"Error in AI processing: {str(e)}"]
+            self.rate_limiter.update_from_headers(raw.headers)
+            return raw.parse()
+    
+    def _parse_insights(self, content: str) -> List[str]:
+        """Parse bullet points into a list of at most 5 insights."""
+        parser = InsightParser(limit=5)
+        return parser.feed(content) + parser.close()
     
-    def _calculate_confidence(self, insights: List[str], data: List[Dict]) -> float:
+    def _calculate_confidence(self, insights: List[str], data_points: int) -> float:
         """Calculate confidence score based on insights and data quality."""
         base_confidence = 0.7
         
         # Adjust based on data size
-        data_size_factor = min(len(data) / 100, 0.2)  # Max 0.2 boost
+        data_size_factor = min(data_points / 100, 0.2)  # Max 0.2 boost
         
         # Adjust based on insights quality
         insights_factor = min(len(insights) * 0.05, 0.1)  # Max 0.1 boost
@@ -0,0 +1,55 @@
+"""Streaming (NDJSON) encoding and incremental ingestion of analysis data.
+
+A streamed analysis body is newline-delimited JSON: the first line is a
+header object with ``analysis_type`` and ``model``, every following line is
+one data row. Neither side ever holds the full dataset in memory.
+"""
+
+import itertools
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from . import jsonutil
+from .models import AnalysisRequest
+
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+
+def encode_ndjson(request: AnalysisRequest, chunk_rows: int = 500) -> Iterator[bytes]:
+    """Yield the NDJSON body for ``request`` in chunks of ``chunk_rows`` rows."""
+    header = {"analysis_type": request.analysis_type, "model": request.model}
+    yield jsonutil.dumps(header) + b'\n'
+
+    rows = iter(request.data)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield b''.join(jsonutil.dumps(row) + b'\n' for row in chunk)
+
+
+def decode_ndjson(lines: Iterable[bytes]) -> Tuple[Dict, Iterator[Dict]]:
+    """Split an NDJSON body into its header and a lazy row iterator."""
+    lines = (line for line in lines if line.strip())
+    try:
+        header = jsonutil.loads(next(lines))
+    except StopIteration:
+        raise ValueError("Empty NDJSON body")
+    if not isinstance(header, dict):
+        raise ValueError("NDJSON header must be an object")
+
+    return header, (jsonutil.loads(line) for line in lines)
+
+
+def sample_rows(data: Iterable[Dict], sample_size: int = 5) -> Tuple[List[Dict], int]:
+    """Consume ``data`` once, keeping the first rows and the total count."""
+    if isinstance(data, (list, tuple)):
+        return list(data[:sample_size]), len(data)
+
+    sample = []
+    count = 0
+    for row in data:
+        if count < sample_size:
+            sample.append(row)
+        count += 1
+    return sample, count
@@ -0,0 +1,320 @@
+"""Columnar, vectorized dataset summaries for prompt construction.
+
+Rows are converted to NumPy columns one chunk at a time and reduced to
+mergeable statistics, so the summary of an arbitrarily long (or streamed)
+dataset has a fixed size. The compact text form goes into the prompt in
+place of raw rows.
+"""
+
+import itertools
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+
+@dataclass
+class NumericColumn:
+    """Running statistics for a numeric column."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+    # Row-index moments for the least-squares trend slope
+    mean_x: float = 0.0
+    m2_x: float = 0.0
+    c_xy: float = 0.0
+    head: List[np.ndarray] = field(default_factory=list)
+    head_size: int = 0
+    # period() results by min_correlation, cleared when the head grows
+    _periods: Dict[float, Optional[int]] = field(default_factory=dict, repr=False, compare=False)
+
+    def update(self, x: np.ndarray, y: np.ndarray, series_points: int):
+        """Merge a chunk of (row index, value) pairs."""
+        mask = ~np.isnan(y)
+        x, y = x[mask], y[mask]
+        n_b = y.size
+        if n_b == 0:
+            return
+
+        mean_b = float(y.mean())
+        mean_xb = float(x.mean())
+        dy = y - mean_b
+        dx = x - mean_xb
+        m2_b = float(dy @ dy)
+        m2_xb = float(dx @ dx)
+        c_b = float(dx @ dy)
+
+        # Chan et al. parallel merge of means and (co-)moments
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        delta_x = mean_xb - self.mean_x
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.m2_x += m2_xb + delta_x * delta_x * n_a * n_b / n
+        self.c_xy += c_b + delta_x * delta * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self.mean_x += delta_x * n_b / n
+        self.count = n
+        self.minimum = min(self.minimum, float(y.min()))
+        self.maximum = max(self.maximum, float(y.max()))
+
+        if self.head_size < series_points:
+            keep = y[:series_points - self.head_size]
+            self.head.append(keep)
+            self.head_size += keep.size
+            self._periods.clear()
+
+    @property
+    def std(self) -> float:
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+    @property
+    def slope(self) -> float:
+        """Least-squares change in value per row."""
+        return self.c_xy / self.m2_x if self.m2_x else 0.0
+
+    def period(self, min_correlation: float = 0.5) -> Optional[int]:
+        """Dominant repeat length (in rows) from the autocorrelation, if any."""
+        if min_correlation not in self._periods:
+            self._periods[min_correlation] = self._period(min_correlation)
+        return self._periods[min_correlation]
+
+    def _period(self, min_correlation: float) -> Optional[int]:
+        if not self.head:
+            return None
+        series = np.concatenate(self.head)
+        n = series.size
+        if n < 8:
+            return None
+
+        # Detrend, then autocorrelate via FFT
+        idx = np.arange(n, dtype=np.float64)
+        series = series - np.polyval(np.polyfit(idx, series, 1), idx)
+        variance = float(series @ series)
+        if variance == 0.0:
+            return None
+        spectrum = np.fft.rfft(series, 2 * n)
+        acf = np.fft.irfft(spectrum * np.conj(spectrum))[:n // 2] / variance
+
+        # First local maximum after the correlation drops below zero
+        below = np.nonzero(acf < 0)[0]
+        if below.size == 0:
+            return None
+        lag = int(below[0] + np.argmax(acf[below[0]:]))
+        return lag if acf[lag] >= min_correlation else None
+
+
+@dataclass
+class CategoricalColumn:
+    """Value counts for a non-numeric column, capped in cardinality."""
+    count: int = 0
+    counts: Optional[Counter] = field(default_factory=Counter)
+
+    def update(self, values, max_distinct: int):
+        """Merge a chunk of values (a list or a NumPy array)."""
+        if isinstance(values, np.ndarray):
+            self.count += values.size
+            if self.counts is None:
+                return
+            uniques, counts = np.unique(values, return_counts=True)
+            self.counts.update(dict(zip(map(str, uniques.tolist()), counts.tolist())))
+        else:
+            present = [str(v) for v in values if v is not None]
+            self.count += len(present)
+            if self.counts is None:
+                return
+            self.counts.update(present)
+        if len(self.counts) > max_distinct:
+            self.counts = None
+
+    @property
+    def high_cardinality(self) -> bool:
+        return self.counts is None
+
+
+@dataclass
+class DatasetSummary:
+    """Fixed-size summary of a dataset."""
+    rows: int
+    sample: List[Dict]
+    numeric: Dict[str, NumericColumn]
+    categorical: Dict[str, CategoricalColumn]
+    max_distinct: int = 1000
+
+    def to_prompt(self, max_columns: int = 40, top_categories: int = 5,
+                  sample_rows: Optional[int] = None) -> str:
+        """Render the compact text used in analysis prompts.
+
+        ``sample_rows`` caps the sample rows included (all by default).
+        """
+        lines = [f"rows: {self.rows}", "columns:"]
+
+        for name, col in itertools.islice(self.numeric.items(), max_columns):
+            line = (
+                f"- {name} (numeric, n={col.count}): mean={col.mean:.4g} "
+                f"std={col.std:.4g} min={col.minimum:.4g} max={col.maximum:.4g} "
+                f"trend={col.slope:+.4g}/row"
+            )
+            period = col.period()
+            if period:
+                line += f" seasonality~{period} rows"
+            lines.append(line)
+
+        remaining = max(max_columns - len(self.numeric), 0)
+        for name, col in itertools.islice(self.categorical.items(), remaining):
+            # A mixed column also has a numeric line; this one counts the rest
+            kind = "non-numeric" if name in self.numeric else "categorical"
+            if col.high_cardinality:
+                lines.append(
+                    f"- {name} ({kind}, n={col.count}, >{self.max_distinct} distinct)"
+                )
+                continue
+            top = ", ".join(
+                f"{value}={count}" for value, count in col.counts.most_common(top_categories)
+            )
+            lines.append(
+                f"- {name} ({kind}, n={col.count}, {len(col.counts)} distinct): {top}"
+            )
+
+        hidden = len(self.numeric) + len(self.categorical) - max_columns
+        if hidden > 0:
+            lines.append(f"- ... {hidden} more columns")
+
+        sample = self.sample if sample_rows is None else self.sample[:sample_rows]
+        lines.append("sample rows:")
+        lines.extend(json.dumps(row, separators=(',', ':'), default=str) for row in sample)
+        return "\n".join(lines)
+
+
+class DataSummarizer:
+    """Builds a DatasetSummary from rows or columns, chunk by chunk."""
+
+    def __init__(
+        self,
+        sample_size: int = 5,
+        chunk_rows: int = 65536,
+        max_distinct: int = 1000,
+        series_points: int = 4096
+    ):
+        self.sample_size = sample_size
+        self.chunk_rows = chunk_rows
+        self.max_distinct = max_distinct
+        self.series_points = series_points
+        self.rows = 0
+        self.sample: List[Dict] = []
+        self.numeric: Dict[str, NumericColumn] = {}
+        self.categorical: Dict[str, CategoricalColumn] = {}
+
+    def update(self, rows: Iterable[Dict]):
+        """Consume row dicts once, in chunks."""
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_rows))
+            if not chunk:
+                return
+            if len(self.sample) < self.sample_size:
+                self.sample.extend(chunk[:self.sample_size - len(self.sample)])
+
+            keys = dict.fromkeys(itertools.chain.from_iterable(
+                row.keys() for row in chunk
+            ))
+            columns = {key: [row.get(key) for row in chunk] for key in keys}
+            self._update_columns(columns, len(chunk))
+
+    def update_columns(self, columns: Mapping[str, Iterable]):
+        """Consume already-columnar data (e.g. NumPy arrays) of equal length."""
+        columns = {
+            key: values if isinstance(values, np.ndarray) else list(values)
+            for key, values in columns.items()
+        }
+        length = len(next(iter(columns.values()))) if columns else 0
+        if len(self.sample) < self.sample_size:
+            take = min(self.sample_size - len(self.sample), length)
+            self.sample.extend(
+                {key: _to_python(values[i]) for key, values in columns.items()}
+                for i in range(take)
+            )
+        self._update_columns(columns, length)
+
+    def summary(self) -> DatasetSummary:
+        return DatasetSummary(
+            rows=self.rows,
+            sample=self.sample,
+            numeric=self.numeric,
+            categorical=self.categorical,
+            max_distinct=self.max_distinct
+        )
+
+    def _update_columns(self, columns: Mapping, length: int):
+        x = np.arange(self.rows, self.rows + length, dtype=np.float64)
+        for key, values in columns.items():
+            key = str(key)
+            if key in self.numeric:
+                array = _as_numeric(values)
+                if array is None:
+                    # Mixed column: keep the numeric statistics from earlier
+                    # chunks and count the non-numeric values alongside them
+                    array, others = _split_numeric(values)
+                    if others:
+                        column = self.categorical.setdefault(key, CategoricalColumn())
+                        column.update(others, self.max_distinct)
+                self.numeric[key].update(x, array, self.series_points)
+                continue
+
+            if key not in self.categorical and all(v is None for v in values):
+                # Nothing to classify the column by yet
+                continue
+            array = None if key in self.categorical else _as_numeric(values)
+            if array is not None:
+                self.numeric[key] = NumericColumn()
+                self.numeric[key].update(x, array, self.series_points)
+            else:
+                column = self.categorical.setdefault(key, CategoricalColumn())
+                column.update(values, self.max_distinct)
+        self.rows += length
+
+
+def summarize(data: Iterable[Dict], sample_size: int = 5) -> DatasetSummary:
+    """Summarize row dicts (list or any iterable) in a single pass."""
+    summarizer = DataSummarizer(sample_size=sample_size)
+    summarizer.update(data)
+    return summarizer.summary()
+
+
+def _as_numeric(values) -> Optional[np.ndarray]:
+    """Return ``values`` as a float array, or None if they are not numeric."""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "iuf":
+            return values.astype(np.float64, copy=False)
+        return None
+
+    first = next((v for v in values if v is not None), None)
+    if first is None or isinstance(first, bool) or not isinstance(first, (int, float)):
+        return None
+    try:
+        # None becomes NaN and is skipped by the column statistics
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+def _split_numeric(values):
+    """Split a mixed column into a float array (NaN where not numeric) and the rest."""
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    numbers = np.full(len(values), np.nan)
+    others = []
+    for i, value in enumerate(values):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            numbers[i] = value
+        elif value is not None:
+            others.append(value)
+    return numbers, others
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
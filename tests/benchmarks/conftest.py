@@ -0,0 +1,12 @@
+"""Skip the benchmarks, rather than erroring, when pytest-benchmark is off."""
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.pluginmanager.hasplugin('benchmark'):
+        return
+    skip = pytest.mark.skip(reason='pytest-benchmark is not installed or disabled')
+    for item in items:
+        if 'benchmark' in getattr(item, 'fixturenames', ()):
+            item.add_marker(skip)
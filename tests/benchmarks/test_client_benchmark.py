@@ -0,0 +1,38 @@
+"""Client latency benchmarks against the mock server (pytest-benchmark)."""
+
+import pytest
+from src.neurobloom.bench import make_requests, run_load
+from src.neurobloom.client import NeuroBloomClient
+from tests.integration.mock_server import Latency, MockNeuroBloomServer
+
+
+@pytest.fixture(scope='module')
+def fast_mock_url():
+    """Mock server with no simulated processing time."""
+    with MockNeuroBloomServer(latency=Latency.fixed(0)) as server:
+        yield server.url
+
+
+@pytest.mark.parametrize('rows', [10, 1000])
+def test_analyze_latency(benchmark, fast_mock_url, rows):
+    """Single-request round trip for different payload sizes."""
+    client = NeuroBloomClient(fast_mock_url)
+    request = make_requests(1, payload_rows=rows)[0]
+    
+    result = benchmark(client.analyze_data, request)
+    
+    assert result.status == 'completed'
+    client.close()
+
+
+def test_concurrent_throughput(benchmark, fast_mock_url):
+    """Throughput of a small concurrent load run."""
+    requests = make_requests(50)
+    
+    result = benchmark.pedantic(
+        run_load, args=(fast_mock_url, requests), kwargs={'concurrency': 8},
+        rounds=3, iterations=1
+    )
+    
+    assert result.errors == 0
+    benchmark.extra_info.update(p95=result.p95, throughput=result.throughput)
@@ -3,6 +3,8 @@
 import pytest
 import os
 import sys
+import time
+from types import SimpleNamespace
 
 # Add src to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -25,3 +27,67 @@ def sample_classification_data():
         {"feature1": 2.1, "feature2": 1.8, "label": "class_B"},
         {"feature1": 1.8, "feature2": 2.9, "label": "class_A"}
     ]
+
+
+class FakeCompletions:
+    """Stand-in for ``openai_client.chat.completions``."""
+    
+    def __init__(self, content="- First insight\n- Second insight\n- Third insight"):
+        self.content = content
+        self.calls = []
+        self.delay = 0
+    
+    @property
+    def with_raw_response(self):
+        return self
+    
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        time.sleep(self.delay)
+        if kwargs.get("stream"):
+            return SimpleNamespace(headers={}, parse=lambda: self._chunks())
+        message = SimpleNamespace(content=self.content)
+        response = SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        return SimpleNamespace(headers={}, parse=lambda: response)
+    
+    def _chunks(self, size=7):
+        """Yield the content as streamed chunks of ``size`` characters."""
+        for i in range(0, len(self.content), size):
+            delta = SimpleNamespace(content=self.content[i:i + size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+@pytest.fixture
+def completions():
+    """Fake OpenAI completions endpoint."""
+    return FakeCompletions()
+
+
+@pytest.fixture
+def service(completions):
+    """Service wired to the fake completions endpoint."""
+    from src.neurobloom.service import NeuroBloomService
+    
+    service = NeuroBloomService(openai_api_key="test-key")
+    service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+@pytest.fixture
+def pool_factory():
+    """Factory for pooled clients without background probes, closed after the test.
+    
+    Endpoints are URLs or servers with a ``url`` attribute.
+    """
+    from src.neurobloom.pool import PooledNeuroBloomClient
+    
+    pools = []
+    
+    def make(endpoints, **kwargs):
+        kwargs.setdefault("health_interval", 0)
+        pool = PooledNeuroBloomClient([getattr(e, "url", e) for e in endpoints], **kwargs)
+        pools.append(pool)
+        return pool
+    yield make
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,229 @@
+"""Consumer contract tests: NeuroBloomClient against an in-process Pact mock.
+
+Requests never leave the process (see ``InProcessPact``). Running this
+module rewrites ``pact-contracts/neurobloom-client-neurobloom-ai.json``;
+under pytest-xdist use ``--dist loadgroup`` so one worker owns the file.
+"""
+
+import os
+
+import pytest
+from src.neurobloom.client import NeuroBloomClient
+from src.neurobloom.contracts import EachLike, InProcessPact, Like, Term
+from src.neurobloom.models import AnalysisRequest
+
+PACT_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'pact-contracts')
+
+pytestmark = pytest.mark.xdist_group('pact-consumer')
+
+ANALYSIS_TYPES = {
+    'time_series': [{'timestamp': '2024-01-01', 'value': 100},
+                    {'timestamp': '2024-01-02', 'value': 150}],
+    'classification': [{'feature1': 1.2, 'label': 'class_A'},
+                       {'feature1': 2.1, 'label': 'class_B'}],
+    'sales_forecasting': [{'timestamp': '2024-01-01', 'sales': 1200, 'region': 'north'}],
+    'anomaly_detection': [{'timestamp': '2024-01-01', 'latency_ms': 12.5}],
+}
+
+ANALYSIS_ID = Term(r'^analysis_\d+_\d+$', 'analysis_1704067200000_1')
+
+
+def analysis_body(analysis_type: str, data_points: int, model: str = 'gpt-4') -> dict:
+    """Response body the client relies on for a completed analysis."""
+    return {
+        'id': ANALYSIS_ID,
+        'status': 'completed',
+        'insights': EachLike('Upward trend across the period'),
+        'confidence_score': Like(0.87),
+        'raw_data': {
+            'model_used': model,
+            'processing_time': Like(0.12),
+            'data_points': data_points,
+            'analysis_type': analysis_type,
+        },
+    }
+
+
+def request_body(data, analysis_type: str, **extra) -> dict:
+    return dict({'data': data, 'analysis_type': analysis_type, 'model': 'gpt-4'}, **extra)
+
+
+@pytest.fixture(scope='module')
+def pact():
+    """In-process Pact mock; the pact file is written once every test passed."""
+    pact = InProcessPact('neurobloom-client', 'neurobloom-ai', os.path.abspath(PACT_DIR))
+    yield pact
+    pact.write()
+
+
+@pytest.fixture
+def client(pact):
+    client = NeuroBloomClient(pact.uri)
+    pact.mount(client.session)
+    yield client
+    client.close()
+
+
+class TestClientContract:
+    """Interactions NeuroBloomClient depends on."""
+    
+    def test_health(self, pact, client):
+        """Test the health check contract."""
+        (pact
+         .given('the service is healthy')
+         .upon_receiving('a health check')
+         .with_request('GET', '/health')
+         .will_respond_with(200, body={
+             'status': 'healthy',
+             'service': 'neurobloom-ai',
+             'timestamp': Like(1704067200),
+         }))
+        
+        with pact:
+            health = client.health_check()
+        
+        assert health['status'] == 'healthy'
+    
+    @pytest.mark.parametrize('analysis_type', sorted(ANALYSIS_TYPES))
+    def test_analyze(self, pact, client, analysis_type):
+        """Test a completed analysis for each supported type."""
+        data = ANALYSIS_TYPES[analysis_type]
+        (pact
+         .given('the analysis service is available')
+         .upon_receiving(f'a {analysis_type} analysis request')
+         .with_request('POST', '/api/v1/analyze',
+                       headers={'Content-Type': 'application/json'},
+                       body=request_body(data, analysis_type))
+         .will_respond_with(200, headers={'Content-Type': 'application/json'},
+                            body=analysis_body(analysis_type, len(data))))
+        
+        with pact:
+            result = client.analyze_data(AnalysisRequest(data, analysis_type, 'gpt-4'))
+        
+        assert result.status == 'completed'
+        assert result.raw_data['analysis_type'] == analysis_type
+    
+    def test_batch(self, pact, client):
+        """Test a batch with one result per request, by index."""
+        data = ANALYSIS_TYPES['time_series']
+        (pact
+         .given('the analysis service is available')
+         .upon_receiving('a batch analysis request')
+         .with_request('POST', '/api/v1/analyze/batch',
+                       headers={'Content-Type': 'application/json'},
+                       body={'requests': [
+                           request_body(data, 'time_series'),
+                           request_body(data, 'classification'),
+                       ]})
+         .will_respond_with(200, headers={'Content-Type': 'application/json'}, body={
+             'results': [
+                 {'index': 0, 'result': analysis_body('time_series', len(data))},
+                 {'index': 1, 'result': analysis_body('classification', len(data))},
+             ]
+         }))
+        
+        with pact:
+            results = client.analyze_batch([
+                AnalysisRequest(data, 'time_series', 'gpt-4'),
+                AnalysisRequest(data, 'classification', 'gpt-4'),
+            ])
+        
+        assert [r.index for r in results] == [0, 1]
+        assert all(r.ok for r in results)
+    
+    def test_submit(self, pact, client):
+        """Test a background submission answers 202 with the analysis id."""
+        data = ANALYSIS_TYPES['time_series']
+        (pact
+         .given('the analysis service is available')
+         .upon_receiving('a background analysis submission')
+         .with_request('POST', '/api/v1/analyze',
+                       headers={'Content-Type': 'application/json'},
+                       body=request_body(data, 'time_series', **{'async': True}))
+         .will_respond_with(202, headers={'Content-Type': 'application/json'}, body={
+             'id': ANALYSIS_ID,
+             'status': 'queued',
+             'insights': [],
+             'confidence_score': Like(0.0),
+             'raw_data': {},
+         }))
+        
+        with pact:
+            analysis_id = client.submit(AnalysisRequest(data, 'time_series', 'gpt-4'))
+        
+        assert analysis_id == 'analysis_1704067200000_1'
+    
+    def test_stream(self, pact, client):
+        """Test streamed insights arrive as NDJSON lines ending in the result."""
+        data = ANALYSIS_TYPES['time_series']
+        lines = (
+            '{"index": 0, "insight": "Upward trend across the period"}\n'
+            '{"result": {"id": "analysis_1704067200000_1", "status": "completed", '
+            '"insights": ["Upward trend across the period"], "confidence_score": 0.87, '
+            '"raw_data": {}}}\n'
+        )
+        (pact
+         .given('the analysis service is available')
+         .upon_receiving('a streamed analysis request')
+         .with_request('POST', '/api/v1/analyze/stream',
+                       headers={'Content-Type': 'application/json'},
+                       body=request_body(data, 'time_series'))
+         .will_respond_with(
+             200,
+             headers={'Content-Type': 'application/x-ndjson'},
+             body=Term(r'(?s)(\{"index":\s*\d+,\s*"insight":[^\n]*\}\n)*'
+                       r'\{"result":\s*\{[^\n]*"status":\s*"completed"[^\n]*\}\n', lines)
+         ))
+        
+        with pact:
+            insights = list(client.analyze_stream(AnalysisRequest(data, 'time_series', 'gpt-4')))
+        
+        assert insights == ['Upward trend across the period']
+
+
+class TestInProcessPact:
+    """Test the in-process mock rejects contract violations."""
+    
+    def test_missing_request_fails(self, tmp_path):
+        """Test a declared interaction that is never requested fails the block."""
+        pact = InProcessPact('consumer', 'provider', str(tmp_path))
+        pact.upon_receiving('a health check').with_request('GET', '/health') \
+            .will_respond_with(200, body={'status': 'healthy'})
+        
+        with pytest.raises(AssertionError, match='missing request for: a health check'):
+            with pact:
+                pass
+        
+        assert pact.interactions == []
+    
+    def test_unexpected_request_fails(self, tmp_path):
+        """Test a request matching no interaction gets a 500 and fails the block."""
+        pact = InProcessPact('consumer', 'provider', str(tmp_path))
+        client = NeuroBloomClient(pact.uri)
+        pact.mount(client.session)
+        pact.upon_receiving('a health check').with_request('GET', '/health') \
+            .will_respond_with(200, body={'status': 'healthy'})
+        
+        with pytest.raises(AssertionError, match='unexpected request: POST /api/v1/analyze'):
+            with pact:
+                client.health_check()
+                with pytest.raises(Exception, match='Analysis failed: 500'):
+                    client.analyze_data(AnalysisRequest([{'v': 1}], 'time_series'))
+    
+    def test_replay_written_pact(self, tmp_path):
+        """Test a written pact file can be replayed as a stub provider."""
+        pact = InProcessPact('consumer', 'provider', str(tmp_path))
+        client = NeuroBloomClient(pact.uri)
+        pact.mount(client.session)
+        pact.given('the service is healthy').upon_receiving('a health check') \
+            .with_request('GET', '/health') \
+            .will_respond_with(200, body={'status': Like('healthy')})
+        with pact:
+            client.health_check()
+        path = pact.write()
+        
+        from src.neurobloom.contracts import PactTransport
+        replay = NeuroBloomClient('http://replayed')
+        replay.session.mount('http://replayed', PactTransport.from_pact(path))
+        
+        assert replay.health_check() == {'status': 'healthy'}
@@ -0,0 +1,148 @@
+"""Provider verification of the consumer pacts in ``pact-contracts/``.
+
+Verified against both mock engines and the real service app (backed by
+the OpenAI stub). Passing interactions are cached in ``.pact-cache/``
+(git-ignored), keyed by contract hash and a provider fingerprint over the
+whole ``src/neurobloom`` package (which the mocks import too) plus the
+provider's own modules. Unchanged interactions are skipped on the next
+run; set ``PACT_VERIFICATION_CACHE`` to another file, or to an empty
+string to always verify everything.
+"""
+
+import os
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+from src.neurobloom.contracts import (
+    ProviderVerifier,
+    VerificationCache,
+    fingerprint_paths,
+    pact_files,
+)
+from src.neurobloom.server import create_app
+from src.neurobloom.service import NeuroBloomService
+from tests.integration.fast_mock_server import FastMockServer
+from tests.integration.mock_server import MockNeuroBloomServer
+from tests.integration.openai_stub import OpenAIStubServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+PACT_DIR = os.path.join(ROOT, 'pact-contracts')
+SRC = os.path.join(ROOT, 'src', 'neurobloom')
+INTEGRATION = os.path.join(ROOT, 'tests', 'integration')
+
+PROVIDER_STATES = {'the service is healthy', 'the analysis service is available'}
+
+PACTS = pact_files(PACT_DIR)
+if not PACTS:
+    pytest.skip('no pact files; run tests/contract/consumer first', allow_module_level=True)
+
+
+def set_state(state: str):
+    """Both providers satisfy every known state without setup."""
+    if state not in PROVIDER_STATES:
+        raise ValueError(f"unknown provider state: {state}")
+
+
+def cache(default_name: str):
+    path = os.environ.get(
+        'PACT_VERIFICATION_CACHE', os.path.join(ROOT, '.pact-cache', default_name)
+    )
+    return VerificationCache(path) if path else None
+
+
+@pytest.fixture(scope='module')
+def mock_provider():
+    """Mock server with no simulated latency."""
+    with MockNeuroBloomServer(latency=lambda: 0) as server:
+        yield server
+
+
+@pytest.fixture(scope='module')
+def fast_mock_provider():
+    """Multi-process asyncio mock with no simulated latency."""
+    with FastMockServer(latency=0) as server:
+        yield server
+
+
+@pytest.fixture(scope='module')
+def app_provider():
+    """Real service app, backed by the OpenAI stub, on a free port."""
+    stub = OpenAIStubServer()
+    stub.start()
+    service = NeuroBloomService(openai_api_key='test-key', openai_base_url=stub.base_url)
+    server = make_server('127.0.0.1', 0, create_app(service), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+    thread.join()
+    stub.stop()
+
+
+class TestProviderVerification:
+    """Verify every consumer interaction against each provider."""
+    
+    def test_mock_server(self, mock_provider):
+        """Test the mock server honours the consumer contracts."""
+        verifier = ProviderVerifier(
+            mock_provider.url,
+            provider_fingerprint=fingerprint_paths([
+                SRC, os.path.join(INTEGRATION, 'mock_server.py')
+            ]),
+            cache=cache('mock.json'),
+            state_handler=set_state,
+        )
+        
+        report = verifier.verify_files(PACTS)
+        
+        assert report.passed, report.format()
+    
+    def test_fast_mock_server(self, fast_mock_provider):
+        """Test the high-throughput mock engine honours the consumer contracts."""
+        verifier = ProviderVerifier(
+            fast_mock_provider.url,
+            provider_fingerprint=fingerprint_paths([
+                SRC,
+                os.path.join(INTEGRATION, 'fast_mock_server.py'),
+                os.path.join(INTEGRATION, 'mock_server.py'),
+            ]),
+            cache=cache('fast_mock.json'),
+            state_handler=set_state,
+        )
+        
+        report = verifier.verify_files(PACTS)
+        
+        assert report.passed, report.format()
+    
+    def test_service_app(self, app_provider):
+        """Test the production app honours the consumer contracts."""
+        verifier = ProviderVerifier(
+            app_provider,
+            provider_fingerprint=fingerprint_paths([
+                SRC, os.path.join(INTEGRATION, 'openai_stub.py')
+            ]),
+            cache=cache('app.json'),
+            state_handler=set_state,
+        )
+        
+        report = verifier.verify_files(PACTS)
+        
+        assert report.passed, report.format()
+    
+    def test_incremental(self, mock_provider, tmp_path):
+        """Test unchanged interactions are skipped until the provider changes."""
+        path = str(tmp_path / 'cache.json')
+        
+        def run(fingerprint):
+            return ProviderVerifier(
+                mock_provider.url, provider_fingerprint=fingerprint,
+                cache=VerificationCache(path), state_handler=set_state
+            ).verify_files(PACTS)
+        
+        first, second, changed = run('v1'), run('v1'), run('v2')
+        
+        assert first.passed and first.skipped == 0
+        assert second.verified == 0 and second.skipped == len(first.results)
+        assert changed.verified == len(first.results)
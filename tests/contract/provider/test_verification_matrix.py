@@ -0,0 +1,100 @@
+"""Verifying the consumer pacts against several mock environments at once."""
+
+import os
+import threading
+import time
+
+import pytest
+from src.neurobloom.contracts import VerificationMatrix, pact_files
+from tests.integration.mock_server import Latency, MockNeuroBloomServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+PACTS = pact_files(os.path.join(ROOT, 'pact-contracts'))
+if not PACTS:
+    pytest.skip('no pact files; run tests/contract/consumer first', allow_module_level=True)
+
+LATENCY = 0.2
+
+
+@pytest.fixture(scope='module')
+def environments():
+    """Ten mock environments with the same simulated latency."""
+    servers = [MockNeuroBloomServer(latency=Latency.fixed(LATENCY)) for _ in range(10)]
+    for server in servers:
+        server.start()
+    yield {f'env{i}': server.url for i, server in enumerate(servers)}
+    for server in servers:
+        server.stop()
+
+
+class TestVerificationMatrix:
+    """Test concurrent verification across environments."""
+    
+    def test_all_environments_pass(self, environments):
+        """Test every environment honours every interaction."""
+        report = VerificationMatrix(environments, max_concurrency=80).verify_files(PACTS)
+        
+        assert report.passed, report.format()
+        assert report.environments == list(environments)
+        assert all(len(r) == len(report.interactions) for r in report.results.values())
+        assert report.report('env3').verified == len(report.interactions)
+    
+    def test_ten_environments_as_fast_as_one(self, environments):
+        """Test environments are verified concurrently, not one after another."""
+        one = VerificationMatrix({'env0': environments['env0']}).verify_files(PACTS)
+        ten = VerificationMatrix(environments, max_concurrency=80).verify_files(PACTS)
+        
+        assert one.passed and ten.passed
+        # One after another would take ten times as long
+        assert ten.elapsed < one.elapsed * 5, (one.elapsed, ten.elapsed)
+    
+    def test_failing_environment(self, environments):
+        """Test an unreachable environment fails only its own column."""
+        report = VerificationMatrix({
+            'up': environments['env0'], 'down': 'http://127.0.0.1:9'
+        }, timeout=1).verify_files(PACTS)
+        
+        assert not report.passed
+        assert report.report('up').passed
+        assert {environment for environment, _ in report.failures} == {'down'}
+        table = report.format()
+        assert 'FAILED [down] a health check' in table
+        assert 'PASS' in table and 'FAIL' in table
+        assert report.to_dict()['environments']['down'][0]['passed'] is False
+    
+    def test_concurrency_bounded(self, environments):
+        """Test no more than ``max_concurrency`` interactions run at once."""
+        lock = threading.Lock()
+        active, peak = [0], [0]
+        
+        def state_handler(environment, state):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+        
+        report = VerificationMatrix(
+            environments, max_concurrency=3, state_handler=state_handler
+        ).verify_files(PACTS)
+        
+        assert report.passed
+        assert peak[0] <= 3
+    
+    def test_state_handler_gets_environment(self, environments):
+        """Test provider states are set up per environment."""
+        seen = set()
+        
+        VerificationMatrix(
+            {'a': environments['env0'], 'b': environments['env1']},
+            state_handler=lambda environment, state: seen.add((environment, state)),
+        ).verify_files(PACTS)
+        
+        assert ('a', 'the service is healthy') in seen
+        assert ('b', 'the service is healthy') in seen
+    
+    def test_requires_environment(self):
+        """Test an empty matrix is rejected."""
+        with pytest.raises(ValueError):
+            VerificationMatrix({})
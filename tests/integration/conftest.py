@@ -0,0 +1,57 @@
+"""Shared integration fixtures.
+
+Each pytest-xdist worker is its own process, so session-scoped servers
+here are per worker and bind ephemeral ports; nothing is hard-coded.
+Set ``NEUROBLOOM_MOCK_ENGINE=fast`` to run the suite against the
+multi-process ``FastMockServer`` instead of the Flask mock.
+"""
+
+import os
+
+import pytest
+from src.neurobloom.ratelimit import RetryPolicy
+from .fast_mock_server import FastMockServer
+from .mock_server import MockNeuroBloomServer
+from .openai_stub import OpenAIStubServer
+
+
+@pytest.fixture(scope='session')
+def mock_server():
+    """Mock NeuroBloom server on a free port, ready before tests run."""
+    if os.environ.get('NEUROBLOOM_MOCK_ENGINE') == 'fast':
+        server = FastMockServer()
+    else:
+        server = MockNeuroBloomServer()
+    with server:
+        yield server
+
+
+@pytest.fixture
+def mock_url(mock_server):
+    """Base URL of the per-worker mock server."""
+    return mock_server.url
+
+
+@pytest.fixture
+def openai_stub():
+    """Start a fresh OpenAI stub for each test."""
+    stub = OpenAIStubServer()
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def make_service(request):
+    """Factory for services pointed at ``base_url`` with fast retries.
+    
+    Without ``base_url`` the service talks to the ``openai_stub`` fixture.
+    """
+    from src.neurobloom.service import NeuroBloomService
+    
+    def make(base_url=None, **kwargs):
+        if base_url is None:
+            base_url = request.getfixturevalue('openai_stub').base_url
+        kwargs.setdefault("retry_policy", RetryPolicy(base_delay=0.01, max_delay=0.05, deadline=5))
+        return NeuroBloomService(openai_api_key="test-key", openai_base_url=base_url, **kwargs)
+    return make
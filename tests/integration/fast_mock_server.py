@@ -0,0 +1,575 @@
+"""High-throughput mock engine: asyncio workers in several processes.
+
+``FastMockServer`` serves the routes and canned responses of
+``MockNeuroBloomServer`` for load-testing clients. Its worker processes
+share one listening socket, response bodies are pre-serialized per
+analysis type and simulated latency is awaited, not slept, so a laptop
+sustains thousands of requests per second. Latency, error rate and rate
+limit are set per endpoint with ``Behavior``:
+
+    with FastMockServer(workers=4, behaviors={
+        "analyze": Behavior(latency="lognormal:0.05,0.5", error_rate=0.01),
+        "health": Behavior(rate_limit=100),
+    }) as server:
+        ...
+
+A background analysis is encoded in its id (ready time, analysis type,
+model and row count), so whichever worker receives the poll can answer it.
+"""
+
+import asyncio
+import functools
+import http
+import itertools
+import json
+import multiprocessing
+import random
+import re
+import socket
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - depends on environment
+    uvloop = None
+
+from src.neurobloom import compression, jsonutil
+from src.neurobloom.streaming import NDJSON_CONTENT_TYPE, decode_ndjson, sample_rows
+from .mock_server import DEFAULT_RESPONSE, RESPONSE_MAP, Latency, _is_valid_request
+
+
+ENDPOINTS = ("health", "analyze", "analyze_stream", "analyze_batch", "get_analysis")
+
+# Endpoints the server-wide ``latency`` applies to, like the Flask engine
+_PROCESSING = ("analyze", "analyze_stream", "analyze_batch")
+
+# Analysis types and models a background analysis id can encode
+_TYPES = tuple(RESPONSE_MAP)
+_MODELS = ("gpt-4", "gpt-3.5-turbo", "gpt-4-turbo", "gpt-4o")
+_POINTS_BITS = 40
+_UID_BITS = 64
+_CHECK_BITS = 20
+_ANALYSIS_ID = re.compile(rb"analysis_(\d+)_(\d+)")
+
+_JSON = b"application/json"
+_MISSING_FIELDS = b'{"error":"Missing required fields"}'
+
+
+@dataclass
+class Behavior:
+    """Simulated conditions for one endpoint.
+
+    ``latency`` is seconds or a ``Latency.parse`` spec (None keeps the
+    server default). ``error_rate`` of requests are answered with
+    ``error_status``. Beyond ``rate_limit`` requests per second (split
+    evenly across workers, so approximate) requests get 429.
+    """
+    latency: Union[float, str, None] = None
+    error_rate: float = 0.0
+    error_status: int = 500
+    rate_limit: Optional[float] = None
+
+
+def _latency(spec: Union[float, str, None]) -> Optional[Callable[[], float]]:
+    if isinstance(spec, str):
+        return Latency.parse(spec)
+    return Latency.fixed(spec) if spec else None
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+@functools.lru_cache(maxsize=1024)
+def _status_line(status: int) -> bytes:
+    return f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n".encode()
+
+
+@functools.lru_cache(maxsize=256)
+def _json_string(value: str) -> bytes:
+    return _dumps(value)
+
+
+def _error(status: int, message: str) -> Tuple[int, bytes]:
+    return status, _dumps({'error': message})
+
+
+class _TokenBucket:
+    """``rate`` requests per second with bursts of one second's worth."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class _Policy:
+    """An endpoint's ``Behavior`` as seen by one worker."""
+
+    def __init__(self, behavior: Behavior, default_latency, workers: int):
+        self.latency = _latency(
+            behavior.latency if behavior.latency is not None else default_latency
+        )
+        self.error_rate = behavior.error_rate
+        self.error = _error(behavior.error_status, 'Injected failure')
+        self.bucket = (
+            _TokenBucket(behavior.rate_limit / workers) if behavior.rate_limit else None
+        )
+
+    def reject(self) -> Optional[Tuple[int, bytes]]:
+        """The error to answer with instead of serving, if any."""
+        if self.bucket is not None and not self.bucket.take():
+            return _error(429, 'Rate limit exceeded')
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error
+        return None
+
+    async def delay(self, fraction: float = 1.0):
+        if self.latency is not None:
+            await asyncio.sleep(self.latency() * fraction)
+
+
+class _Template:
+    """Pre-serialized static parts of one analysis type's result."""
+
+    def __init__(self, analysis_type: str):
+        canned = RESPONSE_MAP.get(analysis_type, DEFAULT_RESPONSE)
+        self.head = (
+            b'","status":"completed","insights":' + _dumps(canned['insights'])
+            + b',"confidence_score":' + _dumps(canned['confidence'])
+            + b',"raw_data":{"model_used":'
+        )
+        self.tail = b',"analysis_type":' + _dumps(analysis_type) + b'}}'
+        self.events = [
+            _dumps({'index': index, 'insight': insight}) + b'\n'
+            for index, insight in enumerate(canned['insights'])
+        ]
+
+    def render(self, analysis_id: bytes, model: str, data_points: int) -> bytes:
+        return b''.join((
+            b'{"id":"', analysis_id, self.head, _json_string(model),
+            b',"processing_time":', b'%.2f' % (time.time() % 10),
+            b',"data_points":', b'%d' % data_points, self.tail,
+        ))
+
+
+@functools.lru_cache(maxsize=256)
+def _template(analysis_type: str) -> _Template:
+    return _Template(analysis_type)
+
+
+class _Request:
+    __slots__ = ('method', 'path', 'query', 'headers', 'body')
+
+    def __init__(self, method: bytes, target: bytes, headers: Dict[bytes, bytes], body: bytes):
+        self.method = method
+        self.path, _, self.query = target.partition(b'?')
+        self.headers = headers
+        self.body = body
+
+
+class _Worker:
+    """Serves requests in one process."""
+
+    def __init__(self, index: int, workers: int, latency, behaviors: Dict[str, Behavior],
+                 secret: int):
+        self.index = index
+        self.secret = secret
+        self.policies = {
+            endpoint: _Policy(
+                behaviors.get(endpoint) or Behavior(),
+                latency if endpoint in _PROCESSING else None,
+                workers,
+            )
+            for endpoint in ENDPOINTS
+        }
+        # Unique across workers without coordination
+        self._ids = itertools.count(workers + index, workers)
+        self._worker_header = b'X-Mock-Worker: %d\r\n' % index
+        self._health: Tuple[int, bytes] = (0, b'')
+
+    async def serve(self, sock: socket.socket, ready):
+        server = await asyncio.start_server(self.handle, sock=sock, backlog=1024)
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    def response(self, status: int, body: bytes, content_type: bytes = _JSON,
+                 extra: bytes = b'') -> bytes:
+        return b''.join((
+            _status_line(status), b'Content-Type: ', content_type,
+            b'\r\nContent-Length: ', b'%d' % len(body), b'\r\n',
+            self._worker_header, extra, b'\r\n', body,
+        ))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                request_line, *lines = head[:-4].split(b'\r\n')
+                method, target, version = request_line.split(b' ', 2)
+                headers = {}
+                for line in lines:
+                    name, _, value = line.partition(b':')
+                    headers[name.strip().lower()] = value.strip()
+
+                if headers.get(b'transfer-encoding', b'').lower() == b'chunked':
+                    body = await _read_chunked(reader)
+                else:
+                    body = await reader.readexactly(int(headers.get(b'content-length', 0)))
+                connection = headers.get(b'connection', b'').lower()
+                keep_alive = connection != b'close' if version == b'HTTP/1.1' else (
+                    connection == b'keep-alive'
+                )
+
+                await self.dispatch(_Request(method, target, headers, body), writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: _Request, writer: asyncio.StreamWriter):
+        path, method = request.path, request.method
+        if path == b'/health' and method == b'GET':
+            endpoint, route = 'health', self.health
+        elif path == b'/api/v1/analyze' and method == b'POST':
+            endpoint, route = 'analyze', self.analyze
+        elif path == b'/api/v1/analyze/stream' and method == b'POST':
+            endpoint, route = 'analyze_stream', self.analyze_stream
+        elif path == b'/api/v1/analyze/batch' and method == b'POST':
+            endpoint, route = 'analyze_batch', self.analyze_batch
+        elif path.startswith(b'/api/v1/analyses/') and method == b'GET':
+            endpoint, route = 'get_analysis', self.get_analysis
+        else:
+            writer.write(self.response(*_error(404, 'Not found')))
+            return
+
+        policy = self.policies[endpoint]
+        rejected = policy.reject()
+        if rejected is not None:
+            extra = b'Retry-After: 1\r\n' if rejected[0] == 429 else b''
+            writer.write(self.response(*rejected, extra=extra))
+            return
+        try:
+            await route(request, policy, writer)
+        except compression.DecompressionError as e:
+            writer.write(self.response(*_error(e.status, str(e))))
+
+    async def health(self, request, policy, writer):
+        await policy.delay()
+        now = int(time.time())
+        if self._health[0] != now:
+            self._health = (now, self.response(200, _dumps({
+                'status': 'healthy', 'service': 'neurobloom-ai', 'timestamp': now
+            })))
+        writer.write(self._health[1])
+
+    async def analyze(self, request, policy, writer):
+        data = self.read_analysis(request)
+        if data is None:
+            writer.write(self.response(400, _MISSING_FIELDS))
+            return
+
+        query = dict(parse_qsl(request.query.decode('latin-1')))
+        if query.get('async') == 'true' or data.get('async') is True:
+            writer.write(self.submit(data, policy))
+            return
+        await policy.delay()
+        writer.write(self.response(200, self.render(data)))
+
+    async def analyze_stream(self, request, policy, writer):
+        data = self.read_analysis(request)
+        if data is None:
+            writer.write(self.response(400, _MISSING_FIELDS))
+            return
+
+        template = _template(data['analysis_type'])
+        writer.write(
+            _status_line(200) + b'Content-Type: ' + NDJSON_CONTENT_TYPE.encode()
+            + b'\r\nTransfer-Encoding: chunked\r\n' + self._worker_header + b'\r\n'
+        )
+        # Spread the simulated processing time across the insights
+        fraction = 1 / max(len(template.events), 1)
+        for event in template.events:
+            await policy.delay(fraction)
+            writer.write(_chunk(event))
+            await writer.drain()
+        result = self.render(data, template)
+        writer.write(_chunk(b'{"result":' + result + b'}\n') + b'0\r\n\r\n')
+
+    async def analyze_batch(self, request, policy, writer):
+        body = self.read_json(request)
+        if not isinstance(body, dict) or not isinstance(body.get('requests'), list):
+            writer.write(self.response(400, _MISSING_FIELDS))
+            return
+
+        # One simulated round trip for the whole batch
+        await policy.delay()
+        results = []
+        for index, item in enumerate(body['requests']):
+            if _is_valid_request(item) and self.valid_fields(item):
+                results.append(b'{"index":%d,"result":%s}' % (index, self.render(item)))
+            else:
+                results.append(b'{"index":%d,"error":"Missing required fields"}' % index)
+        writer.write(self.response(200, b'{"results":[' + b','.join(results) + b']}'))
+
+    async def get_analysis(self, request, policy, writer):
+        await policy.delay()
+        analysis_id = request.path[len(b'/api/v1/analyses/'):]
+        job = self.decode_id(analysis_id)
+        if job is None:
+            writer.write(self.response(*_error(404, 'Analysis not found')))
+            return
+
+        ready_at, analysis_type, model, data_points = job
+        if time.time() < ready_at:
+            writer.write(self.response(200, _dumps(_pending(analysis_id.decode(), 'running'))))
+            return
+        body = _template(analysis_type).render(analysis_id, model, data_points)
+        writer.write(self.response(200, body))
+
+    def submit(self, data: dict, policy: _Policy) -> bytes:
+        """Accept a background analysis ready after the simulated latency."""
+        delay = policy.latency() if policy.latency is not None else 0.0
+        analysis_id = self.encode_id(
+            int((time.time() + delay) * 1000), data['analysis_type'],
+            data.get('model', 'gpt-4'), _data_points(data)
+        )
+        location = b'Location: /api/v1/analyses/' + analysis_id + b'\r\n'
+        return self.response(202, _dumps(_pending(analysis_id.decode(), 'queued')),
+                             extra=location)
+
+    def encode_id(self, ready_ms: int, analysis_type: str, model: str, data_points: int) -> bytes:
+        """``analysis_<ready ms>_<token>``; the token packs everything else.
+
+        Known types and models take a 4-bit code each; other names are
+        appended as the integer value of their UTF-8 bytes.
+        """
+        type_code = _TYPES.index(analysis_type) + 1 if analysis_type in _TYPES else 0
+        model_code = _MODELS.index(model) + 1 if model in _MODELS else 0
+        names = 0
+        if not (type_code and model_code):
+            raw = b'\1' + analysis_type.encode() + b'\0' + model.encode()
+            names = int.from_bytes(raw, 'big')
+        packed = (names << _UID_BITS) + next(self._ids) % (1 << _UID_BITS)
+        packed = (packed * 16 + model_code) * 16 + type_code
+        packed = (packed << _POINTS_BITS) + min(data_points, (1 << _POINTS_BITS) - 1)
+        token = (packed << _CHECK_BITS) + self.check(ready_ms, packed)
+        return b'analysis_%d_%d' % (ready_ms, token)
+
+    def decode_id(self, analysis_id: bytes) -> Optional[Tuple[float, str, str, int]]:
+        """(ready time, type, model, rows) of an id this server issued, else None."""
+        match = _ANALYSIS_ID.fullmatch(analysis_id)
+        if match is None:
+            return None
+        try:
+            ready_ms, token = int(match.group(1)), int(match.group(2))
+        except ValueError:  # past the interpreter's integer digit limit
+            return None
+        packed = token >> _CHECK_BITS
+        if token & ((1 << _CHECK_BITS) - 1) != self.check(ready_ms, packed):
+            return None
+        data_points = packed & ((1 << _POINTS_BITS) - 1)
+        packed >>= _POINTS_BITS
+        type_code, model_code = packed % 16, packed // 16 % 16
+        names = packed >> (8 + _UID_BITS)
+        if names:
+            raw = names.to_bytes((names.bit_length() + 7) // 8, 'big')
+            try:
+                analysis_type, model = raw[1:].decode().split('\0', 1)
+            except ValueError:  # UnicodeDecodeError, or no separator
+                return None
+        if type_code:
+            analysis_type = _TYPES[type_code - 1]
+        if model_code:
+            model = _MODELS[model_code - 1]
+        return ready_ms / 1000, analysis_type, model, data_points
+
+    def check(self, ready_ms: int, packed: int) -> int:
+        """Checksum so ids from elsewhere (e.g. ``analysis_0_0``) answer 404."""
+        return zlib.crc32(b'%d:%d:%d' % (self.secret, ready_ms, packed)) & (
+            (1 << _CHECK_BITS) - 1
+        )
+
+    def render(self, data: dict, template: Optional[_Template] = None) -> bytes:
+        analysis_id = b'analysis_%d_%d' % (int(time.time() * 1000), next(self._ids))
+        template = template or _template(data['analysis_type'])
+        return template.render(analysis_id, data.get('model', 'gpt-4'), _data_points(data))
+
+    def read_analysis(self, request: _Request) -> Optional[dict]:
+        """A JSON or NDJSON analysis body, or None when invalid."""
+        if request.headers.get(b'content-type', b'').startswith(NDJSON_CONTENT_TYPE.encode()):
+            try:
+                header, rows = decode_ndjson(self.body(request).splitlines())
+                _, data_points = sample_rows(rows, sample_size=0)
+            except ValueError:
+                return None
+            data = {**header, 'data_points': data_points}
+            valid = 'analysis_type' in data
+        else:
+            data = self.read_json(request)
+            valid = _is_valid_request(data)
+        return data if valid and self.valid_fields(data) else None
+
+    def read_json(self, request: _Request):
+        try:
+            return jsonutil.loads(self.body(request))
+        except ValueError:
+            return None
+
+    def body(self, request: _Request) -> bytes:
+        encoding = request.headers.get(b'content-encoding', b'').decode().strip().lower()
+        if encoding and encoding != 'identity':
+            return compression.decompress(request.body, encoding)
+        return request.body
+
+    @staticmethod
+    def valid_fields(data: dict) -> bool:
+        """Field types the pre-serialized templates rely on."""
+        return (
+            isinstance(data['analysis_type'], str)
+            and isinstance(data.get('model', 'gpt-4'), str)
+            and ('data_points' in data or isinstance(data.get('data'), list))
+        )
+
+
+def _data_points(data: dict) -> int:
+    return data['data_points'] if 'data_points' in data else len(data['data'])
+
+
+def _pending(analysis_id: str, status: str) -> dict:
+    return {"id": analysis_id, "status": status, "insights": [],
+            "confidence_score": 0.0, "raw_data": {}}
+
+
+def _chunk(data: bytes) -> bytes:
+    return b'%x\r\n%s\r\n' % (len(data), data)
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    parts = []
+    while True:
+        size = int((await reader.readline()).split(b';', 1)[0], 16)
+        if size == 0:
+            # Skip trailers up to the blank line
+            while (await reader.readline()).strip():
+                pass
+            return b''.join(parts)
+        parts.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+def _run_worker(sock, index, workers, latency, behaviors, secret, ready):
+    """Process entry point: serve ``sock`` until terminated."""
+    if uvloop is not None:
+        uvloop.install()
+    worker = _Worker(index, workers, latency, behaviors, secret)
+    asyncio.run(worker.serve(sock, ready))
+
+
+class FastMockServer:
+    """Multi-process asyncio mock with the routes of ``MockNeuroBloomServer``.
+
+    ``latency`` (seconds or a ``Latency.parse`` spec) applies to the
+    analysis endpoints, like the Flask engine's default 0.1s; ``behaviors``
+    maps endpoint names (``ENDPOINTS``) to a ``Behavior`` overriding it.
+    Responses carry an ``X-Mock-Worker`` header naming the worker process.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        workers: int = 2,
+        latency: Union[float, str, None] = 0.1,
+        behaviors: Optional[Dict[str, Behavior]] = None
+    ):
+        unknown = set(behaviors or {}) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        self.port = port
+        self.workers = workers
+        self.latency = latency
+        self.behaviors = dict(behaviors or {})
+        self.processes = []
+        self._socket: Optional[socket.socket] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> 'FastMockServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self, ready_timeout: float = 10.0):
+        """Start the worker processes and wait until each is serving."""
+        if self._socket is not None:
+            return
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(('127.0.0.1', self.port))
+        self._socket.listen(1024)
+        self.port = self._socket.getsockname()[1]
+
+        # spawn: forking a process that runs threads (pytest, Flask mocks) is unsafe
+        context = multiprocessing.get_context('spawn')
+        secret = random.getrandbits(32)
+        events = []
+        for index in range(self.workers):
+            ready = context.Event()
+            process = context.Process(
+                target=_run_worker,
+                args=(self._socket, index, self.workers, self.latency,
+                      self.behaviors, secret, ready),
+                name=f"neurobloom-fast-mock-{index}", daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+            events.append(ready)
+
+        deadline = time.monotonic() + ready_timeout
+        for ready in events:
+            if not ready.wait(max(deadline - time.monotonic(), 0)):
+                self.stop()
+                raise RuntimeError(f"Fast mock server not ready after {ready_timeout}s")
+        print(f"🚀 Fast mock server started on {self.url} ({self.workers} workers)")
+
+    def stop(self):
+        """Terminate the workers and close the listening socket."""
+        if self._socket is None:
+            return
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self.processes = []
+        self._socket.close()
+        self._socket = None
+        print("🛑 Fast mock server stopped")
@@ -1,113 +1,304 @@
 """Mock server for testing HTTP client integration."""
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from werkzeug.serving import make_server
+import http.client
 import threading
 import time
 import json
-from typing import Optional
+import math
+import itertools
+import random
+from typing import Callable, Optional
+from src.neurobloom import compression
+from src.neurobloom.streaming import NDJSON_CONTENT_TYPE, decode_ndjson, sample_rows
+
+
+# Canned responses by analysis type
+RESPONSE_MAP = {
+    'time_series': {
+        'insights': [
+            "Key pattern identified in time_series data",
+            "Strong correlation detected between variables",
+            "Seasonal trend observed with 95% confidence"
+        ],
+        'confidence': 0.87
+    },
+    'classification': {
+        'insights': [
+            "Classification completed with high accuracy",
+            "3 distinct clusters identified",
+            "Feature importance analysis completed"
+        ],
+        'confidence': 0.92
+    },
+    'sales_forecasting': {
+        'insights': [
+            "Sales trend shows 15% growth potential",
+            "Regional performance varies significantly",
+            "Recommend focus on north region"
+        ],
+        'confidence': 0.78
+    }
+}
+
+DEFAULT_RESPONSE = {
+    'insights': ["Generic analysis completed"],
+    'confidence': 0.65
+}
+
+_id_counter = itertools.count(1)
+
+
+class Latency:
+    """Simulated processing-time distributions (callables returning seconds)."""
+    
+    @staticmethod
+    def fixed(seconds: float) -> Callable[[], float]:
+        return lambda: seconds
+    
+    @staticmethod
+    def uniform(low: float, high: float) -> Callable[[], float]:
+        return lambda: random.uniform(low, high)
+    
+    @staticmethod
+    def lognormal(median: float, sigma: float = 0.5) -> Callable[[], float]:
+        """Long-tailed latency around ``median`` seconds."""
+        mu = math.log(median)
+        return lambda: random.lognormvariate(mu, sigma)
+    
+    @staticmethod
+    def parse(spec: str) -> Callable[[], float]:
+        """Parse ``fixed:0.1``, ``uniform:0.05,0.2`` or ``lognormal:0.1,0.5``."""
+        kind, _, params = spec.partition(':')
+        args = [float(p) for p in params.split(',') if p]
+        factories = {'fixed': Latency.fixed, 'uniform': Latency.uniform,
+                     'lognormal': Latency.lognormal}
+        if kind not in factories:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        return factories[kind](*args)
+
+
+def _is_valid_request(data) -> bool:
+    """Check an analysis request body has the required fields."""
+    return isinstance(data, dict) and 'data' in data and 'analysis_type' in data
+
+
+def _read_ndjson_request(stream) -> Optional[dict]:
+    """Read a streamed request incrementally, keeping only a row count."""
+    try:
+        header, rows = decode_ndjson(stream)
+        _, data_points = sample_rows(rows, sample_size=0)
+    except ValueError:
+        return None
+    return {**header, 'data_points': data_points}
+
+
+def _read_analysis_request(silent: bool = False) -> Optional[dict]:
+    """The current JSON or NDJSON analysis request, or None when invalid."""
+    if request.mimetype == NDJSON_CONTENT_TYPE:
+        data = _read_ndjson_request(request.stream)
+        return data if data is not None and 'analysis_type' in data else None
+    data = request.get_json(silent=silent)
+    return data if _is_valid_request(data) else None
+
+
+def _build_response(data: dict) -> dict:
+    """Build the mock analysis response for a request body."""
+    analysis_type = data['analysis_type']
+    response_data = RESPONSE_MAP.get(analysis_type, DEFAULT_RESPONSE)
+    
+    return {
+        "id": f"analysis_{int(time.time() * 1000)}_{next(_id_counter)}",
+        "status": "completed",
+        "insights": response_data['insights'],
+        "confidence_score": response_data['confidence'],
+        "raw_data": {
+            "model_used": data.get('model', 'gpt-4'),
+            "processing_time": round(time.time() % 10, 2),
+            "data_points": data['data_points'] if 'data_points' in data else len(data['data']),
+            "analysis_type": analysis_type
+        }
+    }
+
+
+def _pending(analysis_id: str, status: str) -> dict:
+    """Response for a background analysis that has not finished."""
+    return {
+        "id": analysis_id,
+        "status": status,
+        "insights": [],
+        "confidence_score": 0.0,
+        "raw_data": {}
+    }
 
 
 class MockNeuroBloomServer:
     """Mock server that mimics Neurobloom AI service."""
     
-    def __init__(self, port: int = 8080):
-        """Initialize mock server."""
+    def __init__(self, port: int = 0, latency: Optional[Callable[[], float]] = None):
+        """Initialize mock server; port 0 picks a free port on start.
+        
+        ``latency`` returns the simulated processing time per request in
+        seconds (see ``Latency``); the default is a fixed 0.1s. Set
+        ``healthy`` to False to fail ``/health``, or ``error_status`` to
+        answer analyses with that status; ``requests`` counts analyses.
+        """
         self.port = port
+        self.latency = latency or Latency.fixed(0.1)
+        self.healthy = True
+        self.error_status: Optional[int] = None
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self.jobs = {}
+        self._jobs_lock = threading.Lock()
         self.app = Flask(__name__)
         self.server_thread: Optional[threading.Thread] = None
+        self._server = None
         self.setup_routes()
+        # Negotiates request/response compression like the real server
+        compression.install(self.app)
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+    
+    def __enter__(self) -> 'MockNeuroBloomServer':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
         
     def setup_routes(self):
         """Set up Flask routes."""
         
+        @self.app.before_request
+        def count_analyses():
+            if request.path.startswith('/api/v1/analyze'):
+                with self._requests_lock:
+                    self.requests += 1
+                if self.error_status is not None:
+                    return jsonify({'error': 'Injected failure'}), self.error_status
+        
         @self.app.route('/api/v1/analyze', methods=['POST'])
         def analyze():
-            data = request.get_json()
+            data = _read_analysis_request()
             
             # Validate request
-            if not data or 'data' not in data or 'analysis_type' not in data:
+            if data is None:
                 return jsonify({'error': 'Missing required fields'}), 400
             
+            if request.args.get('async') == 'true' or data.get('async') is True:
+                return self._submit(data)
+            
             # Simulate processing time
-            time.sleep(0.1)
+            time.sleep(self.latency())
             
-            # Mock different responses based on analysis type
-            analysis_type = data['analysis_type']
-            model = data.get('model', 'gpt-4')
-            data_points = len(data['data'])
+            return jsonify(_build_response(data)), 200
+        
+        @self.app.route('/api/v1/analyze/stream', methods=['POST'])
+        def analyze_stream():
+            data = _read_analysis_request(silent=True)
+            if data is None:
+                return jsonify({'error': 'Missing required fields'}), 400
             
-            # Response based on analysis type
-            response_map = {
-                'time_series': {
-                    'insights': [
-                        "Key pattern identified in time_series data",
-                        "Strong correlation detected between variables",
-                        "Seasonal trend observed with 95% confidence"
-                    ],
-                    'confidence': 0.87
-                },
-                'classification': {
-                    'insights': [
-                        "Classification completed with high accuracy",
-                        "3 distinct clusters identified",
-                        "Feature importance analysis completed"
-                    ],
-                    'confidence': 0.92
-                },
-                'sales_forecasting': {
-                    'insights': [
-                        "Sales trend shows 15% growth potential",
-                        "Regional performance varies significantly",
-                        "Recommend focus on north region"
-                    ],
-                    'confidence': 0.78
-                }
-            }
+            result = _build_response(data)
+            delay = self.latency() / max(len(result['insights']), 1)
             
-            response_data = response_map.get(analysis_type, {
-                'insights': ["Generic analysis completed"],
-                'confidence': 0.65
-            })
+            def events():
+                # Spread the simulated processing time across the insights
+                for index, insight in enumerate(result['insights']):
+                    time.sleep(delay)
+                    yield json.dumps({'index': index, 'insight': insight}) + '\n'
+                yield json.dumps({'result': result}) + '\n'
             
-            response = {
-                "id": f"analysis_{int(time.time() * 1000)}",
-                "status": "completed",
-                "insights": response_data['insights'],
-                "confidence_score": response_data['confidence'],
-                "raw_data": {
-                    "model_used": model,
-                    "processing_time": round(time.time() % 10, 2),
-                    "data_points": data_points,
-                    "analysis_type": analysis_type
-                }
-            }
+            return Response(events(), mimetype=NDJSON_CONTENT_TYPE)
+        
+        @self.app.route('/api/v1/analyze/batch', methods=['POST'])
+        def analyze_batch():
+            body = request.get_json()
+            
+            if not body or not isinstance(body.get('requests'), list):
+                return jsonify({'error': 'Missing required fields'}), 400
+            
+            # One simulated round trip for the whole batch
+            time.sleep(self.latency())
+            
+            results = []
+            for index, item in enumerate(body['requests']):
+                if _is_valid_request(item):
+                    results.append({'index': index, 'result': _build_response(item)})
+                else:
+                    results.append({'index': index, 'error': 'Missing required fields'})
             
-            return jsonify(response), 200
+            return jsonify({'results': results}), 200
+        
+        @self.app.route('/api/v1/analyses/<analysis_id>', methods=['GET'])
+        def get_analysis(analysis_id):
+            with self._jobs_lock:
+                job = self.jobs.get(analysis_id)
+            if job is None:
+                return jsonify({'error': 'Analysis not found'}), 404
+            
+            ready_at, result = job
+            if time.monotonic() < ready_at:
+                return jsonify(_pending(analysis_id, 'running')), 200
+            return jsonify(result), 200
         
         @self.app.route('/health', methods=['GET'])
         def health():
             return jsonify({
-                'status': 'healthy', 
+                'status': 'healthy' if self.healthy else 'unhealthy', 
                 'service': 'neurobloom-ai',
                 'timestamp': int(time.time())
-            }), 200
+            }), 200 if self.healthy else 503
+    
+    def _submit(self, data: dict):
+        """Accept a background analysis that completes after the simulated latency."""
+        result = _build_response(data)
+        with self._jobs_lock:
+            self.jobs[result['id']] = (time.monotonic() + self.latency(), result)
+        response = jsonify(_pending(result['id'], 'queued'))
+        response.headers['Location'] = f"/api/v1/analyses/{result['id']}"
+        return response, 202
+    
+    def start(self, ready_timeout: float = 5.0):
+        """Start serving in a background thread and wait until /health answers."""
+        if self._server is not None:
+            return
+        self._server = make_server('127.0.0.1', self.port, self.app, threaded=True)
+        self.port = self._server.server_port
+        self.server_thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self.server_thread.start()
+        self.wait_until_ready(ready_timeout)
+        print(f"🚀 Mock server started on {self.url}")
     
-    def start(self):
-        """Start the mock server in a separate thread."""
-        if self.server_thread is None or not self.server_thread.is_alive():
-            self.server_thread = threading.Thread(
-                target=lambda: self.app.run(
-                    port=self.port, 
-                    debug=False, 
-                    use_reloader=False,
-                    host='127.0.0.1'
-                )
-            )
-            self.server_thread.daemon = True
-            self.server_thread.start()
-            time.sleep(1)  # Give server time to start
-            print(f"🚀 Mock server started on http://127.0.0.1:{self.port}")
+    def wait_until_ready(self, timeout: float = 5.0):
+        """Poll /health until it answers 200; raise RuntimeError on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=0.5)
+            try:
+                connection.request('GET', '/health')
+                if connection.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            finally:
+                connection.close()
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Mock server on port {self.port} not ready after {timeout}s")
+            time.sleep(0.01)
     
     def stop(self):
-        """Stop the mock server."""
+        """Shut the server down and wait for its thread."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self.server_thread.join()
+        self._server = None
         print("🛑 Mock server stopped")
@@ -0,0 +1,129 @@
+"""Local stand-in for the OpenAI chat completions API."""
+
+import collections
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+
+DEFAULT_CONTENT = (
+    "- Upward trend across the period\n"
+    "- Weekly seasonality in values\n"
+    "- No significant outliers detected"
+)
+
+
+class OpenAIStubServer:
+    """Programmable OpenAI-compatible server for tests.
+
+    Serves ``POST /v1/chat/completions``. Failures can be queued to be
+    returned before normal responses, and latency can be set per model.
+    ``stream=True`` requests get server-sent chunks, one per content line,
+    ``chunk_delay`` seconds apart.
+    """
+
+    def __init__(self, port: int = 0, content: str = DEFAULT_CONTENT):
+        """Initialize stub; port 0 picks a free port on start."""
+        self.port = port
+        self.content = content
+        self.latency: Dict[str, float] = {}
+        self.chunk_delay = 0.0
+        self.response_headers: Dict[str, str] = {}
+        self.received = []
+        self._failures = collections.deque()
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self.app = Flask(__name__)
+        self.setup_routes()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def inject_failures(self, status: int = 429, count: int = 1,
+                        headers: Optional[Dict[str, str]] = None):
+        """Queue ``count`` error responses with ``status`` and ``headers``."""
+        with self._lock:
+            for _ in range(count):
+                self._failures.append((status, headers or {}))
+
+    def setup_routes(self):
+        """Set up Flask routes."""
+
+        @self.app.route('/v1/chat/completions', methods=['POST'])
+        def chat_completions():
+            body = request.get_json()
+            with self._lock:
+                self.received.append(body)
+                failure = self._failures.popleft() if self._failures else None
+
+            if failure is not None:
+                status, headers = failure
+                response = jsonify({'error': {
+                    'message': f'Injected {status}',
+                    'type': 'rate_limit_error' if status == 429 else 'server_error',
+                    'code': None
+                }})
+                response.status_code = status
+                response.headers.update(headers)
+                return response
+
+            model = body.get('model', 'gpt-4')
+            time.sleep(self.latency.get(model, 0))
+            
+            if body.get('stream'):
+                response = Response(self._chunks(model), mimetype='text/event-stream')
+                response.headers.update(self.response_headers)
+                return response
+
+            response = jsonify({
+                'id': f'chatcmpl-{len(self.received)}',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': self.content},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {'prompt_tokens': 50, 'completion_tokens': 30, 'total_tokens': 80}
+            })
+            response.headers.update(self.response_headers)
+            return response
+
+    def _chunks(self, model: str):
+        """Server-sent chat.completion.chunk events for the content."""
+        completion_id = f'chatcmpl-{len(self.received)}'
+        for index, line in enumerate(self.content.splitlines(keepends=True)):
+            if index:
+                time.sleep(self.chunk_delay)
+            yield 'data: ' + json.dumps({
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': line}, 'finish_reason': None}]
+            }) + '\n\n'
+        yield 'data: [DONE]\n\n'
+    
+    def start(self):
+        """Start serving in a background thread."""
+        self._server = make_server('127.0.0.1', self.port, self.app, threaded=True)
+        self.port = self._server.server_port
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Shut the server down and wait for its thread."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
@@ -0,0 +1,113 @@
+"""Async HTTP client integration tests."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from src.neurobloom.async_client import AsyncNeuroBloomClient
+from src.neurobloom.models import AnalysisRequest
+
+
+class TestAsyncNeuroBloomClient:
+    """Test async client with real mock server."""
+
+    def test_health_check(self, mock_url):
+        """Test server health endpoint."""
+        async def run():
+            async with AsyncNeuroBloomClient(mock_url) as client:
+                return await client.health_check()
+
+        health_data = asyncio.run(run())
+
+        assert health_data['status'] == 'healthy'
+
+    def test_analyze_data(self, mock_url):
+        """Test a single async analysis."""
+        request_data = AnalysisRequest(
+            data=[{"timestamp": "2024-01-01", "value": 100}],
+            analysis_type="time_series"
+        )
+
+        async def run():
+            async with AsyncNeuroBloomClient(mock_url) as client:
+                return await client.analyze_data(request_data)
+
+        result = asyncio.run(run())
+
+        assert result.status == "completed"
+        assert result.confidence_score == 0.87
+        assert result.raw_data["data_points"] == 1
+
+    def test_streamed_analysis(self, mock_url):
+        """Test generator data is streamed by the async client."""
+        request_data = AnalysisRequest(
+            data=({"value": i} for i in range(2000)),
+            analysis_type="time_series"
+        )
+
+        async def run():
+            async with AsyncNeuroBloomClient(mock_url) as client:
+                return await client.analyze_data(request_data)
+
+        result = asyncio.run(run())
+
+        assert result.raw_data["data_points"] == 2000
+
+    def test_streamed_rows_encoded_off_loop(self, mock_url):
+        """Test streamed rows are produced off the event loop thread."""
+        threads = set()
+
+        def rows():
+            for i in range(1000):
+                threads.add(threading.get_ident())
+                yield {"value": i}
+
+        async def run():
+            async with AsyncNeuroBloomClient(mock_url) as client:
+                result = await client.analyze_data(
+                    AnalysisRequest(data=rows(), analysis_type="time_series")
+                )
+                return result, threading.get_ident()
+
+        result, loop_thread = asyncio.run(run())
+
+        assert result.raw_data["data_points"] == 1000
+        assert threads and loop_thread not in threads
+
+    def test_analyze_many_bounded_concurrency(self, mock_url):
+        """Test analyze_many overlaps requests up to the concurrency limit."""
+        requests_data = [
+            AnalysisRequest(
+                data=[{"value": i}] * (i + 1),
+                analysis_type="classification"
+            )
+            for i in range(8)
+        ]
+
+        async def run():
+            async with AsyncNeuroBloomClient(mock_url) as client:
+                return [
+                    result async for result in
+                    client.analyze_many(requests_data, concurrency=4)
+                ]
+
+        start = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - start
+
+        assert len(results) == 8
+        assert all(r.status == "completed" for r in results)
+        assert sorted(r.raw_data["data_points"] for r in results) == list(range(1, 9))
+        # 8 requests at ~0.1s each, 4 at a time -> about two rounds
+        assert elapsed < 0.8
+
+    def test_analyze_many_rejects_zero_concurrency(self, mock_url):
+        """Test concurrency must be positive."""
+        async def run():
+            async with AsyncNeuroBloomClient(mock_url) as client:
+                async for _ in client.analyze_many([], concurrency=0):
+                    pass
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
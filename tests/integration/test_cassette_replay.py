@@ -0,0 +1,46 @@
+"""Recording completions from the OpenAI stand-in and replaying them offline."""
+
+import httpx
+from src.neurobloom.cassette import Cassette, CassetteTransport
+from src.neurobloom.ratelimit import RetryPolicy
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+OFFLINE_URL = "https://api.openai.invalid/v1"
+
+
+class TestCassetteReplay:
+    """Test the service end to end through a cassette."""
+    
+    def test_replays_without_the_backend(self, tmp_path, sample_time_series_data,
+                                         openai_stub, make_service):
+        """Test recorded analyses (plain and streamed) replay after the stub stops."""
+        path = str(tmp_path / "openai.cassette")
+        recording = CassetteTransport(Cassette(path), mode="record")
+        recorder = make_service(retry_policy=NO_RETRY,
+                                openai_http_client=httpx.Client(transport=recording))
+        recorded = recorder.process_analysis(sample_time_series_data, "time_series")
+        recorded_stream = list(recorder.stream_analysis(sample_time_series_data, "classification"))
+        openai_stub.stop()
+        
+        transport = CassetteTransport(Cassette(path), mode="replay")
+        replayer = make_service(OFFLINE_URL, retry_policy=NO_RETRY,
+                                openai_http_client=httpx.Client(transport=transport))
+        replayed = replayer.process_analysis(sample_time_series_data, "time_series")
+        replayed_stream = list(replayer.stream_analysis(sample_time_series_data, "classification"))
+        
+        assert replayed["status"] == "completed"
+        assert replayed["insights"] == recorded["insights"]
+        assert replayed_stream[:-1] == recorded_stream[:-1]
+        assert transport.replayed == 2
+    
+    def test_unrecorded_request_fails_analysis(self, tmp_path, sample_time_series_data,
+                                               make_service):
+        """Test a replay miss surfaces as a failed analysis."""
+        transport = CassetteTransport(Cassette(str(tmp_path / "empty.cassette")))
+        service = make_service(OFFLINE_URL, retry_policy=NO_RETRY,
+                               openai_http_client=httpx.Client(transport=transport))
+        
+        result = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert result["status"] == "failed"
@@ -0,0 +1,61 @@
+"""Tests for the ``python -m src.neurobloom`` command line tools."""
+
+import json
+import os
+
+from src.neurobloom.__main__ import main
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+ROWS = [{"timestamp": f"2024-01-0{i}", "value": i} for i in range(1, 4)]
+
+
+class TestCLI:
+    """Test CLI subcommands against the mock server."""
+    
+    def test_health(self, mock_url, capsys):
+        """Test health prints the status and exits 0."""
+        assert main(['--url', mock_url, 'health']) == 0
+        assert json.loads(capsys.readouterr().out)['status'] == 'healthy'
+    
+    def test_analyze_json(self, mock_url, tmp_path, capsys):
+        """Test analyze sends a JSON array file."""
+        path = tmp_path / 'rows.json'
+        path.write_text(json.dumps(ROWS))
+        
+        assert main(['--url', mock_url, 'analyze', str(path), '--type', 'classification']) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result['status'] == 'completed'
+        assert result['raw_data']['data_points'] == 3
+    
+    def test_analyze_ndjson(self, mock_url, tmp_path, capsys):
+        """Test analyze streams an NDJSON file, compressed."""
+        path = tmp_path / 'rows.ndjson'
+        path.write_text(''.join(json.dumps(row) + '\n' for row in ROWS))
+        
+        assert main(['--url', mock_url, '--compression', 'gzip',
+                     'analyze', str(path), '--ndjson']) == 0
+        assert json.loads(capsys.readouterr().out)['status'] == 'completed'
+    
+    def test_bench(self, mock_url, capsys):
+        """Test bench prints one result line per concurrency."""
+        assert main(['--url', mock_url, 'bench', '--requests', '4',
+                     '--concurrency', '1', '2', '--payload-rows', '2']) == 0
+        assert capsys.readouterr().out.count('c=') == 2
+    
+    def test_error_exit_status(self, capsys):
+        """Test failures print to stderr and exit 1."""
+        assert main(['--url', 'http://127.0.0.1:9', '--timeout', '1', 'health']) == 1
+        assert capsys.readouterr().err.startswith('error: ')
+    
+    def test_verify(self, mock_url, capsys):
+        """Test verify prints the matrix for every environment."""
+        pacts = os.path.join(ROOT, 'pact-contracts')
+        
+        status = main(['verify', '--pacts', pacts, '--env', f'a={mock_url}',
+                       '--env', f'b={mock_url}', '--json'])
+        
+        result = json.loads(capsys.readouterr().out)
+        assert status == 0 and result['passed']
+        assert set(result['environments']) == {'a', 'b'}
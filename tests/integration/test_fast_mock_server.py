@@ -0,0 +1,139 @@
+"""Tests for the multi-process asyncio mock engine."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from src.neurobloom.client import NeuroBloomClient
+from src.neurobloom.models import AnalysisRequest
+from .fast_mock_server import (
+    _CHECK_BITS, _POINTS_BITS, _UID_BITS, Behavior, FastMockServer, _Worker,
+)
+
+
+REQUEST = {"data": [{"timestamp": "2024-01-01", "value": 1}], "analysis_type": "time_series"}
+
+
+@pytest.fixture(scope='module')
+def server():
+    """Two workers with programmed per-endpoint behaviour."""
+    with FastMockServer(workers=2, latency=0, behaviors={
+        "analyze_batch": Behavior(error_rate=1.0, error_status=503),
+        "analyze_stream": Behavior(latency=0.3),
+        "health": Behavior(rate_limit=10),
+    }) as server:
+        yield server
+
+
+class TestFastMockServer:
+    """Test routes, behaviours and lifecycle."""
+    
+    def test_matches_flask_engine(self, server):
+        """Test responses carry the same canned content as MockNeuroBloomServer."""
+        client = NeuroBloomClient(server.url)
+        
+        result = client.analyze_data(AnalysisRequest(**REQUEST))
+        client.close()
+        
+        assert result.status == "completed"
+        assert result.insights[0] == "Key pattern identified in time_series data"
+        assert result.confidence_score == 0.87
+        assert result.raw_data["data_points"] == 1
+    
+    def test_concurrent_requests(self, server):
+        """Test many concurrent requests all succeed."""
+        client = NeuroBloomClient(server.url)
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(
+                lambda _: client.analyze_data(AnalysisRequest(**REQUEST)), range(200)
+            ))
+        client.close()
+        
+        assert all(r.status == "completed" for r in results)
+        assert len({r.id for r in results}) == 200
+    
+    def test_error_injection(self, server):
+        """Test an endpoint's error rate answers its configured status."""
+        response = requests.post(f'{server.url}/api/v1/analyze/batch',
+                                 json={"requests": [REQUEST]})
+        
+        assert response.status_code == 503
+        assert response.json() == {'error': 'Injected failure'}
+    
+    def test_endpoint_latency(self, server):
+        """Test latency is programmed per endpoint."""
+        start = time.perf_counter()
+        requests.post(f'{server.url}/api/v1/analyze', json=REQUEST)
+        fast = time.perf_counter() - start
+        start = time.perf_counter()
+        requests.post(f'{server.url}/api/v1/analyze/stream', json=REQUEST)
+        slow = time.perf_counter() - start
+        
+        assert slow >= 0.3
+        assert fast < 0.3
+    
+    def test_rate_limit(self, server):
+        """Test requests beyond the endpoint's rate get 429 with Retry-After."""
+        with requests.Session() as session:
+            responses = [session.get(f'{server.url}/health') for _ in range(40)]
+        
+        limited = [r for r in responses if r.status_code == 429]
+        assert limited and len(limited) < 40
+        assert limited[0].headers['Retry-After'] == '1'
+        assert limited[0].json() == {'error': 'Rate limit exceeded'}
+    
+    def test_unknown_route(self, server):
+        """Test unknown paths are a 404."""
+        assert requests.get(f'{server.url}/nope').status_code == 404
+    
+    def test_unknown_endpoint_behavior(self):
+        """Test behaviours for unknown endpoints are rejected."""
+        with pytest.raises(ValueError):
+            FastMockServer(behaviors={"analyse": Behavior()})
+    
+    def test_stop_terminates_workers(self):
+        """Test stop() ends every worker process and closes the port."""
+        server = FastMockServer(workers=2)
+        server.start()
+        processes = list(server.processes)
+        
+        server.stop()
+        
+        assert not any(p.is_alive() for p in processes)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(f'{server.url}/health', timeout=1)
+
+
+class TestAnalysisIds:
+    """Test background analyses can be polled on any worker."""
+    
+    def test_poll_on_other_worker(self):
+        """Test an id issued by one worker decodes on another."""
+        first = _Worker(0, 2, 0, {}, secret=7)
+        second = _Worker(1, 2, 0, {}, secret=7)
+        
+        known = first.encode_id(1000, "classification", "gpt-4", 12)
+        custom = first.encode_id(2000, "churn", "my-model", 3)
+        
+        assert second.decode_id(known) == (1.0, "classification", "gpt-4", 12)
+        assert second.decode_id(custom) == (2.0, "churn", "my-model", 3)
+    
+    def test_foreign_ids_not_found(self):
+        """Test ids from another server or typed by hand are rejected."""
+        analysis_id = _Worker(0, 1, 0, {}, secret=7).encode_id(1000, "time_series", "gpt-4", 1)
+        
+        assert _Worker(0, 1, 0, {}, secret=8).decode_id(analysis_id) is None
+        assert _Worker(0, 1, 0, {}, secret=7).decode_id(b"analysis_0_0") is None
+        assert _Worker(0, 1, 0, {}, secret=7).decode_id(b"other") is None
+        assert _Worker(0, 1, 0, {}, secret=7).decode_id(b"analysis_0_" + b"9" * 5000) is None
+    
+    @pytest.mark.parametrize("names", [b"\1\xff\xfe\0gpt", b"\1no-separator"])
+    def test_signed_garbage_names_not_found(self, names):
+        """Test a correctly signed id whose names do not decode is rejected."""
+        worker = _Worker(0, 1, 0, {}, secret=7)
+        packed = int.from_bytes(names, 'big') << (_UID_BITS + 8 + _POINTS_BITS)
+        token = (packed << _CHECK_BITS) + worker.check(0, packed)
+        
+        assert worker.decode_id(b"analysis_0_%d" % token) is None
@@ -2,39 +2,19 @@
 
 import pytest
 import requests
-import time
-from src.neurobloom.client import NeuroBloomClient
+from src.neurobloom.client import REQUEST_SECONDS, NeuroBloomClient
+from src.neurobloom.compression import ENCODINGS
+from src.neurobloom.metrics import Metrics
 from src.neurobloom.models import AnalysisRequest
-from .mock_server import MockNeuroBloomServer
+from .fast_mock_server import Behavior, FastMockServer
 
 
 class TestNeuroBloomHTTPClient:
     """Test HTTP client with real mock server."""
     
-    @pytest.fixture(scope='class')
-    def mock_server(self):
-        """Start mock server for the test class."""
-        server = MockNeuroBloomServer(port=8081)
-        server.start()
-        
-        # Wait for server to be ready
-        max_retries = 5
-        for i in range(max_retries):
-            try:
-                response = requests.get('http://127.0.0.1:8081/health', timeout=1)
-                if response.status_code == 200:
-                    break
-            except requests.exceptions.RequestException:
-                time.sleep(0.5)
-        else:
-            pytest.fail("Mock server failed to start")
-        
-        yield server
-        server.stop()
-    
-    def test_health_check(self, mock_server):
+    def test_health_check(self, mock_url):
         """Test server health endpoint."""
-        client = NeuroBloomClient('http://127.0.0.1:8081')
+        client = NeuroBloomClient(mock_url)
         
         health_data = client.health_check()
         
@@ -45,9 +25,9 @@ class TestNeuroBloomHTTPClient:
         client.close()
         print("✅ Health check passed")
     
-    def test_time_series_analysis(self, mock_server):
+    def test_time_series_analysis(self, mock_url):
         """Test time series analysis with real HTTP calls."""
-        client = NeuroBloomClient('http://127.0.0.1:8081')
+        client = NeuroBloomClient(mock_url)
         
         request_data = AnalysisRequest(
             data=[
@@ -71,9 +51,9 @@ class TestNeuroBloomHTTPClient:
         client.close()
         print("✅ Time series analysis test passed")
     
-    def test_classification_analysis(self, mock_server):
+    def test_classification_analysis(self, mock_url):
         """Test classification analysis."""
-        client = NeuroBloomClient('http://127.0.0.1:8081')
+        client = NeuroBloomClient(mock_url)
         
         request_data = AnalysisRequest(
             data=[
@@ -94,10 +74,183 @@ class TestNeuroBloomHTTPClient:
         client.close()
         print("✅ Classification analysis test passed")
     
-    def test_invalid_request(self, mock_server):
+    def test_streamed_analysis(self, mock_url):
+        """Test generator data is streamed as chunked NDJSON."""
+        client = NeuroBloomClient(mock_url)
+        
+        rows = ({"timestamp": i, "value": i % 7} for i in range(5000))
+        result = client.analyze_data(
+            AnalysisRequest(data=rows, analysis_type="time_series")
+        )
+        
+        assert result.status == "completed"
+        assert result.raw_data["data_points"] == 5000
+        
+        client.close()
+        print("✅ Streamed analysis test passed")
+    
+    def test_streamed_insights(self, mock_url):
+        """Test insights are yielded one at a time as they arrive."""
+        client = NeuroBloomClient(mock_url)
+        request_data = AnalysisRequest(
+            data=[{"timestamp": "2024-01-01", "value": 100}],
+            analysis_type="classification"
+        )
+        
+        insights = list(client.analyze_stream(request_data))
+        client.close()
+        
+        assert insights == [
+            "Classification completed with high accuracy",
+            "3 distinct clusters identified",
+            "Feature importance analysis completed"
+        ]
+    
+    def test_streamed_insights_from_iterable(self, mock_url):
+        """Test generator data is sent as NDJSON to the stream endpoint."""
+        client = NeuroBloomClient(mock_url)
+        request_data = AnalysisRequest(
+            data=({"timestamp": i, "value": i} for i in range(2000)),
+            analysis_type="classification"
+        )
+        
+        insights = list(client.analyze_stream(request_data))
+        client.close()
+        
+        assert insights[0] == "Classification completed with high accuracy"
+        assert len(insights) == 3
+    
+    def test_streamed_insights_invalid_request(self, mock_url):
+        """Test the stream endpoint rejects requests without data."""
+        response = requests.post(
+            f'{mock_url}/api/v1/analyze/stream',
+            json={"analysis_type": "time_series"}
+        )
+        
+        assert response.status_code == 400
+        assert response.json() == {'error': 'Missing required fields'}
+    
+    def test_submit_and_wait(self, mock_url):
+        """Test a background analysis is submitted, then polled to completion."""
+        client = NeuroBloomClient(mock_url)
+        request_data = AnalysisRequest(
+            data=[{"timestamp": "2024-01-01", "value": 100}],
+            analysis_type="time_series"
+        )
+        
+        analysis_id = client.submit(request_data)
+        pending = client.get_analysis(analysis_id)
+        result = client.wait(analysis_id, timeout=5, poll_interval=0.02)
+        client.close()
+        
+        assert not pending.done
+        assert result.id == analysis_id
+        assert result.status == "completed"
+        assert result.insights[0] == "Key pattern identified in time_series data"
+    
+    def test_wait_many_keeps_order(self, mock_url):
+        """Test wait_many returns results in submission order."""
+        client = NeuroBloomClient(mock_url)
+        ids = [
+            client.submit(AnalysisRequest(data=[{"value": i}], analysis_type=t))
+            for i, t in enumerate(["classification", "time_series", "sales_forecasting"])
+        ]
+        
+        results = client.wait_many(ids, timeout=5, poll_interval=0.02)
+        client.close()
+        
+        assert [r.id for r in results] == ids
+        assert [r.raw_data["analysis_type"] for r in results] == [
+            "classification", "time_series", "sales_forecasting"
+        ]
+    
+    def test_wait_timeout(self, mock_url):
+        """Test wait raises once the timeout passes."""
+        client = NeuroBloomClient(mock_url)
+        analysis_id = client.submit(
+            AnalysisRequest(data=[{"value": 1}], analysis_type="time_series")
+        )
+        
+        with pytest.raises(TimeoutError):
+            client.wait(analysis_id, timeout=0.01, poll_interval=0.01)
+        client.close()
+    
+    def test_unknown_analysis(self, mock_url):
+        """Test polling an unknown id raises."""
+        client = NeuroBloomClient(mock_url)
+        
+        with pytest.raises(Exception, match="Analysis lookup failed: 404"):
+            client.get_analysis("analysis_0_0")
+        client.close()
+    
+    def test_batch_analysis(self, mock_url):
+        """Test batch analysis with per-item results."""
+        client = NeuroBloomClient(mock_url)
+        
+        results = client.analyze_batch([
+            AnalysisRequest(data=[{"value": 1}], analysis_type="time_series"),
+            AnalysisRequest(data=[{"value": 1}, {"value": 2}], analysis_type="classification"),
+            AnalysisRequest(data=[], analysis_type="unknown_type", model="gpt-3.5-turbo")
+        ])
+        
+        assert [r.index for r in results] == [0, 1, 2]
+        assert all(r.ok for r in results)
+        assert results[0].response.confidence_score == 0.87
+        assert results[1].response.raw_data["data_points"] == 2
+        assert results[2].response.insights == ["Generic analysis completed"]
+        assert len({r.response.id for r in results}) == 3
+        
+        client.close()
+        print("✅ Batch analysis test passed")
+    
+    def test_batch_with_iterable_data(self, mock_url):
+        """Test generator data is sent as a list inside the batch body."""
+        client = NeuroBloomClient(mock_url)
+        rows = ({"value": i} for i in range(3))
+        
+        results = client.analyze_batch([AnalysisRequest(data=rows, analysis_type="time_series")])
+        
+        assert results[0].ok
+        assert results[0].response.raw_data["data_points"] == 3
+        client.close()
+    
+    def test_batch_per_item_errors(self, mock_url):
+        """Test one malformed item does not fail the whole batch."""
+        response = requests.post(
+            f'{mock_url}/api/v1/analyze/batch',
+            json={"requests": [
+                {"data": [], "analysis_type": "time_series"},
+                {"analysis_type": "time_series"}
+            ]}
+        )
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert "result" in results[0]
+        assert results[1] == {"index": 1, "error": "Missing required fields"}
+    
+    def test_client_metrics(self, mock_url):
+        """Test connect/TTFB/total timings are recorded per request."""
+        metrics = Metrics()
+        client = NeuroBloomClient(mock_url, metrics=metrics)
+        
+        client.health_check()
+        client.health_check()
+        client.close()
+        
+        connect = metrics.histogram(REQUEST_SECONDS, endpoint="health", phase="connect")
+        total = metrics.histogram(REQUEST_SECONDS, endpoint="health", phase="total")
+        ttfb = metrics.histogram(REQUEST_SECONDS, endpoint="health", phase="ttfb")
+        assert connect.count == total.count == ttfb.count == 2
+        assert 0 < connect.sum <= ttfb.sum <= total.sum
+        assert metrics.counter(
+            "neurobloom_client_requests_total", endpoint="health", status="200"
+        ) == 2
+    
+    def test_invalid_request(self, mock_url):
         """Test error handling with invalid requests."""
         response = requests.post(
-            'http://127.0.0.1:8081/api/v1/analyze',
+            f'{mock_url}/api/v1/analyze',
             json={"analysis_type": "time_series"},  # Missing 'data' field
             headers={'Content-Type': 'application/json'}
         )
@@ -108,3 +261,89 @@ class TestNeuroBloomHTTPClient:
         assert 'Missing required fields' in error_data['error']
         
         print("✅ Error handling test passed")
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+class TestCompressedClient:
+    """Test request bodies compressed by the client."""
+    
+    def test_compressed_analysis(self, mock_url, encoding):
+        """Test a large JSON body is sent compressed."""
+        client = NeuroBloomClient(mock_url, compression=encoding, compress_min_size=256)
+        sent = []
+        client.session.hooks['response'].append(
+            lambda r, *args, **kwargs: sent.append(r.request.headers.get('Content-Encoding'))
+        )
+        rows = [{"timestamp": f"2024-01-{i % 28 + 1:02d}", "value": i} for i in range(500)]
+        
+        result = client.analyze_data(AnalysisRequest(data=rows, analysis_type="time_series"))
+        client.health_check()
+        client.close()
+        
+        assert result.status == "completed"
+        assert result.raw_data["data_points"] == 500
+        assert sent == [encoding, None]
+    
+    def test_compressed_stream(self, mock_url, encoding):
+        """Test generator data is compressed chunk by chunk."""
+        client = NeuroBloomClient(mock_url, compression=encoding)
+        rows = ({"timestamp": i, "value": i % 7} for i in range(5000))
+        
+        result = client.analyze_data(AnalysisRequest(data=rows, analysis_type="time_series"))
+        client.close()
+        
+        assert result.status == "completed"
+        assert result.raw_data["data_points"] == 5000
+    
+    def test_compressed_batch_and_submit(self, mock_url, encoding):
+        """Test batch and background bodies are compressed too."""
+        client = NeuroBloomClient(mock_url, compression=encoding, compress_min_size=0)
+        request_data = AnalysisRequest(data=[{"value": 1}], analysis_type="classification")
+        
+        results = client.analyze_batch([request_data, request_data])
+        result = client.wait(client.submit(request_data), timeout=5)
+        client.close()
+        
+        assert all(r.ok for r in results)
+        assert result.status == "completed"
+
+
+@pytest.fixture(scope='module')
+def bad_gateway_url():
+    """Mock whose health and analyze endpoints always answer 502."""
+    with FastMockServer(workers=1, latency=0, behaviors={
+        "health": Behavior(error_rate=1.0, error_status=502),
+        "analyze": Behavior(error_rate=1.0, error_status=502),
+    }) as server:
+        yield server.url
+
+
+class TestRetries:
+    """Test which requests the client retries."""
+    
+    def test_get_retried_on_bad_gateway(self, bad_gateway_url):
+        """Test idempotent requests are retried on 502."""
+        metrics = Metrics()
+        client = NeuroBloomClient(bad_gateway_url, metrics=metrics, max_retries=2)
+        
+        client.health_check()
+        client.close()
+        
+        assert metrics.counter("neurobloom_client_retries_total", endpoint="health") == 2
+    
+    def test_post_not_replayed_on_bad_gateway(self, bad_gateway_url):
+        """Test an analysis is not resent after a 502 it may have outlived."""
+        metrics = Metrics()
+        client = NeuroBloomClient(bad_gateway_url, metrics=metrics, max_retries=2)
+        
+        with pytest.raises(Exception, match="502"):
+            client.analyze_data(AnalysisRequest(data=[{"value": 1}], analysis_type="time_series"))
+        client.close()
+        
+        assert metrics.counter("neurobloom_client_retries_total", endpoint="analyze") == 0
+
+
+def test_unknown_compression():
+    """Test an unsupported encoding is rejected up front."""
+    with pytest.raises(ValueError):
+        NeuroBloomClient("http://localhost", compression="br")
@@ -0,0 +1,47 @@
+"""Lifecycle tests for the mock server itself."""
+
+import threading
+import time
+
+import pytest
+import requests
+from .mock_server import MockNeuroBloomServer
+
+
+class TestMockServerLifecycle:
+    """Test ephemeral ports, readiness and shutdown."""
+    
+    def test_ephemeral_ports(self):
+        """Test concurrent servers each get their own free port."""
+        with MockNeuroBloomServer() as first, MockNeuroBloomServer() as second:
+            assert first.port != second.port
+            assert requests.get(f'{first.url}/health').status_code == 200
+            assert requests.get(f'{second.url}/health').status_code == 200
+    
+    def test_stop_shuts_down(self):
+        """Test stop() closes the socket and joins the serving thread."""
+        server = MockNeuroBloomServer()
+        server.start()
+        thread = server.server_thread
+        
+        server.stop()
+        
+        assert not thread.is_alive()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(f'{server.url}/health', timeout=1)
+    
+    def test_no_leaked_threads(self):
+        """Test repeated start/stop cycles leave no serving threads behind."""
+        before = set(threading.enumerate())
+        
+        for _ in range(3):
+            with MockNeuroBloomServer():
+                pass
+        
+        # Compare identities: threads left by earlier tests may finish meanwhile.
+        # Per-request handler threads are not joined on shutdown, so give the
+        # last one a moment to return.
+        deadline = time.monotonic() + 1
+        while set(threading.enumerate()) - before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert set(threading.enumerate()) - before == set()
@@ -0,0 +1,144 @@
+"""Retry and rate limiting against a local OpenAI stand-in."""
+
+import time
+
+import pytest
+from src.neurobloom.metrics import Metrics
+from src.neurobloom.ratelimit import RateLimiter, RetryPolicy
+
+
+class TestOpenAIRetry:
+    """Test the OpenAI call path under injected failures."""
+    
+    def test_success(self, openai_stub, sample_time_series_data, make_service):
+        """Test a normal completion is parsed."""
+        result = make_service().process_analysis(
+            sample_time_series_data, "time_series"
+        )
+        
+        assert result["status"] == "completed"
+        assert result["insights"][0] == "Upward trend across the period"
+    
+    def test_retries_429_then_succeeds(self, openai_stub, sample_time_series_data, make_service):
+        """Test transient 429s are retried."""
+        openai_stub.inject_failures(429, count=2)
+        service = make_service(metrics=Metrics())
+        
+        result = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert result["status"] == "completed"
+        assert len(openai_stub.received) == 3
+        assert service.metrics.counter(
+            "neurobloom_service_openai_retries_total", model="gpt-4"
+        ) == 2
+    
+    def test_retries_server_errors(self, openai_stub, sample_time_series_data, make_service):
+        """Test 5xx responses are retried."""
+        openai_stub.inject_failures(503, count=1)
+        
+        result = make_service().process_analysis(
+            sample_time_series_data, "time_series"
+        )
+        
+        assert result["status"] == "completed"
+        assert len(openai_stub.received) == 2
+    
+    def test_exhausted_retries_fail(self, openai_stub, sample_time_series_data, make_service):
+        """Test persistent 429s surface as a failed analysis."""
+        openai_stub.inject_failures(429, count=10)
+        service = make_service(retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01))
+        
+        result = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert result["status"] == "failed"
+        assert result["insights"] == []
+        assert "error" in result["raw_data"]
+        assert len(openai_stub.received) == 3
+    
+    def test_client_errors_not_retried(self, openai_stub, sample_time_series_data, make_service):
+        """Test 4xx other than 429 fail immediately."""
+        openai_stub.inject_failures(400, count=1)
+        
+        result = make_service().process_analysis(
+            sample_time_series_data, "time_series"
+        )
+        
+        assert result["status"] == "failed"
+        assert len(openai_stub.received) == 1
+    
+    def test_retry_after_respected(self, openai_stub, sample_time_series_data, make_service):
+        """Test a retry-after hint delays the next attempt."""
+        openai_stub.inject_failures(429, count=1, headers={"retry-after": "0.3"})
+        
+        start = time.monotonic()
+        result = make_service().process_analysis(
+            sample_time_series_data, "time_series"
+        )
+        
+        assert result["status"] == "completed"
+        assert time.monotonic() - start >= 0.3
+    
+    def test_retry_after_beyond_deadline_fails_fast(self, openai_stub,
+                                                    sample_time_series_data, make_service):
+        """Test a retry-after past the deadline is not waited out."""
+        openai_stub.inject_failures(429, count=1, headers={"retry-after": "30"})
+        service = make_service(retry_policy=RetryPolicy(deadline=1))
+        service.openai_client  # import openai outside the timed call
+        
+        start = time.monotonic()
+        result = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert result["status"] == "failed"
+        assert time.monotonic() - start < 1
+    
+    def test_limiter_adapts_to_headers(self, openai_stub, sample_time_series_data, make_service):
+        """Test exhausted remaining-requests blocks until the reset."""
+        openai_stub.response_headers = {
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "300ms"
+        }
+        service = make_service(rate_limiter=RateLimiter())
+        
+        service.process_analysis(sample_time_series_data, "time_series")
+        start = time.monotonic()
+        service.process_analysis(sample_time_series_data, "classification")
+        
+        assert time.monotonic() - start >= 0.25
+
+
+class TestOpenAIStreaming:
+    """Test streamed completions against the stub."""
+    
+    def test_first_insight_before_completion_ends(self, openai_stub, sample_time_series_data,
+                                                  make_service):
+        """Test the first insight arrives well before the last chunk."""
+        openai_stub.chunk_delay = 0.2
+        service = make_service()
+        service.openai_client  # created lazily; keep its import out of the timing
+        
+        start = time.monotonic()
+        arrivals = []
+        for event in service.stream_analysis(sample_time_series_data, "time_series"):
+            arrivals.append((time.monotonic() - start, event))
+        
+        first_at, first = arrivals[0]
+        assert first == {"index": 0, "insight": "Upward trend across the period"}
+        assert first_at < 0.2
+        assert arrivals[-1][0] >= 0.4
+        assert arrivals[-1][1]["result"]["insights"] == [
+            "Upward trend across the period",
+            "Weekly seasonality in values",
+            "No significant outliers detected"
+        ]
+        assert openai_stub.received[0]["stream"] is True
+    
+    def test_stream_open_is_retried(self, openai_stub, sample_time_series_data, make_service):
+        """Test a 429 before the stream opens is retried."""
+        openai_stub.inject_failures(429, count=1)
+        
+        events = list(make_service().stream_analysis(
+            sample_time_series_data, "time_series"
+        ))
+        
+        assert events[-1]["result"]["status"] == "completed"
+        assert len(openai_stub.received) == 2
@@ -0,0 +1,142 @@
+"""Pooled client against several mock servers with different latencies."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.neurobloom.models import AnalysisRequest
+from .mock_server import Latency, MockNeuroBloomServer
+
+
+REQUEST = AnalysisRequest(data=[{"timestamp": "2024-01-01", "value": 1}],
+                          analysis_type="time_series")
+
+
+@pytest.fixture
+def servers():
+    """Three mock regions: two fast, one slow."""
+    servers = [
+        MockNeuroBloomServer(latency=Latency.fixed(0.01)),
+        MockNeuroBloomServer(latency=Latency.fixed(0.01)),
+        MockNeuroBloomServer(latency=Latency.fixed(0.2)),
+    ]
+    for server in servers:
+        server.start()
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def run(pool, count, concurrency=8):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: pool.analyze_data(REQUEST), range(count)))
+
+
+class TestLoadBalancing:
+    """Test load spreading across endpoints."""
+    
+    @pytest.mark.parametrize("strategy", ["p2c", "least_outstanding"])
+    def test_slow_endpoint_gets_less_load(self, servers, strategy, pool_factory):
+        """Test the slow region receives the smallest share of requests."""
+        pool = pool_factory(servers, strategy=strategy)
+        
+        results = run(pool, 90)
+        
+        assert all(r.status == "completed" for r in results)
+        fast, slow = servers[0].requests + servers[1].requests, servers[2].requests
+        assert fast + slow == 90
+        assert servers[0].requests > 0 and servers[1].requests > 0
+        assert slow < min(servers[0].requests, servers[1].requests)
+    
+    def test_streamed_call_counted_until_body_read(self, servers, pool_factory):
+        """Test a streaming call stays outstanding until its body is consumed."""
+        pool = pool_factory(servers[:1])
+        endpoint = pool.endpoints[0]
+        
+        insights = pool.analyze_stream(REQUEST)
+        next(insights)
+        assert endpoint.outstanding == 1
+        list(insights)
+        
+        assert endpoint.outstanding == 0
+        assert endpoint.latency >= 0.01
+    
+    def test_submitted_analysis_polled_on_owner(self, servers, pool_factory):
+        """Test background analyses are fetched from the endpoint that queued them."""
+        pool = pool_factory(servers)
+        
+        ids = [pool.submit(REQUEST) for _ in range(6)]
+        results = pool.wait_many(ids, timeout=5, poll_interval=0.05)
+        
+        assert [r.id for r in results] == ids
+        assert all(r.status == "completed" for r in results)
+
+
+class TestFailover:
+    """Test circuit breakers and health probing."""
+    
+    def test_failing_endpoint_is_ejected(self, servers, pool_factory):
+        """Test 5xx answers are retried elsewhere and open the breaker."""
+        servers[0].error_status = 503
+        pool = pool_factory(servers[:2], failure_threshold=2, reset_timeout=60)
+        
+        results = [pool.analyze_data(REQUEST) for _ in range(10)]
+        
+        assert all(r.status == "completed" for r in results)
+        assert servers[0].requests == 2
+        assert pool.health_check()["endpoints"][servers[0].url]["circuit"] == "open"
+    
+    def test_post_not_replayed_after_server_error(self, servers, pool_factory):
+        """Test a POST the server may have processed is not resent elsewhere."""
+        servers[0].error_status = 500
+        pool = pool_factory(servers[:2], strategy="least_outstanding")
+        
+        with pytest.raises(Exception, match="Analysis failed: 500"):
+            pool.analyze_data(REQUEST)
+        
+        assert (servers[0].requests, servers[1].requests) == (1, 0)
+    
+    def test_stopped_endpoint_fails_over(self, servers, pool_factory):
+        """Test connection errors are retried on another endpoint."""
+        servers[1].stop()
+        pool = pool_factory(servers[:2], failure_threshold=1)
+        
+        results = [pool.analyze_data(REQUEST) for _ in range(5)]
+        
+        assert all(r.status == "completed" for r in results)
+        assert pool.health_check()["endpoints"][servers[1].url]["failures"] == 1
+    
+    def test_breaker_half_open_readmits(self, servers, pool_factory):
+        """Test a recovered endpoint is re-admitted after the reset timeout."""
+        servers[0].error_status = 500
+        pool = pool_factory(servers[:1], failure_threshold=1, reset_timeout=0.05)
+        
+        with pytest.raises(Exception, match="Analysis failed: 500"):
+            pool.analyze_data(REQUEST)
+        with pytest.raises(Exception, match="Request failed: No healthy endpoint"):
+            pool.analyze_data(REQUEST)
+        
+        servers[0].error_status = None
+        time.sleep(0.06)
+        assert pool.analyze_data(REQUEST).status == "completed"
+        assert pool.health_check()["endpoints"][servers[0].url]["circuit"] == "closed"
+    
+    def test_health_probe_ejects_and_readmits(self, servers, pool_factory):
+        """Test the background prober follows /health."""
+        pool = pool_factory(servers[:2], health_interval=0.05)
+        servers[0].healthy = False
+        
+        _wait_for(lambda: not pool.health_check()["endpoints"][servers[0].url]["healthy"])
+        before = servers[0].requests
+        run(pool, 10)
+        assert servers[0].requests == before
+        
+        servers[0].healthy = True
+        _wait_for(lambda: pool.health_check()["endpoints"][servers[0].url]["healthy"])
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
@@ -0,0 +1,70 @@
+"""Model routing against the OpenAI stand-in with per-model latencies."""
+
+import time
+
+import pytest
+from src.neurobloom.ratelimit import RetryPolicy
+from src.neurobloom.routing import ModelRouter, Tier
+
+
+@pytest.fixture(autouse=True)
+def model_latency(openai_stub):
+    """Make gpt-4 answer slowly and gpt-3.5-turbo at once."""
+    openai_stub.latency = {"gpt-4": 0.6, "gpt-3.5-turbo": 0.0}
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+TIERS = [Tier("fast", "gpt-3.5-turbo", max_rows=2), Tier("accurate", "gpt-4")]
+
+
+class TestRouting:
+    """Test routed analyses end to end."""
+    
+    def test_small_dataset_uses_fast_tier(self, openai_stub, sample_time_series_data, make_service):
+        """Test the dataset size picks the tier reported in raw_data."""
+        service = make_service(retry_policy=NO_RETRY, router=ModelRouter(TIERS))
+        
+        result = service.process_analysis(sample_time_series_data[:2], "time_series")
+        
+        assert result["raw_data"]["tier"] == "fast"
+        assert result["raw_data"]["model_used"] == "gpt-3.5-turbo"
+        assert openai_stub.received[0]["model"] == "gpt-3.5-turbo"
+    
+    def test_explicit_model_is_not_routed(self, openai_stub, sample_time_series_data, make_service):
+        """Test a caller-chosen model bypasses the router."""
+        service = make_service(retry_policy=NO_RETRY, router=ModelRouter(TIERS))
+        
+        result = service.process_analysis(sample_time_series_data[:2], "time_series", "gpt-4")
+        
+        assert result["raw_data"]["model_used"] == "gpt-4"
+        assert "tier" not in result["raw_data"]
+    
+    def test_hedged_request_answered_by_fast_tier(self, openai_stub, sample_time_series_data,
+                                                  make_service):
+        """Test a slow primary is hedged to the fast tier after its p95."""
+        router = ModelRouter(TIERS, hedge="fast", min_samples=1)
+        router.stats("gpt-4").record(0.1, ok=True)
+        service = make_service(retry_policy=NO_RETRY, router=router)
+        
+        start = time.monotonic()
+        result = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert result["status"] == "completed"
+        assert result["raw_data"]["tier"] == "fast"
+        assert time.monotonic() - start < 0.5
+        assert sorted(r["model"] for r in openai_stub.received) == ["gpt-3.5-turbo", "gpt-4"]
+        router.close()
+    
+    def test_fallback_chain_on_error(self, openai_stub, sample_time_series_data, make_service):
+        """Test a failing primary falls back to the next tier."""
+        openai_stub.latency = {}
+        openai_stub.inject_failures(400, count=1)
+        router = ModelRouter(TIERS, fallbacks={"accurate": ["fast"]})
+        
+        result = make_service(retry_policy=NO_RETRY, router=router).process_analysis(
+            sample_time_series_data, "time_series"
+        )
+        
+        assert result["status"] == "completed"
+        assert result["raw_data"]["tier"] == "fast"
+        assert [r["model"] for r in openai_stub.received] == ["gpt-4", "gpt-3.5-turbo"]
@@ -0,0 +1,83 @@
+"""Multi-worker server process tests."""
+
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+from src.neurobloom.client import NeuroBloomClient
+from src.neurobloom.models import AnalysisRequest
+from .openai_stub import OpenAIStubServer
+
+pytest.importorskip('gunicorn')
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+def _bound_url(process) -> str:
+    """Read the address gunicorn bound (``--port 0``) from its log."""
+    for line in process.stderr:
+        match = re.search(rb'Listening at: (http://\S+)', line)
+        if match:
+            return match.group(1).decode()
+    pytest.fail("Server exited before binding")
+
+
+@pytest.fixture(scope='module')
+def server_process():
+    """Run the production server with two workers against the OpenAI stub."""
+    stub = OpenAIStubServer()
+    stub.start()
+    env = dict(os.environ, OPENAI_API_KEY='test-key', OPENAI_BASE_URL=stub.base_url)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.neurobloom.server',
+         '--host', '127.0.0.1', '--port', '0', '--workers', '2',
+         '--graceful-timeout', '5'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    url = _bound_url(process)
+    for _ in range(100):
+        try:
+            if requests.get(f'{url}/health', timeout=0.5).status_code == 200:
+                break
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    else:
+        process.kill()
+        pytest.fail(f"Server failed to start: {process.stderr.read().decode()}")
+
+    yield process, url
+
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    stub.stop()
+
+
+class TestServerProcess:
+    """Test the gunicorn-backed server end to end."""
+    
+    def test_analyze(self, server_process):
+        """Test the client against the real service app."""
+        _, url = server_process
+        client = NeuroBloomClient(url)
+        
+        result = client.analyze_data(AnalysisRequest(
+            data=[{"value": 1}, {"value": 2}], analysis_type="time_series"
+        ))
+        
+        assert result.status == "completed"
+        assert result.insights[0] == "Upward trend across the period"
+        client.close()
+    
+    def test_graceful_shutdown(self, server_process):
+        """Test SIGTERM stops all workers cleanly."""
+        process, _ = server_process
+        
+        process.send_signal(signal.SIGTERM)
+        
+        assert process.wait(timeout=10) == 0
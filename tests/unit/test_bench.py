@@ -0,0 +1,59 @@
+"""Unit tests for benchmark statistics."""
+
+import pytest
+from src.neurobloom.bench import (
+    compare_results,
+    make_requests,
+    parse_mix,
+    percentile,
+    summarize_latencies,
+    write_results,
+)
+
+
+def test_percentile_interpolates():
+    """Test linear interpolation between ranks."""
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_latencies():
+    """Test throughput counts errors and percentiles ignore them."""
+    result = summarize_latencies("run", [0.1] * 9, errors=1, duration=2.0)
+    
+    assert result.requests == 10
+    assert result.throughput == 5.0
+    assert result.p99 == pytest.approx(0.1)
+
+
+def test_make_requests_mix_is_reproducible():
+    """Test the analysis-type mix follows weights and the seed."""
+    requests = make_requests(1000, payload_rows=3, mix={"a": 3, "b": 1}, seed=1)
+    
+    share_a = sum(r.analysis_type == "a" for r in requests) / 1000
+    assert 0.7 < share_a < 0.8
+    assert len(requests[0].data) == 3
+    assert [r.analysis_type for r in make_requests(20, mix={"a": 3, "b": 1}, seed=1)] == \
+        [r.analysis_type for r in requests[:20]]
+
+
+def test_parse_mix():
+    """Test mix specs parse, defaulting missing weights to 1."""
+    assert parse_mix("time_series=0.7,classification") == {
+        "time_series": 0.7, "classification": 1.0
+    }
+
+
+def test_compare_results_flags_regressions(tmp_path):
+    """Test p95 and throughput regressions beyond tolerance are reported."""
+    path = str(tmp_path / "baseline.json")
+    write_results([summarize_latencies("run", [0.1] * 10, 0, 1.0)], path)
+    
+    same = summarize_latencies("run", [0.105] * 10, 0, 1.0)
+    slower = summarize_latencies("run", [0.2] * 10, 0, 2.0)
+    
+    assert compare_results(path, [same]) == []
+    assert len(compare_results(path, [slower])) == 2
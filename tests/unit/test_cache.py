@@ -0,0 +1,120 @@
+"""Unit tests for insight caches."""
+
+import time
+
+import pytest
+from src.neurobloom.cache import AnalysisCache, MemoryCache, SQLiteCache, make_cache_key
+
+
+class TestCacheKey:
+    """Test canonical cache keys."""
+    
+    def test_stable(self):
+        """Test equal inputs give equal keys."""
+        assert make_cache_key("p", "gpt-4", 0.3, 500) == make_cache_key("p", "gpt-4", 0.3, 500)
+    
+    def test_sensitive_to_every_field(self):
+        """Test each field changes the key."""
+        base = make_cache_key("p", "gpt-4", 0.3, 500)
+        
+        assert make_cache_key("q", "gpt-4", 0.3, 500) != base
+        assert make_cache_key("p", "gpt-3.5-turbo", 0.3, 500) != base
+        assert make_cache_key("p", "gpt-4", 0.7, 500) != base
+        assert make_cache_key("p", "gpt-4", 0.3, 200) != base
+
+
+class TestAnalysisCache:
+    """Test the cache base class."""
+    
+    def test_backend_must_implement_storage(self):
+        """Test a backend missing ``_set`` fails when created."""
+        class ReadOnly(AnalysisCache):
+            def _get(self, key):
+                return None
+        
+        with pytest.raises(TypeError, match="_set"):
+            ReadOnly()
+
+
+class TestMemoryCache:
+    """Test in-memory LRU cache."""
+    
+    def test_hit_and_miss_counters(self):
+        """Test stats track lookups."""
+        cache = MemoryCache()
+        
+        assert cache.get("k") is None
+        cache.set("k", ["insight"])
+        assert cache.get("k") == ["insight"]
+        
+        assert cache.stats == {"hits": 1, "misses": 1}
+    
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted first."""
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", ["1"])
+        cache.set("b", ["2"])
+        cache.get("a")
+        cache.set("c", ["3"])
+        
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == ["1"]
+    
+    def test_ttl_expiry(self):
+        """Test expired entries are misses."""
+        cache = MemoryCache(ttl=0.01)
+        cache.set("k", ["insight"])
+        time.sleep(0.02)
+        
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+
+class TestSQLiteCache:
+    """Test on-disk cache."""
+    
+    def test_survives_reopen(self, tmp_path):
+        """Test entries persist across cache instances."""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteCache(path)
+        cache.set("k", ["one", "two"])
+        cache.close()
+        
+        reopened = SQLiteCache(path)
+        assert reopened.get("k") == ["one", "two"]
+        assert reopened.stats == {"hits": 1, "misses": 0}
+        reopened.close()
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test expired rows are misses."""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=0.01)
+        cache.set("k", ["insight"])
+        time.sleep(0.02)
+        
+        assert cache.get("k") is None
+        cache.close()
+    
+    def test_expired_rows_purged_on_write(self, tmp_path):
+        """Test expired keys that are never read again are removed."""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=0.01, purge_every=10)
+        for i in range(9):
+            cache.set(f"old{i}", ["insight"])
+        time.sleep(0.02)
+        
+        cache.set("new", ["insight"])
+        
+        assert len(cache) == 1
+        cache.close()
+    
+    def test_expired_rows_purged_on_open(self, tmp_path):
+        """Test reopening a cache drops rows that expired meanwhile."""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteCache(path, ttl=0.01)
+        cache.set("k", ["insight"])
+        cache.close()
+        time.sleep(0.02)
+        
+        reopened = SQLiteCache(path)
+        assert len(reopened) == 0
+        reopened.close()
@@ -0,0 +1,159 @@
+"""Unit tests for the OpenAI record/replay cassette."""
+
+import time
+
+import httpx
+import pytest
+from src.neurobloom.cassette import (
+    Cassette,
+    CassetteMiss,
+    CassetteTransport,
+    Recording,
+    request_key,
+)
+
+
+def completion_request(body: bytes, host: str = "api.openai.com") -> httpx.Request:
+    return httpx.Request(
+        "POST", f"https://{host}/v1/chat/completions", content=body,
+        headers={"Authorization": "Bearer secret", "Content-Type": "application/json"}
+    )
+
+
+class CountingTransport(httpx.BaseTransport):
+    """Upstream answering every request with a fixed status."""
+    
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.calls = 0
+    
+    def handle_request(self, request):
+        self.calls += 1
+        return httpx.Response(self.status, json={"call": self.calls})
+
+
+class TestRequestKey:
+    """Test canonical request hashing."""
+    
+    def test_ignores_host_headers_and_key_order(self):
+        """Test equivalent requests share a key."""
+        a = completion_request(b'{"model": "gpt-4", "stream": false}')
+        b = completion_request(b'{"stream":false,"model":"gpt-4"}', host="127.0.0.1:9000")
+        
+        assert request_key(a) == request_key(b)
+    
+    def test_sensitive_to_body_and_path(self):
+        """Test different bodies or paths get different keys."""
+        base = request_key(completion_request(b'{"model": "gpt-4"}'))
+        
+        assert request_key(completion_request(b'{"model": "gpt-3.5-turbo"}')) != base
+        assert request_key(httpx.Request(
+            "POST", "https://api.openai.com/v1/completions", content=b'{"model": "gpt-4"}'
+        )) != base
+
+
+class TestCassette:
+    """Test the append-only indexed store."""
+    
+    def test_round_trip_and_reopen(self, tmp_path):
+        """Test recordings survive reopening and later ones win."""
+        path = str(tmp_path / "openai.cassette")
+        cassette = Cassette(path)
+        cassette.put(b"a" * 32, Recording(200, [("content-type", "text/plain")], b"first\nline"))
+        cassette.put(b"b" * 32, Recording(404, [], b""))
+        cassette.put(b"a" * 32, Recording(200, [], b"second", elapsed=0.5))
+        cassette.close()
+        
+        reopened = Cassette(path)
+        
+        assert len(reopened) == 2
+        assert reopened.get(b"a" * 32) == Recording(200, [], b"second", 0.5)
+        assert reopened.get(b"b" * 32).status == 404
+        assert reopened.get(b"c" * 32) is None
+    
+    def test_rebuilds_missing_index_and_drops_torn_record(self, tmp_path):
+        """Test records without index entries are recovered after a crash."""
+        path = tmp_path / "openai.cassette"
+        cassette = Cassette(str(path))
+        cassette.put(b"a" * 32, Recording(200, [], b"kept"))
+        cassette.close()
+        (tmp_path / "openai.cassette.idx").unlink()
+        with open(path, "ab") as f:
+            f.write(b"z" * 40)
+        
+        recovered = Cassette(str(path))
+        recovered.put(b"b" * 32, Recording(200, [], b"after"))
+        
+        assert recovered.get(b"a" * 32).content == b"kept"
+        assert Cassette(str(path)).get(b"b" * 32).content == b"after"
+    
+    def test_reads_records_appended_after_mapping(self, tmp_path):
+        """Test the memory map grows to cover new records."""
+        cassette = Cassette(str(tmp_path / "openai.cassette"))
+        cassette.put(b"a" * 32, Recording(200, [], b"one"))
+        assert cassette.get(b"a" * 32).content == b"one"
+        
+        cassette.put(b"b" * 32, Recording(200, [], b"two"))
+        
+        assert cassette.get(b"b" * 32).content == b"two"
+
+
+class TestCassetteTransport:
+    """Test record and replay modes."""
+    
+    def test_auto_records_then_replays(self, tmp_path):
+        """Test the upstream is only called for unrecorded requests."""
+        upstream = CountingTransport()
+        transport = CassetteTransport(
+            Cassette(str(tmp_path / "c")), mode="auto", transport=upstream
+        )
+        client = httpx.Client(transport=transport)
+        
+        first = client.post("https://api.openai.com/v1/chat/completions", json={"n": 1})
+        second = client.post("https://api.openai.com/v1/chat/completions", json={"n": 1})
+        
+        assert first.json() == second.json() == {"call": 1}
+        assert upstream.calls == 1
+        assert (transport.recorded, transport.replayed) == (1, 1)
+    
+    def test_replay_miss_raises(self, tmp_path):
+        """Test replay mode never reaches the upstream."""
+        upstream = CountingTransport()
+        client = httpx.Client(transport=CassetteTransport(
+            Cassette(str(tmp_path / "c")), transport=upstream
+        ))
+        
+        with pytest.raises(CassetteMiss):
+            client.get("https://api.openai.com/v1/models")
+        assert upstream.calls == 0
+    
+    def test_transient_failures_not_recorded(self, tmp_path):
+        """Test 429s pass through without being stored."""
+        cassette = Cassette(str(tmp_path / "c"))
+        client = httpx.Client(transport=CassetteTransport(
+            cassette, mode="record", transport=CountingTransport(429)
+        ))
+        
+        assert client.get("https://api.openai.com/v1/models").status_code == 429
+        assert len(cassette) == 0
+    
+    def test_simulated_latency(self, tmp_path):
+        """Test replays are delayed by the configured latency."""
+        cassette = Cassette(str(tmp_path / "c"))
+        request = completion_request(b"{}")
+        cassette.put(request_key(request), Recording(200, [], b"{}", elapsed=0.2))
+        
+        fixed = CassetteTransport(cassette, latency=0.05)
+        start = time.monotonic()
+        fixed.handle_request(request)
+        assert 0.05 <= time.monotonic() - start < 0.2
+        
+        realtime = CassetteTransport(cassette, realtime=True)
+        start = time.monotonic()
+        realtime.handle_request(request)
+        assert time.monotonic() - start >= 0.2
+    
+    def test_unknown_mode(self, tmp_path):
+        """Test an unknown mode is rejected."""
+        with pytest.raises(ValueError):
+            CassetteTransport(Cassette(str(tmp_path / "c")), mode="sometimes")
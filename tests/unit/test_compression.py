@@ -0,0 +1,101 @@
+"""Unit tests for request/response compression helpers."""
+
+import io
+import json
+
+import pytest
+from src.neurobloom.compression import (
+    ENCODINGS, GZIP, ZSTD, DecompressionError, DecompressionLimitExceeded,
+    UnsupportedEncoding, compress, compress_stream, decompress, negotiate,
+    open_decompressed,
+)
+
+
+PAYLOAD = json.dumps([{"timestamp": i, "value": i % 7} for i in range(2000)]).encode()
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+class TestRoundTrip:
+    """Test every supported encoding round-trips."""
+    
+    def test_one_shot(self, encoding):
+        """Test compress/decompress restores the payload."""
+        compressed = compress(PAYLOAD, encoding)
+        
+        assert len(compressed) < len(PAYLOAD) / 5
+        assert decompress(compressed, encoding) == PAYLOAD
+    
+    def test_stream(self, encoding):
+        """Test chunked compression decodes to the joined chunks."""
+        chunks = [PAYLOAD[i:i + 1000] for i in range(0, len(PAYLOAD), 1000)]
+        
+        compressed = b"".join(compress_stream(iter(chunks), encoding))
+        
+        assert decompress(compressed, encoding) == PAYLOAD
+    
+    def test_readlines(self, encoding):
+        """Test the decompressed reader iterates by line."""
+        lines = [json.dumps({"i": i}).encode() + b"\n" for i in range(500)]
+        source = io.BytesIO(compress(b"".join(lines), encoding))
+        
+        assert list(open_decompressed(source, encoding)) == lines
+    
+    def test_size_limit(self, encoding):
+        """Test a highly compressible body cannot expand past the limit."""
+        bomb = compress(b"\0" * (4 * 1024 * 1024), encoding)
+        
+        assert len(bomb) < 64 * 1024
+        with pytest.raises(DecompressionLimitExceeded):
+            decompress(bomb, encoding, max_size=1024 * 1024)
+    
+    def test_exact_limit(self, encoding):
+        """Test a body of exactly ``max_size`` bytes is accepted."""
+        assert decompress(compress(PAYLOAD, encoding), encoding, max_size=len(PAYLOAD)) == PAYLOAD
+    
+    def test_corrupt(self, encoding):
+        """Test garbage and truncated bodies raise DecompressionError."""
+        compressed = compress(PAYLOAD, encoding)
+        
+        with pytest.raises(DecompressionError) as excinfo:
+            decompress(b"not compressed at all", encoding)
+        assert excinfo.value.status == 400
+        with pytest.raises(DecompressionError):
+            decompress(compressed[:len(compressed) // 2], encoding)
+
+
+class TestEncodings:
+    """Test encoding selection."""
+    
+    def test_unsupported(self):
+        """Test unknown encodings raise UnsupportedEncoding (415)."""
+        with pytest.raises(UnsupportedEncoding) as excinfo:
+            compress(PAYLOAD, "br")
+        
+        assert excinfo.value.status == 415
+    
+    def test_gzip_always_available(self):
+        """Test gzip needs no optional dependency."""
+        assert GZIP in ENCODINGS
+    
+    @pytest.mark.parametrize("header,expected", [
+        ("gzip, deflate", GZIP),
+        ("gzip;q=0, deflate", None),
+        ("identity", None),
+        ("", None),
+        ("*", ENCODINGS[0]),
+        (f"{ENCODINGS[0]};q=0.5, gzip", ENCODINGS[0]),
+        ("gzip;q=0, *", ENCODINGS[0] if ENCODINGS[0] != GZIP else None),
+        ("*, gzip;q=0", ENCODINGS[0] if ENCODINGS[0] != GZIP else None),
+        ("*;q=0, gzip", GZIP),
+    ])
+    def test_negotiate(self, header, expected):
+        """Test the preferred accepted encoding is chosen."""
+        assert negotiate(header) == expected
+    
+    def test_zstd_preferred(self):
+        """Test zstd is offered, and preferred, when zstandard is installed."""
+        pytest.importorskip('zstandard')
+        
+        assert ENCODINGS == (ZSTD, GZIP)
+        assert negotiate("gzip, zstd") == ZSTD
+        assert negotiate("zstd;q=0, *") == GZIP
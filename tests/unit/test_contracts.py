@@ -0,0 +1,249 @@
+"""Unit tests for Pact matching, hashing and the verification cache."""
+
+import json
+
+import pytest
+from src.neurobloom.contracts import (
+    EachLike,
+    Like,
+    PactTransport,
+    Term,
+    VerificationCache,
+    fingerprint_paths,
+    interaction_hash,
+)
+from src.neurobloom.contracts.matchers import Matcher, extract
+from src.neurobloom.contracts.matching import Rules, compare_body, compare_headers
+from src.neurobloom.contracts.pactfile import load_pact, matching_rules, provider_states, write_pact
+
+
+class TestCompareBody:
+    """Test body matching semantics."""
+    
+    def test_equality_allows_extra_keys(self):
+        """Test unmentioned keys are ignored and values compared exactly."""
+        errors = compare_body({"status": "ok"}, {"status": "ok", "extra": 1}, Rules({}))
+        
+        assert errors == []
+        assert compare_body({"status": "ok"}, {"status": "bad"}, Rules({})) == [
+            "$.status: expected 'ok', got 'bad'"
+        ]
+    
+    def test_missing_key(self):
+        """Test missing keys are reported by path."""
+        assert compare_body({"a": {"b": 1}}, {"a": {}}, Rules({})) == ["$.a.b: missing"]
+    
+    def test_type_rule_cascades(self):
+        """Test a type rule applies to everything below its path."""
+        rules = Rules({"$.raw_data": {"match": "type"}})
+        
+        assert compare_body(
+            {"raw_data": {"time": 0.1, "rows": 2}}, {"raw_data": {"time": 9.5, "rows": 7}}, rules
+        ) == []
+        assert compare_body(
+            {"raw_data": {"rows": 2}}, {"raw_data": {"rows": "2"}}, rules
+        ) == ["$.raw_data.rows: expected number, got string"]
+    
+    def test_each_like(self):
+        """Test arrays matched by type use the first example and min length."""
+        rules = Rules({"$.insights": {"min": 1}, "$.insights[*]": {"match": "type"}})
+        
+        assert compare_body({"insights": ["x"]}, {"insights": ["a", "b", "c"]}, rules) == []
+        assert compare_body({"insights": ["x"]}, {"insights": []}, rules) == [
+            "$.insights: expected at least 1 items, got 0"
+        ]
+        assert compare_body({"insights": ["x"]}, {"insights": ["a", 2]}, rules) == [
+            "$.insights[1]: expected string, got number"
+        ]
+    
+    def test_regex(self):
+        """Test regex rules match the whole string."""
+        rules = Rules({"$.id": {"match": "regex", "regex": r"analysis_\d+"}})
+        
+        assert compare_body({"id": "analysis_1"}, {"id": "analysis_42"}, rules) == []
+        assert compare_body({"id": "analysis_1"}, {"id": "analysis_42x"}, rules) != []
+    
+    def test_most_specific_rule_wins(self):
+        """Test an exact path rule overrides a wildcard one."""
+        rules = Rules({"$.items[*]": {"match": "type"},
+                       "$.items[0]": {"match": "regex", "regex": "a+"}})
+        
+        assert compare_body({"items": ["a", "b"]}, {"items": ["b", "c"]}, rules) == [
+            "$.items[0]: expected to match /a+/, got 'b'"
+        ]
+    
+    def test_bool_is_not_number(self):
+        """Test booleans never satisfy numeric examples."""
+        assert compare_body({"n": 1}, {"n": True}, Rules({"$.n": {"match": "type"}})) == [
+            "$.n: expected number, got boolean"
+        ]
+
+
+class TestCompareHeaders:
+    """Test header matching."""
+    
+    def test_case_insensitive_names(self):
+        """Test header names are matched case-insensitively."""
+        actual = {"content-type": "application/json; charset=utf-8"}
+        
+        assert compare_headers(
+            {"Content-Type": "application/json;charset=utf-8"}, actual, {}
+        ) == []
+        assert compare_headers({"X-Missing": "1"}, {}, {}) == ["header X-Missing: missing"]
+
+
+class TestPactFile:
+    """Test spec normalization and hashing."""
+    
+    def test_v2_rules(self):
+        """Test v2 rules are split into body paths and header names."""
+        part = {"matchingRules": {"$.body.id": {"match": "type"},
+                                  "$.headers.Content-Type": {"match": "regex", "regex": "x"}}}
+        
+        assert matching_rules(part, "body") == {"$.id": {"match": "type"}}
+        assert matching_rules(part, "header") == {"Content-Type": {"match": "regex", "regex": "x"}}
+    
+    def test_v3_rules(self):
+        """Test v3 matcher lists are normalized to one rule per path."""
+        part = {"matchingRules": {"body": {"$.id": {"matchers": [{"match": "type"}]}}}}
+        
+        assert matching_rules(part, "body") == {"$.id": {"match": "type"}}
+        assert matching_rules(part, "header") == {}
+    
+    def test_provider_states(self):
+        """Test v2 and v3 provider state forms."""
+        assert provider_states({"providerState": "ready"}) == ["ready"]
+        assert provider_states({"providerStates": [{"name": "a"}, {"name": "b"}]}) == ["a", "b"]
+        assert provider_states({}) == []
+    
+    def test_interaction_hash_ignores_key_order(self):
+        """Test hashing is canonical."""
+        assert interaction_hash({"a": 1, "b": [1, 2]}) == interaction_hash({"b": [1, 2], "a": 1})
+        assert interaction_hash({"a": 1}) != interaction_hash({"a": 2})
+    
+    def test_fingerprint_changes_with_source(self, tmp_path):
+        """Test the provider fingerprint tracks file contents."""
+        source = tmp_path / "provider.py"
+        source.write_text("x = 1\n")
+        before = fingerprint_paths([str(tmp_path)])
+        
+        source.write_text("x = 2\n")
+        
+        assert fingerprint_paths([str(tmp_path)]) != before
+
+
+class TestVerificationCache:
+    """Test cache persistence."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test saved keys are found by a new cache instance."""
+        path = str(tmp_path / "nested" / "cache.json")
+        cache = VerificationCache(path)
+        cache.add("abc:v1")
+        cache.save()
+        
+        assert "abc:v1" in VerificationCache(path)
+        assert "abc:v2" not in VerificationCache(path)
+    
+    @pytest.mark.parametrize("content", ["", "not json", json.dumps({"other": 1})])
+    def test_unreadable_cache_is_empty(self, tmp_path, content):
+        """Test a missing or corrupt cache file starts empty."""
+        path = tmp_path / "cache.json"
+        path.write_text(content)
+        
+        assert "abc:v1" not in VerificationCache(str(path))
+
+
+class TestMatchers:
+    """Test matcher extraction into examples and v3 rules."""
+    
+    def test_extract(self):
+        """Test markers become examples plus rules keyed by JSON path."""
+        body = {
+            "id": Term(r"^a\d+$", "a1"),
+            "items": EachLike({"score": Like(0.5)}, minimum=2),
+            "fixed": "x",
+        }
+        
+        example, rules = extract(body)
+        
+        assert example == {"id": "a1", "items": [{"score": 0.5}] * 2, "fixed": "x"}
+        assert rules == {
+            "$.id": {"match": "regex", "regex": r"^a\d+$"},
+            "$.items": {"match": "type", "min": 2},
+            "$.items[*].score": {"match": "type"},
+        }
+    
+    def test_extracted_rules_match(self):
+        """Test extracted rules accept other values of the same shape."""
+        example, rules = extract({"id": Term(r"^a\d+$", "a1"), "items": EachLike(1)})
+        
+        assert compare_body(example, {"id": "a22", "items": [3, 4, 5]}, Rules(rules)) == []
+        assert compare_body(example, {"id": "b1", "items": []}, Rules(rules))
+    
+    def test_incomplete_matcher_rejected(self):
+        """Test a matcher without ``rule`` fails when created, not when extracted."""
+        class ExampleOnly(Matcher):
+            def example(self):
+                return 1
+        
+        with pytest.raises(TypeError, match="rule"):
+            ExampleOnly()
+
+
+class TestPactTransport:
+    """Test in-process replay of Pact interactions."""
+    
+    def _session(self, interactions):
+        import requests
+        session = requests.Session()
+        session.mount("http://provider", PactTransport(interactions))
+        return session
+    
+    def test_serves_matching_interaction(self):
+        """Test a matching request gets the contract's example response."""
+        interaction = {
+            "description": "a lookup",
+            "request": {"method": "GET", "path": "/items", "query": {"page": ["2"]}},
+            "response": {"status": 200, "body": {"items": [1]}},
+        }
+        session = self._session([interaction])
+        
+        response = session.get("http://provider/items", params={"page": 2})
+        
+        assert response.status_code == 200
+        assert response.json() == {"items": [1]}
+        assert session.get_adapter("http://provider").received == [interaction]
+    
+    def test_unmatched_request_is_500(self):
+        """Test a request matching nothing is answered 500 with the mismatches."""
+        session = self._session([{
+            "description": "a create",
+            "request": {"method": "POST", "path": "/items", "body": {"name": "a"}},
+            "response": {"status": 201},
+        }])
+        
+        response = session.post("http://provider/items", json={"name": "b"})
+        
+        assert response.status_code == 500
+        assert "$.name" in response.json()["mismatches"]["a create"][0]
+        assert session.get_adapter("http://provider").unmatched == ["POST /items"]
+
+
+class TestWritePact:
+    """Test Pact v3 file writing."""
+    
+    def test_merge_replaces_same_interaction(self, tmp_path):
+        """Test merging keeps other interactions and replaces same-identity ones."""
+        path = str(tmp_path / "c-p.json")
+        first = {"description": "a", "request": {"path": "/a"}, "response": {"status": 200}}
+        other = {"description": "b", "request": {"path": "/b"}, "response": {"status": 200}}
+        write_pact(path, "c", "p", [first, other])
+        
+        updated = dict(first, response={"status": 204})
+        write_pact(path, "c", "p", [updated], merge=True)
+        pact = load_pact(path)
+        
+        assert pact["metadata"]["pactSpecification"]["version"] == "3.0.0"
+        assert sorted(i["description"] for i in pact["interactions"]) == ["a", "b"]
+        assert [i for i in pact["interactions"] if i["description"] == "a"] == [updated]
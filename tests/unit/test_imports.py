@@ -0,0 +1,158 @@
+"""Import-time regression tests.
+
+Each check runs in a fresh interpreter. Heavy dependencies must stay
+unloaded where they are not needed. Import cost is checked as a ratio
+against work measured in the same run, never a fixed number of
+milliseconds, so the checks hold on slow or busy machines; failures
+list the slowest modules from ``-X importtime``.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Tuple
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+HEAVY = ("openai", "httpx", "requests", "numpy", "flask")
+# Yardstick for imports that should cost a fraction of one real dependency
+YARDSTICK = "import requests"
+
+
+def run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str, self_time: bool = False):
+    """(cumulative microseconds, name, depth) per ``-X importtime`` line.
+    
+    With ``self_time`` each entry starts with the module's own microseconds.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entry = (int(cumulative), name.strip(), depth)
+        entries.append((int(own),) + entry if self_time else entry)
+    return entries
+
+
+def loaded(code: str) -> set:
+    """Heavy top-level packages in ``sys.modules`` after running ``code``."""
+    result = run(code + "\nimport sys; print(__import__('json').dumps(sorted(sys.modules)))")
+    modules = set(json.loads(result.stdout.splitlines()[-1]))
+    return {name for name in HEAVY if name in modules}
+
+
+def own_share(code: str) -> float:
+    """Fraction of ``code``'s import time spent in this package's own modules.
+    
+    Both parts come from one ``-X importtime`` run, so a busy machine slows
+    them alike; best of three.
+    """
+    shares = []
+    for _ in range(3):
+        entries = parse_importtime(run(code).stderr, self_time=True)
+        own = sum(us for us, _, name, _ in entries if name.startswith('src.'))
+        total = sum(cumulative for _, cumulative, name, depth in entries
+                    if depth == 0 and name != 'site')
+        shares.append(own / total)
+    return min(shares)
+
+
+def import_ms(code: str) -> float:
+    """CPU milliseconds ``code`` spends importing, in one fresh interpreter.
+    
+    CPU time rather than wall time, so parallel test workers sharing a core
+    do not inflate the numbers.
+    """
+    timed = f"import time\nstart = time.process_time()\n{code}\nprint(time.process_time() - start)"
+    return float(run(timed).stdout.splitlines()[-1]) * 1000
+
+
+def compare_ms(code: str, baseline: str, runs: int = 3) -> Tuple[float, float]:
+    """Best-of-``runs`` times for ``code`` and ``baseline``, measured alternately."""
+    times = [(import_ms(code), import_ms(baseline)) for _ in range(runs)]
+    return min(t for t, _ in times), min(b for _, b in times)
+
+
+def slowest_imports(code: str, count: int = 5) -> str:
+    """The modules with the largest cumulative ``-X importtime`` cost."""
+    entries = sorted(parse_importtime(run(code).stderr), reverse=True)
+    return ", ".join(f"{name} {us / 1000:.0f}ms" for us, name, _ in entries[:count])
+
+
+class TestLazyImports:
+    """Test heavy dependencies load only when used."""
+    
+    def test_package_and_models(self):
+        """Test the package and its models load no heavy dependency."""
+        assert loaded("import src.neurobloom as nb; nb.AnalysisRequest; nb.AnalysisResponse") == set()
+    
+    def test_cli(self):
+        """Test parsing CLI arguments loads no heavy dependency."""
+        code = "from src.neurobloom.__main__ import build_parser; build_parser().parse_args(['health'])"
+        
+        assert loaded(code) == set()
+    
+    def test_service_defers_openai(self):
+        """Test creating a service does not import openai or httpx."""
+        code = "from src.neurobloom.service import NeuroBloomService; NeuroBloomService('key')"
+        
+        assert loaded(code) == {"numpy"}
+    
+    def test_openai_loaded_on_first_use(self):
+        """Test the OpenAI client is created when first accessed."""
+        code = (
+            "from src.neurobloom.service import NeuroBloomService\n"
+            "NeuroBloomService('key').openai_client"
+        )
+        
+        assert {"openai", "httpx"} <= loaded(code)
+    
+    def test_client_needs_only_requests(self):
+        """Test the HTTP client loads requests but not the service stack."""
+        assert loaded("import src.neurobloom.client") == {"requests"}
+    
+    def test_lazy_attribute_errors(self):
+        """Test unknown package attributes still raise AttributeError."""
+        import src.neurobloom as neurobloom
+        
+        with pytest.raises(AttributeError):
+            neurobloom.NotAThing
+        assert "NeuroBloomClient" in dir(neurobloom)
+
+
+@pytest.mark.parametrize("code", [
+    "import src.neurobloom as nb; nb.AnalysisRequest",
+    "import src.neurobloom.__main__",
+])
+def test_light_import_cost(code):
+    """Test the package and CLI import in a fraction of one real dependency."""
+    elapsed, baseline = compare_ms(code, YARDSTICK)
+    
+    assert elapsed <= baseline / 4, (
+        f"{code!r} took {elapsed:.0f}ms, {YARDSTICK!r} {baseline:.0f}ms; "
+        f"slowest: {slowest_imports(code)}"
+    )
+
+
+@pytest.mark.parametrize("code", [
+    "import src.neurobloom.client",
+    "import src.neurobloom.service",
+])
+def test_import_overhead(code):
+    """Test most of a module's import time goes to the libraries it needs."""
+    share = own_share(code)
+    
+    assert share <= 0.3, (
+        f"{code!r} spent {share:.0%} of its import time in src.neurobloom; "
+        f"slowest: {slowest_imports(code)}"
+    )
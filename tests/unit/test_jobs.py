@@ -0,0 +1,88 @@
+"""Unit tests for the background job queue."""
+
+import threading
+import time
+
+import pytest
+from src.neurobloom.jobs import JobQueue, QueueFull
+
+
+def wait_done(jobs, job_id, timeout=2.0):
+    """Poll ``jobs`` until ``job_id`` leaves the pending states."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = jobs.get(job_id)
+        if result["status"] not in ("queued", "running"):
+            return result
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} did not finish")
+
+
+class TestJobQueue:
+    """Test submission, polling and back-pressure."""
+    
+    def test_result_keeps_job_id(self):
+        """Test the finished result is stored under the submitted id."""
+        jobs = JobQueue(lambda value: {"id": "ignored", "status": "completed", "value": value})
+        
+        pending = jobs.submit("job-1", 42)
+        result = wait_done(jobs, "job-1")
+        
+        assert pending["status"] == "queued"
+        assert result == {"id": "job-1", "status": "completed", "value": 42}
+    
+    def test_running_status(self):
+        """Test a job reports running while a worker holds it."""
+        release = threading.Event()
+        jobs = JobQueue(lambda: release.wait() and {"status": "completed"})
+        
+        jobs.submit("job-1")
+        deadline = time.monotonic() + 2
+        while jobs.get("job-1")["status"] != "running" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        assert jobs.get("job-1")["status"] == "running"
+        release.set()
+        assert wait_done(jobs, "job-1")["status"] == "completed"
+    
+    def test_queue_full(self):
+        """Test submits beyond the bound are rejected and not recorded."""
+        release = threading.Event()
+        jobs = JobQueue(lambda: release.wait() and {"status": "completed"},
+                        workers=1, max_pending=1)
+        jobs.submit("running")
+        while jobs.pending:
+            time.sleep(0.01)
+        jobs.submit("queued")
+        
+        with pytest.raises(QueueFull):
+            jobs.submit("rejected")
+        
+        assert jobs.get("rejected") is None
+        release.set()
+    
+    def test_exception_marks_failed(self):
+        """Test an exception from the job becomes a failed result."""
+        def boom():
+            raise RuntimeError("boom")
+        jobs = JobQueue(boom)
+        
+        jobs.submit("job-1")
+        
+        result = wait_done(jobs, "job-1")
+        assert result["status"] == "failed"
+        assert result["raw_data"] == {"error": "boom"}
+    
+    def test_finished_jobs_expire(self):
+        """Test finished results are pruned after the ttl."""
+        jobs = JobQueue(lambda: {"status": "completed"}, ttl=0)
+        jobs.submit("old")
+        wait_done(jobs, "old")
+        
+        jobs.submit("new")
+        
+        assert jobs.get("old") is None
+    
+    def test_unknown_job(self):
+        """Test unknown ids return None."""
+        assert JobQueue(lambda: {}).get("missing") is None
@@ -0,0 +1,73 @@
+"""Unit tests for the metrics registry."""
+
+from src.neurobloom.metrics import NULL_METRICS, Metrics
+
+
+class TestMetrics:
+    """Test histograms, counters and export."""
+    
+    def test_span_records_histogram(self):
+        """Test a span observes its duration under its labels."""
+        metrics = Metrics()
+        
+        with metrics.span("stage_seconds", stage="parse"):
+            pass
+        
+        histogram = metrics.histogram("stage_seconds", stage="parse")
+        assert histogram.count == 1
+        assert histogram.sum >= 0
+        assert metrics.histogram("stage_seconds", stage="other") is None
+    
+    def test_counter(self):
+        """Test counters accumulate per label set."""
+        metrics = Metrics()
+        
+        metrics.inc("retries_total", endpoint="analyze")
+        metrics.inc("retries_total", 2, endpoint="analyze")
+        
+        assert metrics.counter("retries_total", endpoint="analyze") == 3
+        assert metrics.counter("retries_total", endpoint="health") == 0
+    
+    def test_hook_receives_observations(self):
+        """Test the hook sees every observation with its labels."""
+        seen = []
+        metrics = Metrics(hook=lambda name, value, labels: seen.append((name, value, labels)))
+        
+        metrics.observe("latency_seconds", 0.2, phase="total")
+        metrics.inc("requests_total")
+        
+        assert seen == [("latency_seconds", 0.2, {"phase": "total"}), ("requests_total", 1, {})]
+    
+    def test_render_prometheus(self):
+        """Test text exposition has cumulative buckets, sum and count."""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.observe("latency_seconds", 0.05, phase="ttfb")
+        metrics.observe("latency_seconds", 0.5, phase="ttfb")
+        metrics.inc("requests_total", status="200")
+        
+        lines = metrics.render_prometheus().splitlines()
+        
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{status="200"} 1' in lines
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{phase="ttfb",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{phase="ttfb",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{phase="ttfb",le="+Inf"} 2' in lines
+        assert 'latency_seconds_count{phase="ttfb"} 2' in lines
+    
+    def test_label_values_escaped(self):
+        """Test quotes in label values are escaped."""
+        metrics = Metrics()
+        metrics.inc("errors_total", reason='bad "input"')
+        
+        assert 'errors_total{reason="bad \\"input\\""} 1' in metrics.render_prometheus()
+    
+    def test_null_metrics_records_nothing(self):
+        """Test the disabled registry ignores observations."""
+        with NULL_METRICS.span("stage_seconds", stage="parse"):
+            pass
+        NULL_METRICS.inc("requests_total")
+        
+        assert not NULL_METRICS.enabled
+        assert NULL_METRICS.histogram("stage_seconds", stage="parse") is None
+        assert NULL_METRICS.render_prometheus() == "\n"
@@ -1,7 +1,13 @@
 """Unit tests for data models."""
 
 import pytest
-from src.neurobloom.models import AnalysisRequest, AnalysisResponse
+from src.neurobloom import jsonutil
+from src.neurobloom.models import (
+    AnalysisRequest,
+    AnalysisResponse,
+    BatchItemResult,
+    ValidationError,
+)
 
 
 class TestAnalysisRequest:
@@ -44,6 +50,21 @@ class TestAnalysisRequest:
         }
         
         assert request.to_dict() == expected
+    
+    def test_from_dict_validates(self):
+        """Test request decoding reports the offending field."""
+        with pytest.raises(ValidationError) as exc:
+            AnalysisRequest.from_dict({"data": [{"a": 1}, 2], "analysis_type": "x"})
+        
+        assert exc.value.field == "data[1]"
+    
+    def test_slots(self):
+        """Test instances carry no per-instance dict."""
+        request = AnalysisRequest(data=[], analysis_type="test")
+        
+        assert not hasattr(request, "__dict__")
+        with pytest.raises(AttributeError):
+            request.extra = 1
 
 
 class TestAnalysisResponse:
@@ -81,3 +102,84 @@ class TestAnalysisResponse:
         assert response.insights == ["test insight"]
         assert response.confidence_score == 0.92
         assert response.raw_data == {"model": "gpt-4"}
+    
+    def test_from_json(self):
+        """Test decoding from a JSON body."""
+        body = jsonutil.dumps({
+            "id": "a", "status": "completed", "insights": [], "confidence_score": 1
+        })
+        
+        response = AnalysisResponse.from_json(body)
+        
+        assert response.confidence_score == 1
+        assert response.raw_data == {}
+    
+    def test_round_trip(self):
+        """Test to_dict output decodes to an equal response."""
+        response = AnalysisResponse("a", "completed", ["x"], 0.5, {"k": 1})
+        
+        assert AnalysisResponse.from_dict(response.to_dict()) == response
+    
+    @pytest.mark.parametrize("status, done", [
+        ("queued", False), ("running", False), ("completed", True), ("failed", True)
+    ])
+    def test_done(self, status, done):
+        """Test background analyses are done once they leave the pending states."""
+        assert AnalysisResponse("a", status, [], 0.0, {}).done is done
+    
+    @pytest.mark.parametrize("payload, field", [
+        ({"status": "completed", "insights": [], "confidence_score": 0.5}, "id"),
+        ({"id": 1, "status": "completed", "insights": [], "confidence_score": 0.5}, "id"),
+        ({"id": "a", "status": "completed", "insights": "x", "confidence_score": 0.5}, "insights"),
+        ({"id": "a", "status": "completed", "insights": ["x", 2], "confidence_score": 0.5},
+         "insights[1]"),
+        ({"id": "a", "status": "completed", "insights": [], "confidence_score": True},
+         "confidence_score"),
+        ({"id": "a", "status": "completed", "insights": [], "confidence_score": 0.5,
+          "raw_data": []}, "raw_data"),
+    ])
+    def test_from_dict_field_errors(self, payload, field):
+        """Test each schema violation names its field."""
+        with pytest.raises(ValidationError) as exc:
+            AnalysisResponse.from_dict(payload)
+        
+        assert exc.value.field == field
+
+
+class TestBatchItemResult:
+    """Test BatchItemResult model."""
+    
+    def test_from_dict_result(self):
+        """Test parsing a successful batch item."""
+        item = BatchItemResult.from_dict({
+            "index": 1,
+            "result": {
+                "id": "test_1",
+                "status": "completed",
+                "insights": ["insight"],
+                "confidence_score": 0.8
+            }
+        })
+        
+        assert item.ok
+        assert item.index == 1
+        assert item.response.id == "test_1"
+        assert item.error is None
+    
+    def test_from_dict_error(self):
+        """Test parsing a failed batch item."""
+        item = BatchItemResult.from_dict({"index": 0, "error": "Missing required fields"})
+        
+        assert not item.ok
+        assert item.response is None
+        assert item.error == "Missing required fields"
+    
+    def test_nested_error_path(self):
+        """Test nested response errors carry the full path."""
+        with pytest.raises(ValidationError) as exc:
+            BatchItemResult.from_dict(
+                {"index": 3, "result": {"id": "a", "status": "completed", "insights": []}},
+                "results[3]."
+            )
+        
+        assert exc.value.field == "results[3].result.confidence_score"
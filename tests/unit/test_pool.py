@@ -0,0 +1,108 @@
+"""Unit tests for pool endpoint selection and circuit breaking."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+from src.neurobloom.client import NeuroBloomClient
+from src.neurobloom.pool import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    NoEndpointAvailable,
+)
+
+
+ENDPOINTS = ["http://a", "http://b", "http://c"]
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test only consecutive failures open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        
+        breaker.record_failure()
+        
+        assert breaker.state == OPEN
+        assert not breaker.admit()
+    
+    def test_half_open_admits_one_trial(self):
+        """Test a single trial after the timeout decides the state."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        
+        assert breaker.state == HALF_OPEN
+        assert breaker.admit()
+        assert not breaker.admit()
+        
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        time.sleep(0.02)
+        assert breaker.admit()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+class TestSelect:
+    """Test endpoint selection."""
+    
+    def test_least_outstanding(self, pool_factory):
+        """Test the endpoint with fewest requests in flight wins."""
+        pool = pool_factory(ENDPOINTS, strategy="least_outstanding")
+        a, b, c = pool.endpoints
+        a.outstanding, b.outstanding, c.outstanding = 3, 1, 2
+        
+        assert pool.select() is b
+        assert pool.select(exclude=[b]) is c
+    
+    def test_p2c_prefers_lower_expected_wait(self, pool_factory):
+        """Test the faster of any two sampled endpoints is chosen."""
+        pool = pool_factory(ENDPOINTS, strategy="p2c")
+        a, b, c = pool.endpoints
+        a.latency, b.latency, c.latency = 0.01, 0.02, 1.0
+        
+        picks = [pool.select() for _ in range(200)]
+        
+        assert c not in picks
+        assert picks.count(a) > picks.count(b)
+    
+    def test_none_available(self, pool_factory):
+        """Test ejected endpoints are never selected."""
+        pool = pool_factory(ENDPOINTS, strategy="p2c")
+        for endpoint in pool.endpoints:
+            endpoint.healthy = False
+        
+        with pytest.raises(NoEndpointAvailable):
+            pool.select()
+        assert pool.health_check()["status"] == "unhealthy"
+    
+    def test_no_endpoint_is_a_request_error(self):
+        """Test the pool's error is handled like other transport failures."""
+        assert issubclass(NoEndpointAvailable, requests.exceptions.RequestException)
+    
+    def test_analysis_owners_bounded(self, pool_factory):
+        """Test owners of never-polled analyses are forgotten past the cap or TTL."""
+        pool = pool_factory(ENDPOINTS, max_tracked_analyses=2, analysis_ttl=0.05)
+        pool._last.endpoint = pool.endpoints[0]
+        for analysis_id in ("one", "two", "three"):
+            with patch.object(NeuroBloomClient, "submit", return_value=analysis_id):
+                pool.submit(None)
+        
+        assert list(pool._owners) == ["two", "three"]
+        assert pool._pinned("get_analysis", "/api/v1/analyses/three") is pool.endpoints[0]
+        time.sleep(0.06)
+        assert pool._pinned("get_analysis", "/api/v1/analyses/three") is None
+    
+    def test_unknown_strategy(self, pool_factory):
+        """Test strategies are validated."""
+        with pytest.raises(ValueError):
+            pool_factory(ENDPOINTS, strategy="round_robin")
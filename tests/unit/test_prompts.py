@@ -0,0 +1,122 @@
+"""Unit tests for prompt templates and token budgeting."""
+
+import pytest
+from src.neurobloom.prompts import (
+    DEFAULT_CONTEXT_WINDOW,
+    PromptBuilder,
+    context_window,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+from src.neurobloom.summary import summarize
+
+
+def wide_rows(rows: int = 50, columns: int = 200):
+    return [{f"feature_{c}": r * c + 0.5 for c in range(columns)} for r in range(rows)]
+
+
+class TestEstimateTokens:
+    """Test the local token estimator."""
+    
+    def test_counts_words_numbers_and_punctuation(self):
+        """Test each kind of token is counted."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("rows") == 1
+        assert estimate_tokens("1234567") == 3
+        assert estimate_tokens('{"a":1}') == 7
+    
+    def test_grows_with_text(self):
+        """Test longer text never estimates fewer tokens."""
+        text = "Analyze this time series data for trends and patterns:"
+        
+        assert estimate_tokens(text * 10) >= 10 * estimate_tokens(text) - 10
+
+
+class TestContextWindow:
+    """Test model context lookup."""
+    
+    @pytest.mark.parametrize("model,expected", [
+        ("gpt-4", 8192),
+        ("gpt-4-0613", 8192),
+        ("gpt-4-32k-0613", 32768),
+        ("gpt-4o-mini", 128000),
+        ("gpt-3.5-turbo", 16385),
+        ("some-local-model", DEFAULT_CONTEXT_WINDOW),
+    ])
+    def test_longest_prefix(self, model, expected):
+        """Test the most specific known model name wins."""
+        assert context_window(model) == expected
+
+
+class TestPromptBuilder:
+    """Test template selection and budget trimming."""
+    
+    def test_registered_template(self, sample_time_series_data):
+        """Test known types use their template followed by the summary."""
+        summary = summarize(sample_time_series_data)
+        prompt = PromptBuilder().build(summary, "time_series", "gpt-4")
+        
+        assert prompt == (
+            "Analyze this time series data for trends and patterns:\n" + summary.to_prompt()
+        )
+    
+    def test_fallback_and_custom_templates(self, sample_time_series_data):
+        """Test unknown types get the generic template, registered ones their own."""
+        summary = summarize(sample_time_series_data)
+        builder = PromptBuilder()
+        
+        assert builder.build(summary, "churn", "gpt-4").startswith(
+            "Provide insights and analysis for this churn data:\n"
+        )
+        builder.register("churn", "Explain what drives churn in this data:")
+        assert builder.build(summary, "churn", "gpt-4").startswith(
+            "Explain what drives churn in this data:\n"
+        )
+    
+    def test_budget_accounts_for_system_and_completion(self):
+        """Test the budget leaves room for the system prompt and completion."""
+        builder = PromptBuilder("You are a data analysis expert.", completion_tokens=500)
+        
+        assert builder.budget("gpt-4") < 8192 - 500
+        assert PromptBuilder(budgets={"gpt-4": 300}).budget("gpt-4") == 300
+    
+    def test_large_data_trimmed_to_budget(self):
+        """Test wide data is cut down to the model's budget."""
+        summary = summarize(wide_rows())
+        builder = PromptBuilder(budgets={"gpt-4": 400})
+        
+        prompt = builder.build(summary, "classification", "gpt-4")
+        
+        assert estimate_tokens(prompt) <= 400
+        assert prompt.startswith("Classify and analyze patterns in this data:\nrows: 50")
+        assert "more columns" in prompt
+    
+    def test_samples_dropped_before_columns(self):
+        """Test sample rows go first when they are what overflows."""
+        summary = summarize(wide_rows(columns=30))
+        full = summary.to_prompt()
+        without_samples = summary.to_prompt(sample_rows=0)
+        builder = PromptBuilder(budgets={"gpt-4": estimate_tokens(without_samples) + 20})
+        
+        prompt = builder.build(summary, "time_series", "gpt-4")
+        
+        assert estimate_tokens(full) > builder.budget("gpt-4")
+        assert prompt.endswith(without_samples)
+    
+    def test_budget_too_small(self, sample_time_series_data):
+        """Test a budget with no room for data is an error."""
+        builder = PromptBuilder(budgets={"gpt-4": 5})
+        
+        with pytest.raises(ValueError, match="budget"):
+            builder.build(summarize(sample_time_series_data), "time_series", "gpt-4")
+
+
+class TestTruncate:
+    """Test line-wise truncation."""
+    
+    def test_keeps_whole_leading_lines(self):
+        """Test only complete lines within the limit are kept."""
+        text = "alpha beta\ngamma delta\nepsilon zeta"
+        
+        assert truncate_to_tokens(text, 6) == "alpha beta\ngamma delta"
+        assert truncate_to_tokens(text, 1) == ""
@@ -0,0 +1,101 @@
+"""Unit tests for rate limiting and retry policy."""
+
+import time
+
+import pytest
+from src.neurobloom.ratelimit import (
+    DeadlineExceeded,
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    parse_duration,
+)
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1s", 1.0),
+    ("20ms", 0.02),
+    ("6m0s", 360.0),
+    ("1h2m3.5s", 3723.5),
+    ("2.5", 2.5),
+    (None, None),
+    ("soon", None),
+])
+def test_parse_duration(value, seconds):
+    """Test OpenAI reset durations parse to seconds."""
+    assert parse_duration(value) == seconds
+
+
+class TestTokenBucket:
+    """Test token bucket accounting."""
+    
+    def test_wait_time_after_drain(self):
+        """Test an empty bucket reports the refill wait."""
+        bucket = TokenBucket(60, period=60)  # 1 per second
+        now = time.monotonic()
+        bucket.take(60)
+        
+        assert bucket.wait_time(1, now) == pytest.approx(1.0, abs=0.05)
+    
+    def test_sync_blocks_until_reset(self):
+        """Test zero remaining blocks until the server reset."""
+        bucket = TokenBucket(100)
+        now = time.monotonic()
+        bucket.sync(remaining=0, reset_after=2.0, now=now)
+        
+        assert bucket.wait_time(1, now) == pytest.approx(2.0)
+
+
+class TestRateLimiter:
+    """Test combined request/token budgets."""
+    
+    def test_token_budget_limits(self):
+        """Test a large token request waits for the token bucket."""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)  # 10/s
+        limiter.acquire(600)
+        
+        start = time.monotonic()
+        limiter.acquire(2)
+        
+        assert time.monotonic() - start >= 0.15
+    
+    def test_deadline_exceeded(self):
+        """Test acquire gives up when the wait passes the deadline."""
+        limiter = RateLimiter(requests_per_minute=1)
+        limiter.acquire(1)
+        
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire(1, deadline=time.monotonic() + 0.1)
+    
+    def test_headers_update_capacity(self):
+        """Test limit headers resize the buckets."""
+        limiter = RateLimiter()
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-limit-tokens": "1000",
+            "x-ratelimit-remaining-tokens": "10",
+        })
+        
+        assert limiter.requests.capacity == 60
+        assert limiter.tokens.capacity == 1000
+        assert limiter.tokens.level <= 10.1
+
+
+class TestRetryPolicy:
+    """Test backoff delays."""
+    
+    def test_exponential_cap(self):
+        """Test delays stay within the exponential envelope."""
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        
+        for attempt in range(6):
+            assert 0 <= policy.delay(attempt) <= min(4, 2 ** attempt)
+    
+    def test_retry_after_is_floor(self):
+        """Test server hints are never shortened."""
+        assert RetryPolicy(base_delay=0.01).delay(0, retry_after=2.0) == 2.0
+    
+    def test_needs_an_attempt(self):
+        """Test a policy that would never call upstream is rejected."""
+        with pytest.raises(ValueError, match="max_attempts"):
+            RetryPolicy(max_attempts=0)
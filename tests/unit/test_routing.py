@@ -0,0 +1,190 @@
+"""Unit tests for model routing, fallbacks and hedging."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.neurobloom.routing import ModelRouter, ModelStats, Tier
+
+
+TIERS = [
+    Tier("small", "gpt-3.5-turbo", max_rows=1000),
+    Tier("large", "gpt-4"),
+]
+
+
+def backend(latency=None, failing=()):
+    """A call function sleeping per model and failing for some models."""
+    latency = latency or {}
+    calls = []
+    lock = threading.Lock()
+    
+    def call(tier):
+        with lock:
+            calls.append(tier.model)
+        time.sleep(latency.get(tier.model, 0))
+        if tier.model in failing:
+            raise RuntimeError(f"{tier.model} unavailable")
+        return f"answer from {tier.model}"
+    
+    call.calls = calls
+    return call
+
+
+class TestModelStats:
+    """Test rolling latency and error stats."""
+    
+    def test_p95_and_error_rate(self):
+        """Test percentiles over successes and the failure share."""
+        stats = ModelStats(window=100)
+        for i in range(1, 101):
+            stats.record(i / 100, ok=True)
+        
+        assert stats.p95() == pytest.approx(0.96)
+        assert stats.p95(min_samples=101) is None
+        
+        for _ in range(50):
+            stats.record(5.0, ok=False)
+        assert stats.error_rate() == 0.5
+        assert stats.p95() == pytest.approx(0.96)
+
+
+class TestRoute:
+    """Test tier selection."""
+    
+    def test_by_dataset_size(self):
+        """Test small datasets go to the small tier, large ones past it."""
+        router = ModelRouter(TIERS)
+        
+        assert router.route(10, "time_series").primary.name == "small"
+        assert router.route(5000, "time_series").primary.name == "large"
+    
+    def test_by_analysis_type(self):
+        """Test tiers restricted to analysis types are skipped for others."""
+        router = ModelRouter([
+            Tier("forecast", "gpt-4", analysis_types=["sales_forecasting"]),
+            Tier("general", "gpt-3.5-turbo"),
+        ])
+        
+        assert router.route(10, "sales_forecasting").primary.name == "forecast"
+        assert router.route(10, "classification").primary.name == "general"
+    
+    def test_unhealthy_tier_skipped(self):
+        """Test a tier with a high error rate loses its traffic."""
+        router = ModelRouter(TIERS, min_samples=5)
+        for _ in range(5):
+            router.stats("gpt-3.5-turbo").record(0.1, ok=False)
+        
+        assert router.route(10, "time_series").primary.name == "large"
+    
+    def test_slow_tier_skipped(self):
+        """Test a tier above its p95 ceiling loses its traffic."""
+        router = ModelRouter(
+            [Tier("fast", "gpt-4", max_p95=0.5), Tier("other", "gpt-3.5-turbo")], min_samples=5
+        )
+        for _ in range(5):
+            router.stats("gpt-4").record(2.0, ok=True)
+        
+        assert router.route(10, "time_series").primary.name == "other"
+    
+    def test_hedge_after_observed_p95(self):
+        """Test the hedge delay comes from the primary's p95 once known."""
+        router = ModelRouter(TIERS, hedge="small", min_samples=3)
+        
+        assert router.route(5000, "time_series").hedge is None
+        for latency in (0.1, 0.2, 0.3):
+            router.stats("gpt-4").record(latency, ok=True)
+        route = router.route(5000, "time_series")
+        
+        assert route.hedge.name == "small"
+        assert route.hedge_after == pytest.approx(0.3)
+        assert router.route(10, "time_series").hedge is None
+    
+    def test_unknown_tier_names(self):
+        """Test fallbacks and hedges must name configured tiers."""
+        with pytest.raises(ValueError, match="medium"):
+            ModelRouter(TIERS, fallbacks={"large": ["medium"]})
+        with pytest.raises(ValueError, match="Unknown tiers: tiny"):
+            ModelRouter(TIERS, hedge="tiny")
+
+
+class TestExecute:
+    """Test fallbacks and hedged calls."""
+    
+    def test_fallback_on_error(self):
+        """Test a failing tier hands over to its fallback."""
+        router = ModelRouter(TIERS, fallbacks={"large": ["small"]})
+        call = backend(failing={"gpt-4"})
+        
+        answer, tier = router.execute(router.route(5000, "time_series"), call)
+        
+        assert (answer, tier.name) == ("answer from gpt-3.5-turbo", "small")
+        assert call.calls == ["gpt-4", "gpt-3.5-turbo"]
+        assert router.fallbacks_used == 1
+        assert router.stats("gpt-4").error_rate() == 1.0
+    
+    def test_all_tiers_fail(self):
+        """Test the last error is raised when the chain is exhausted."""
+        router = ModelRouter(TIERS, fallbacks={"large": ["small"]})
+        
+        with pytest.raises(RuntimeError, match="gpt-3.5-turbo unavailable"):
+            router.execute(
+                router.route(5000, "time_series"), backend(failing={"gpt-4", "gpt-3.5-turbo"})
+            )
+    
+    def test_hedge_wins_when_primary_slow(self):
+        """Test a slow primary is raced by the hedge tier."""
+        router = ModelRouter(TIERS, hedge="small", hedge_after=0.05)
+        call = backend(latency={"gpt-4": 0.5})
+        
+        start = time.monotonic()
+        answer, tier = router.execute(router.route(5000, "time_series"), call)
+        
+        assert tier.name == "small"
+        assert time.monotonic() - start < 0.3
+        assert (router.hedged, router.hedge_wins) == (1, 1)
+        router.close()
+    
+    def test_no_hedge_when_primary_fast(self):
+        """Test a primary answering before the hedge delay is not duplicated."""
+        router = ModelRouter(TIERS, hedge="small", hedge_after=0.5)
+        call = backend()
+        
+        answer, tier = router.execute(router.route(5000, "time_series"), call)
+        
+        assert tier.name == "large"
+        assert call.calls == ["gpt-4"]
+        assert router.hedged == 0
+        router.close()
+    
+    def test_hedge_timer_ignores_other_requests(self):
+        """Test busy hedged calls elsewhere do not delay a request's primary."""
+        router = ModelRouter(TIERS, hedge="small", hedge_after=1.0)
+        slow = backend(latency={"gpt-4": 0.5, "gpt-3.5-turbo": 0.5})
+        with ThreadPoolExecutor(max_workers=40) as executor:
+            for _ in range(40):
+                executor.submit(router.execute, router.route(5000, "time_series"), slow)
+            time.sleep(0.05)
+            
+            start = time.monotonic()
+            answer, tier = router.execute(router.route(5000, "time_series"), backend())
+            elapsed = time.monotonic() - start
+        
+        assert tier.name == "large"
+        assert elapsed < 0.3
+        router.close()
+    
+    def test_fast_primary_failure_falls_back_to_hedge_tier(self):
+        """Test a primary failing before the hedge delay still falls back."""
+        router = ModelRouter(
+            TIERS, fallbacks={"large": ["small"]}, hedge="small", hedge_after=0.5
+        )
+        
+        answer, tier = router.execute(
+            router.route(5000, "time_series"), backend(failing={"gpt-4"})
+        )
+        
+        assert tier.name == "small"
+        assert router.hedged == 0
+        router.close()
@@ -0,0 +1,323 @@
+"""Unit tests for the production HTTP app."""
+
+import json
+import time
+
+import pytest
+from src.neurobloom.compression import ENCODINGS, GZIP, compress, decompress
+from src.neurobloom.jobs import QueueFull
+from src.neurobloom.metrics import Metrics
+from src.neurobloom import server
+from src.neurobloom.server import build_parser, create_app, service_from_env
+
+
+@pytest.fixture
+def client(service):
+    """Flask test client for an app over the fake-backed service."""
+    return create_app(service, max_request_size=4096).test_client()
+
+
+class TestServerApp:
+    """Test routes served from NeuroBloomService."""
+    
+    def test_health(self, client):
+        """Test health endpoint matches the mock contract."""
+        body = client.get('/health').get_json()
+        
+        assert body['status'] == 'healthy'
+        assert body['service'] == 'neurobloom-ai'
+    
+    def test_json_body_parsed_once(self, client, monkeypatch, sample_time_series_data):
+        """Test the async check and the request decoding share one parse."""
+        body = json.dumps({'data': sample_time_series_data, 'analysis_type': 'time_series'})
+        loads = server.jsonutil.loads
+        parsed = []
+        
+        def counting_loads(data):
+            if data == body.encode():
+                parsed.append(data)
+            return loads(data)
+        
+        monkeypatch.setattr(server.jsonutil, 'loads', counting_loads)
+        response = client.post('/api/v1/analyze', data=body, content_type='application/json')
+        
+        assert response.status_code == 200
+        assert len(parsed) == 1
+    
+    def test_analyze(self, client, sample_time_series_data):
+        """Test a JSON analysis request."""
+        response = client.post('/api/v1/analyze', json={
+            'data': sample_time_series_data,
+            'analysis_type': 'time_series',
+            'model': 'gpt-3.5-turbo'
+        })
+        
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body['status'] == 'completed'
+        assert body['raw_data']['model_used'] == 'gpt-3.5-turbo'
+        assert body['raw_data']['data_points'] == 4
+    
+    def test_analyze_ndjson(self, client):
+        """Test a streamed NDJSON analysis request."""
+        lines = [json.dumps({'analysis_type': 'time_series', 'model': 'gpt-4'})]
+        lines += [json.dumps({'value': i}) for i in range(50)]
+        
+        response = client.post(
+            '/api/v1/analyze',
+            data='\n'.join(lines) + '\n',
+            content_type='application/x-ndjson'
+        )
+        
+        assert response.get_json()['raw_data']['data_points'] == 50
+    
+    def test_validation_error_names_field(self, client):
+        """Test schema errors are reported as 400 with the field."""
+        response = client.post('/api/v1/analyze', json={'data': 'oops', 'analysis_type': 'x'})
+        
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('data:')
+    
+    def test_invalid_json(self, client):
+        """Test malformed JSON is a 400."""
+        response = client.post('/api/v1/analyze', data='{', content_type='application/json')
+        
+        assert response.status_code == 400
+    
+    def test_request_size_limit(self, client):
+        """Test bodies over the limit are rejected with 413."""
+        response = client.post('/api/v1/analyze', json={
+            'data': [{'value': 'x' * 100}] * 100,
+            'analysis_type': 'time_series'
+        })
+        
+        assert response.status_code == 413
+        assert 'error' in response.get_json()
+    
+    def test_batch(self, client, sample_time_series_data):
+        """Test the batch route."""
+        response = client.post('/api/v1/analyze/batch', json={'requests': [
+            {'data': sample_time_series_data, 'analysis_type': 'time_series'},
+            {'analysis_type': 'time_series'},
+            {'data': [{'value': 1}], 'analysis_type': 'time_series', 'model': 4}
+        ]})
+        
+        results = response.get_json()['results']
+        assert results[0]['result']['status'] == 'completed'
+        assert results[1]['error'] == 'Missing required fields'
+        assert results[2]['error'] == 'requests[2].model: expected str, got int'
+    
+    def test_analyze_stream(self, client, sample_time_series_data):
+        """Test insights are streamed as NDJSON events."""
+        response = client.post('/api/v1/analyze/stream', json={
+            'data': sample_time_series_data,
+            'analysis_type': 'time_series'
+        })
+        
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert response.mimetype == 'application/x-ndjson'
+        assert [e['insight'] for e in events[:-1]] == [
+            'First insight', 'Second insight', 'Third insight'
+        ]
+        assert events[-1]['result']['status'] == 'completed'
+    
+    def test_analyze_stream_validation(self, client):
+        """Test the stream endpoint validates like the JSON one."""
+        response = client.post('/api/v1/analyze/stream', json={'analysis_type': 'time_series'})
+        
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'data: required field missing'
+    
+    def test_async_submit_and_poll(self, client, completions, sample_time_series_data):
+        """Test async=true answers 202 at once and the result can be polled."""
+        completions.delay = 0.1
+        response = client.post('/api/v1/analyze', json={
+            'data': sample_time_series_data,
+            'analysis_type': 'time_series',
+            'async': True
+        })
+        
+        pending = response.get_json()
+        assert response.status_code == 202
+        assert pending['status'] == 'queued'
+        assert response.headers['Location'] == f"/api/v1/analyses/{pending['id']}"
+        
+        for _ in range(100):
+            body = client.get(f"/api/v1/analyses/{pending['id']}").get_json()
+            if body['status'] == 'completed':
+                break
+            time.sleep(0.02)
+        assert body['id'] == pending['id']
+        assert body['raw_data']['data_points'] == 4
+    
+    def test_async_query_parameter(self, client, sample_time_series_data):
+        """Test async can be requested in the query string."""
+        response = client.post('/api/v1/analyze?async=true', json={
+            'data': sample_time_series_data, 'analysis_type': 'time_series'
+        })
+        
+        assert response.status_code == 202
+    
+    def test_async_queue_full(self, service, completions, sample_time_series_data):
+        """Test a full job queue answers 503 with Retry-After."""
+        def full(*args, **kwargs):
+            raise QueueFull("100 analyses already queued")
+        service.jobs.submit = full
+        client = create_app(service).test_client()
+        
+        response = client.post('/api/v1/analyze?async=true', json={
+            'data': sample_time_series_data, 'analysis_type': 'time_series'
+        })
+        
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    
+    def test_unknown_analysis(self, client):
+        """Test polling an unknown id returns 404."""
+        response = client.get('/api/v1/analyses/analysis_0_0')
+        
+        assert response.status_code == 404
+        assert response.get_json() == {'error': 'Analysis not found'}
+    
+    def test_metrics_endpoint(self, service, sample_time_series_data):
+        """Test stage timings are exported in Prometheus text format."""
+        service.metrics = Metrics()
+        client = create_app(service).test_client()
+        client.post('/api/v1/analyze', json={
+            'data': sample_time_series_data, 'analysis_type': 'time_series'
+        })
+        
+        response = client.get('/metrics')
+        
+        text = response.get_data(as_text=True)
+        assert response.mimetype == 'text/plain'
+        assert 'neurobloom_service_stage_seconds_count{stage="openai"} 1' in text
+        assert 'neurobloom_service_stage_seconds_count{stage="serialization"} 1' in text
+
+
+class TestCompression:
+    """Test compressed request bodies and responses."""
+    
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    def test_compressed_request(self, client, sample_time_series_data, encoding):
+        """Test JSON bodies are decompressed before parsing."""
+        body = json.dumps({'data': sample_time_series_data, 'analysis_type': 'time_series'})
+        
+        response = client.post(
+            '/api/v1/analyze', data=compress(body.encode(), encoding),
+            content_type='application/json', headers={'Content-Encoding': encoding}
+        )
+        
+        assert response.status_code == 200
+        assert response.get_json()['raw_data']['data_points'] == 4
+    
+    def test_compressed_ndjson(self, service):
+        """Test streamed NDJSON bodies are decompressed line by line."""
+        client = create_app(service).test_client()
+        lines = [json.dumps({'analysis_type': 'time_series'})]
+        lines += [json.dumps({'timestamp': i, 'value': i % 7}) for i in range(3000)]
+        body = compress('\n'.join(lines).encode(), GZIP)
+        
+        response = client.post(
+            '/api/v1/analyze', data=body, content_type='application/x-ndjson',
+            headers={'Content-Encoding': GZIP}
+        )
+        
+        assert response.status_code == 200
+        assert response.get_json()['raw_data']['data_points'] == 3000
+    
+    def test_limit_applies_to_compressed_size(self, client):
+        """Test a body over MAX_CONTENT_LENGTH only once decompressed is accepted."""
+        body = json.dumps({'data': [{'value': 'x' * 100}] * 100, 'analysis_type': 'time_series'})
+        compressed = compress(body.encode(), GZIP)
+        assert len(compressed) < 4096 < len(body)
+        
+        response = client.post(
+            '/api/v1/analyze', data=compressed, content_type='application/json',
+            headers={'Content-Encoding': GZIP}
+        )
+        
+        assert response.status_code == 200
+    
+    def test_decompression_bomb(self, service):
+        """Test bodies expanding past max_decompressed_size are rejected with 413."""
+        client = create_app(service, max_decompressed_size=64 * 1024).test_client()
+        bomb = compress(b'[' + b' ' * (1024 * 1024) + b']', GZIP)
+        
+        response = client.post(
+            '/api/v1/analyze', data=bomb, content_type='application/json',
+            headers={'Content-Encoding': GZIP}
+        )
+        
+        assert response.status_code == 413
+        assert 'exceeds' in response.get_json()['error']
+    
+    def test_compressed_size_limit(self, client):
+        """Test compressed bodies over MAX_CONTENT_LENGTH are rejected up front."""
+        response = client.post(
+            '/api/v1/analyze', data=b'\0' * 5000, content_type='application/json',
+            headers={'Content-Encoding': GZIP}
+        )
+        
+        assert response.status_code == 413
+    
+    def test_corrupt_body(self, client):
+        """Test an undecodable body is a 400."""
+        response = client.post(
+            '/api/v1/analyze', data=b'not gzip', content_type='application/json',
+            headers={'Content-Encoding': GZIP}
+        )
+        
+        assert response.status_code == 400
+        assert 'Invalid gzip body' in response.get_json()['error']
+    
+    def test_unsupported_encoding(self, client):
+        """Test an unknown Content-Encoding is a 415."""
+        response = client.post(
+            '/api/v1/analyze', data=b'{}', content_type='application/json',
+            headers={'Content-Encoding': 'br'}
+        )
+        
+        assert response.status_code == 415
+    
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    def test_compressed_response(self, service, sample_time_series_data, encoding):
+        """Test large responses are compressed with the accepted encoding."""
+        client = create_app(service, compress_min_size=64).test_client()
+        
+        response = client.post('/api/v1/analyze', json={
+            'data': sample_time_series_data, 'analysis_type': 'time_series'
+        }, headers={'Accept-Encoding': encoding})
+        
+        assert response.headers['Content-Encoding'] == encoding
+        assert 'Accept-Encoding' in response.headers['Vary']
+        body = json.loads(decompress(response.get_data(), encoding))
+        assert body['status'] == 'completed'
+    
+    def test_small_response_uncompressed(self, client):
+        """Test responses under the threshold are sent as is."""
+        response = client.get('/health', headers={'Accept-Encoding': GZIP})
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['status'] == 'healthy'
+
+
+def test_cli_defaults():
+    """Test CLI options parse."""
+    args = build_parser().parse_args(['--workers', '3', '--port', '9000'])
+    
+    assert args.workers == 3
+    assert args.port == 9000
+    assert args.graceful_timeout == 30
+    assert args.compress_min_size == 1024
+
+
+def test_rate_limit_split_across_workers(monkeypatch):
+    """Test each worker gets an equal share of the API key's budget."""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_REQUESTS_PER_MINUTE', '600')
+    
+    limiter = service_from_env(workers=4).rate_limiter
+    
+    assert limiter.requests.capacity == 150
+    assert limiter.tokens.capacity == 10000
@@ -0,0 +1,346 @@
+"""Unit tests for the analysis service."""
+
+import asyncio
+import threading
+import time
+
+from src.neurobloom.cache import MemoryCache
+from src.neurobloom.metrics import Metrics
+from src.neurobloom.prompts import estimate_tokens
+from src.neurobloom.routing import ModelRouter, Tier
+from src.neurobloom.service import STAGE_SECONDS, InsightParser
+
+
+class TestProcessAnalysis:
+    """Test single analysis processing."""
+    
+    def test_completed(self, service, sample_time_series_data):
+        """Test insights are parsed from the completion."""
+        result = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert result["status"] == "completed"
+        assert result["insights"] == ["First insight", "Second insight", "Third insight"]
+        assert result["raw_data"]["data_points"] == 4
+        assert result["raw_data"]["model_used"] == "gpt-4"
+    
+    def test_generator_data(self, service, completions):
+        """Test generator data is ingested with only a sample kept."""
+        rows = ({"timestamp": i, "value": i * 2} for i in range(1000))
+        
+        result = service.process_analysis(rows, "time_series")
+        
+        prompt = completions.calls[0]["messages"][1]["content"]
+        assert result["raw_data"]["data_points"] == 1000
+        assert "rows: 1000" in prompt
+        assert '{"timestamp":4,"value":8}' in prompt
+        assert '{"timestamp":5,"value":10}' not in prompt
+    
+    def test_prompt_summarizes_columns(self, service, completions, sample_time_series_data):
+        """Test the prompt carries per-column statistics."""
+        service.process_analysis(sample_time_series_data, "time_series")
+        
+        prompt = completions.calls[0]["messages"][1]["content"]
+        assert "value (numeric, n=4): mean=137.5" in prompt
+        assert "category (categorical, n=4, 2 distinct): A=2, B=2" in prompt
+    
+    def test_prompt_fits_model_budget(self, service, completions):
+        """Test wide data is trimmed to the requested model's prompt budget."""
+        service.prompt_builder.budgets["gpt-3.5-turbo"] = 300
+        rows = [{f"feature_{c}": r * c for c in range(300)} for r in range(20)]
+        
+        service.process_analysis(rows, "classification", model="gpt-3.5-turbo")
+        service.process_analysis(rows, "classification", model="gpt-4")
+        
+        trimmed, full = (call["messages"][1]["content"] for call in completions.calls)
+        assert estimate_tokens(trimmed) <= 300
+        assert len(trimmed) < len(full)
+
+
+class TestResponseCache:
+    """Test cached analysis processing."""
+    
+    def test_repeat_served_from_cache(self, service, completions, sample_time_series_data):
+        """Test an identical request does not call OpenAI again."""
+        service.cache = MemoryCache()
+        
+        first = service.process_analysis(sample_time_series_data, "time_series")
+        second = service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert len(completions.calls) == 1
+        assert first["raw_data"]["cache_hit"] is False
+        assert second["raw_data"]["cache_hit"] is True
+        assert second["insights"] == first["insights"]
+        assert service.cache.stats == {"hits": 1, "misses": 1}
+    
+    def test_model_is_part_of_key(self, service, completions, sample_time_series_data):
+        """Test a different model misses the cache."""
+        service.cache = MemoryCache()
+        
+        service.process_analysis(sample_time_series_data, "time_series")
+        service.process_analysis(sample_time_series_data, "time_series", model="gpt-3.5-turbo")
+        
+        assert len(completions.calls) == 2
+    
+    def test_bypass_cache(self, service, completions, sample_time_series_data):
+        """Test bypass skips the lookup."""
+        service.cache = MemoryCache()
+        
+        service.process_analysis(sample_time_series_data, "time_series")
+        result = service.process_analysis(
+            sample_time_series_data, "time_series", bypass_cache=True
+        )
+        
+        assert len(completions.calls) == 2
+        assert result["raw_data"]["cache_hit"] is False
+
+
+class TestRouting:
+    """Test routed analysis processing."""
+    
+    def test_routed_tier_reported(self, service, completions, sample_time_series_data):
+        """Test routed results name their tier, including cached repeats and streams."""
+        service.cache = MemoryCache()
+        service.router = ModelRouter([Tier("fast", "gpt-3.5-turbo")])
+        
+        first = service.process_analysis(sample_time_series_data, "time_series")
+        second = service.process_analysis(sample_time_series_data, "time_series")
+        streamed = list(service.stream_analysis(sample_time_series_data, "time_series"))
+        
+        assert completions.calls[0]["model"] == "gpt-3.5-turbo"
+        assert len(completions.calls) == 1
+        for result in (first, second, streamed[-1]["result"]):
+            assert result["raw_data"]["tier"] == "fast"
+            assert result["raw_data"]["model_used"] == "gpt-3.5-turbo"
+
+
+class TestCoalescing:
+    """Test identical in-flight requests share one upstream call."""
+    
+    def test_threaded_callers(self, service, completions, sample_time_series_data):
+        """Test concurrent threads make one OpenAI call."""
+        completions.delay = 0.2
+        results = []
+        barrier = threading.Barrier(4)
+        
+        def worker():
+            barrier.wait()
+            results.append(service.process_analysis(sample_time_series_data, "time_series"))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(completions.calls) == 1
+        assert service.coalesced_count == 3
+        assert sum(r["raw_data"]["coalesced"] for r in results) == 3
+        assert len({r["id"] for r in results}) == 4
+    
+    def test_async_callers(self, service, completions, sample_time_series_data):
+        """Test concurrent coroutines make one OpenAI call."""
+        completions.delay = 0.2
+        
+        async def run():
+            return await asyncio.gather(*[
+                service.aprocess_analysis(sample_time_series_data, "time_series")
+                for _ in range(4)
+            ])
+        
+        results = asyncio.run(run())
+        
+        assert len(completions.calls) == 1
+        assert all(r["status"] == "completed" for r in results)
+        assert service.coalesced_count == 3
+    
+    def test_async_summary_off_event_loop(self, service, sample_time_series_data):
+        """Test the data is summarized on a worker thread, not the loop's."""
+        threads = []
+        prepare = service._prepare
+        service._prepare = lambda *args: threads.append(threading.get_ident()) or prepare(*args)
+        
+        async def run():
+            result = await service.aprocess_analysis(sample_time_series_data, "time_series")
+            return result, threading.get_ident()
+        
+        result, loop_thread = asyncio.run(run())
+        
+        assert result["status"] == "completed"
+        assert threads and threads[0] != loop_thread
+    
+    def test_different_models_not_coalesced(self, service, completions,
+                                            sample_time_series_data):
+        """Test requests for different models each call upstream."""
+        completions.delay = 0.1
+        
+        async def run():
+            return await asyncio.gather(
+                service.aprocess_analysis(sample_time_series_data, "time_series"),
+                service.aprocess_analysis(sample_time_series_data, "time_series",
+                                          model="gpt-3.5-turbo")
+            )
+        
+        asyncio.run(run())
+        
+        assert len(completions.calls) == 2
+        assert service.coalesced_count == 0
+
+
+class TestInsightParser:
+    """Test incremental bullet parsing."""
+    
+    def test_insights_complete_at_newline(self):
+        """Test an insight is emitted only once its line ends."""
+        parser = InsightParser()
+        
+        assert parser.feed("- Upward tr") == []
+        assert parser.feed("end\n- Weekly") == ["Upward trend"]
+        assert parser.close() == ["Weekly"]
+    
+    def test_skips_preamble_and_limits(self):
+        """Test filtering and the insight limit match the full parser."""
+        parser = InsightParser(limit=2)
+        
+        insights = parser.feed("Here are insights:\n\n- a\n* b\n• c\n") + parser.close()
+        
+        assert insights == ["a", "b"]
+
+
+class TestStreamAnalysis:
+    """Test streamed insight delivery."""
+    
+    def test_events(self, service, completions, sample_time_series_data):
+        """Test insights are yielded one by one before the result."""
+        events = list(service.stream_analysis(sample_time_series_data, "time_series"))
+        
+        assert events[:3] == [
+            {"index": 0, "insight": "First insight"},
+            {"index": 1, "insight": "Second insight"},
+            {"index": 2, "insight": "Third insight"},
+        ]
+        result = events[3]["result"]
+        assert result["status"] == "completed"
+        assert result["insights"] == ["First insight", "Second insight", "Third insight"]
+        assert completions.calls[0]["stream"] is True
+    
+    def test_served_from_cache(self, service, completions, sample_time_series_data):
+        """Test streamed insights fill the cache and replay from it."""
+        service.cache = MemoryCache()
+        
+        list(service.stream_analysis(sample_time_series_data, "time_series"))
+        events = list(service.stream_analysis(sample_time_series_data, "time_series"))
+        
+        assert len(completions.calls) == 1
+        assert events[-1]["result"]["raw_data"]["cache_hit"] is True
+        assert service.process_analysis(sample_time_series_data, "time_series")["insights"] == [
+            e["insight"] for e in events[:-1]
+        ]
+    
+    def test_failure_reported_in_result(self, service, completions, sample_time_series_data):
+        """Test errors end the stream with a failed result."""
+        def fail(**kwargs):
+            raise RuntimeError("boom")
+        completions.create = fail
+        
+        events = list(service.stream_analysis(sample_time_series_data, "time_series"))
+        
+        assert len(events) == 1
+        assert events[0]["result"]["status"] == "failed"
+        assert events[0]["result"]["raw_data"]["error"] == "boom"
+
+
+class TestBackgroundJobs:
+    """Test submit/poll processing."""
+    
+    def test_submit_then_poll(self, service, sample_time_series_data):
+        """Test a submitted analysis completes under the returned id."""
+        pending = service.submit_analysis(sample_time_series_data, "time_series")
+        
+        assert pending["status"] == "queued"
+        for _ in range(200):
+            result = service.get_analysis(pending["id"])
+            if result["status"] == "completed":
+                break
+            time.sleep(0.01)
+        assert result["id"] == pending["id"]
+        assert result["insights"] == ["First insight", "Second insight", "Third insight"]
+    
+    def test_unknown_id(self, service):
+        """Test unknown analyses are reported as missing."""
+        assert service.get_analysis("analysis_0_0") is None
+
+
+class TestMetrics:
+    """Test per-stage timings."""
+    
+    def test_stage_spans(self, service, sample_time_series_data):
+        """Test each hot-path stage is timed once per analysis."""
+        service.metrics = Metrics()
+        
+        service.process_analysis(sample_time_series_data, "time_series")
+        
+        for stage in ("summarize", "prompt", "openai", "parse", "confidence"):
+            assert service.metrics.histogram(STAGE_SECONDS, stage=stage).count == 1
+        assert service.metrics.counter(
+            "neurobloom_service_openai_attempts_total", model="gpt-4"
+        ) == 1
+    
+    def test_cache_hit_skips_openai_span(self, service, sample_time_series_data):
+        """Test cached analyses do not record OpenAI timings."""
+        service.cache = MemoryCache()
+        service.metrics = Metrics()
+        
+        service.process_analysis(sample_time_series_data, "time_series")
+        service.process_analysis(sample_time_series_data, "time_series")
+        
+        assert service.metrics.histogram(STAGE_SECONDS, stage="openai").count == 1
+        assert service.metrics.histogram(STAGE_SECONDS, stage="confidence").count == 2
+
+
+class TestProcessBatch:
+    """Test batch analysis processing."""
+    
+    def test_results_in_order(self, service, completions, sample_time_series_data,
+                              sample_classification_data):
+        """Test each item gets a result at its own index."""
+        batch = service.process_batch([
+            {"data": sample_time_series_data, "analysis_type": "time_series"},
+            {"data": sample_classification_data, "analysis_type": "classification",
+             "model": "gpt-3.5-turbo"}
+        ])
+        
+        results = batch["results"]
+        assert [r["index"] for r in results] == [0, 1]
+        assert results[0]["result"]["raw_data"]["data_points"] == 4
+        assert results[1]["result"]["raw_data"]["model_used"] == "gpt-3.5-turbo"
+        assert results[0]["result"]["id"] != results[1]["result"]["id"]
+        assert len(completions.calls) == 2
+    
+    def test_per_item_errors(self, service):
+        """Test malformed items are reported without failing the batch."""
+        batch = service.process_batch([
+            {"analysis_type": "time_series"},
+            {"data": [{"x": 1}], "analysis_type": "time_series"}
+        ])
+        
+        assert batch["results"][0] == {"index": 0, "error": "Missing required fields"}
+        assert batch["results"][1]["result"]["status"] == "completed"
+    
+    def test_items_validated_like_single_requests(self, service, completions):
+        """Test wrongly typed items get the single-request validation error."""
+        batch = service.process_batch([
+            {"data": "not rows", "analysis_type": "time_series"},
+            {"data": [1, 2], "analysis_type": "time_series"},
+            {"data": [{"x": 1}], "analysis_type": 7},
+        ])
+        
+        assert [r["error"] for r in batch["results"]] == [
+            "requests[0].data: expected list, got str",
+            "requests[1].data[0]: expected object, got int",
+            "requests[2].analysis_type: expected str, got int",
+        ]
+        assert completions.calls == []
+    
+    def test_empty_batch(self, service):
+        """Test an empty batch returns no results."""
+        assert service.process_batch([]) == {"results": []}
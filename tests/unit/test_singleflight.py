@@ -0,0 +1,115 @@
+"""Unit tests for request coalescing."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from src.neurobloom.singleflight import SingleFlight
+
+
+def _slow(calls, value, delay=0.1):
+    calls.append(value)
+    time.sleep(delay)
+    return value
+
+
+class TestSingleFlight:
+    """Test single-flight execution."""
+    
+    def test_threads_share_one_call(self):
+        """Test concurrent threads with one key run the function once."""
+        flight = SingleFlight()
+        calls, results = [], []
+        barrier = threading.Barrier(5)
+        
+        def worker():
+            barrier.wait()
+            results.append(flight.do("k", _slow, calls, "v"))
+        
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert calls == ["v"]
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert flight.coalesced == 4
+    
+    def test_distinct_keys_not_coalesced(self):
+        """Test different keys each run."""
+        flight = SingleFlight()
+        calls = []
+        
+        flight.do("a", _slow, calls, 1, 0)
+        flight.do("b", _slow, calls, 2, 0)
+        
+        assert calls == [1, 2]
+        assert flight.coalesced == 0
+    
+    def test_sequential_calls_not_coalesced(self):
+        """Test a finished call is not reused."""
+        flight = SingleFlight()
+        calls = []
+        
+        flight.do("k", _slow, calls, 1, 0)
+        flight.do("k", _slow, calls, 1, 0)
+        
+        assert len(calls) == 2
+    
+    def test_exception_shared(self):
+        """Test followers receive the leader's exception."""
+        flight = SingleFlight()
+        errors = []
+        started = threading.Event()
+        
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+        
+        def follower():
+            started.wait()
+            try:
+                flight.do("k", failing)
+            except RuntimeError as e:
+                errors.append(str(e))
+        
+        t = threading.Thread(target=follower)
+        t.start()
+        with pytest.raises(RuntimeError):
+            flight.do("k", failing)
+        t.join()
+        
+        assert errors == ["upstream down"]
+    
+    def test_async_callers_share_one_call(self):
+        """Test asyncio callers coalesce onto one executor call."""
+        flight = SingleFlight()
+        calls = []
+        
+        async def run():
+            return await asyncio.gather(*[
+                flight.do_async("k", _slow, calls, "v") for _ in range(5)
+            ])
+        
+        results = asyncio.run(run())
+        
+        assert calls == ["v"]
+        assert [value for value, _ in results] == ["v"] * 5
+        assert flight.coalesced == 4
+    
+    def test_async_follows_threaded_leader(self):
+        """Test an async caller joins a call started by a thread."""
+        flight = SingleFlight()
+        calls = []
+        
+        leader = threading.Thread(target=flight.do, args=("k", _slow, calls, "v", 0.3))
+        leader.start()
+        time.sleep(0.05)
+        value, shared = asyncio.run(flight.do_async("k", _slow, calls, "other"))
+        leader.join()
+        
+        assert (value, shared) == ("v", True)
+        assert calls == ["v"]
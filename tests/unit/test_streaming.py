@@ -0,0 +1,66 @@
+"""Unit tests for NDJSON streaming helpers."""
+
+import pytest
+from src.neurobloom.models import AnalysisRequest
+from src.neurobloom.streaming import decode_ndjson, encode_ndjson, sample_rows
+
+
+class TestNDJSONRoundTrip:
+    """Test encoding and decoding streamed requests."""
+    
+    def test_round_trip(self):
+        """Test rows survive encode/decode in order."""
+        rows = ({"i": i} for i in range(1200))
+        request = AnalysisRequest(data=rows, analysis_type="time_series")
+        
+        chunks = list(encode_ndjson(request, chunk_rows=500))
+        lines = b"".join(chunks).splitlines()
+        header, decoded = decode_ndjson(lines)
+        
+        assert len(chunks) == 4  # header + 3 row chunks
+        assert header == {"analysis_type": "time_series", "model": "gpt-4"}
+        assert [row["i"] for row in decoded] == list(range(1200))
+    
+    def test_encode_is_lazy(self):
+        """Test the generator is not drained up front."""
+        consumed = []
+        
+        def rows():
+            for i in range(10):
+                consumed.append(i)
+                yield {"i": i}
+        
+        chunks = encode_ndjson(AnalysisRequest(data=rows(), analysis_type="x"), chunk_rows=2)
+        next(chunks)
+        next(chunks)
+        
+        assert consumed == [0, 1]
+    
+    def test_empty_body(self):
+        """Test an empty body is rejected."""
+        with pytest.raises(ValueError):
+            decode_ndjson([])
+
+
+class TestSampleRows:
+    """Test incremental ingestion."""
+    
+    def test_generator(self):
+        """Test sample and count from a generator."""
+        sample, count = sample_rows(({"i": i} for i in range(100)), sample_size=3)
+        
+        assert sample == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert count == 100
+    
+    def test_list(self):
+        """Test lists are sliced without iteration."""
+        sample, count = sample_rows([{"i": 1}, {"i": 2}], sample_size=5)
+        
+        assert sample == [{"i": 1}, {"i": 2}]
+        assert count == 2
+
+
+def test_request_is_streaming():
+    """Test lists are sent inline and iterables are streamed."""
+    assert not AnalysisRequest(data=[], analysis_type="x").is_streaming
+    assert AnalysisRequest(data=iter([]), analysis_type="x").is_streaming
@@ -0,0 +1,138 @@
+"""Unit tests for columnar dataset summaries."""
+
+import math
+
+import numpy as np
+import pytest
+from src.neurobloom.summary import DataSummarizer, summarize
+
+
+class TestSummarize:
+    """Test row-based summaries."""
+    
+    def test_numeric_stats(self):
+        """Test mean, std, range and trend of a numeric column."""
+        rows = [{"value": v} for v in [1.0, 2.0, 3.0, 4.0]]
+        
+        column = summarize(rows).numeric["value"]
+        
+        assert column.count == 4
+        assert column.mean == pytest.approx(2.5)
+        assert column.std == pytest.approx(np.std([1, 2, 3, 4]))
+        assert (column.minimum, column.maximum) == (1.0, 4.0)
+        assert column.slope == pytest.approx(1.0)
+    
+    def test_chunked_merge_matches_single_pass(self):
+        """Test merging chunks gives the same statistics as one chunk."""
+        rows = [{"value": (i * 37) % 101 + 0.5 * i} for i in range(1000)]
+        
+        whole = DataSummarizer(chunk_rows=10000)
+        whole.update(rows)
+        chunked = DataSummarizer(chunk_rows=7)
+        chunked.update(iter(rows))
+        
+        a, b = whole.numeric["value"], chunked.numeric["value"]
+        assert b.mean == pytest.approx(a.mean)
+        assert b.std == pytest.approx(a.std)
+        assert b.slope == pytest.approx(a.slope)
+    
+    def test_missing_values_skipped(self):
+        """Test rows without a column do not count toward it."""
+        rows = [{"value": 1}, {"other": "x"}, {"value": 3}]
+        
+        summary = summarize(rows)
+        
+        assert summary.rows == 3
+        assert summary.numeric["value"].count == 2
+        assert summary.categorical["other"].count == 1
+    
+    def test_seasonality_hint(self):
+        """Test a periodic column reports its period."""
+        rows = [{"value": math.sin(2 * math.pi * i / 7)} for i in range(500)]
+        
+        assert summarize(rows).numeric["value"].period() == 7
+    
+    def test_no_seasonality_for_linear_data(self):
+        """Test a straight line has no period."""
+        rows = [{"value": float(i)} for i in range(500)]
+        
+        assert summarize(rows).numeric["value"].period() is None
+    
+    def test_categories_and_cardinality_cap(self):
+        """Test category counts and the distinct-value cap."""
+        summarizer = DataSummarizer(max_distinct=10)
+        summarizer.update({"label": "AB"[i % 2], "id": f"row-{i}"} for i in range(100))
+        summary = summarizer.summary()
+        
+        assert dict(summary.categorical["label"].counts) == {"A": 50, "B": 50}
+        assert summary.categorical["id"].high_cardinality
+        assert "id (categorical, n=100, >10 distinct)" in summary.to_prompt()
+    
+    def test_mixed_column_keeps_earlier_chunks(self):
+        """Test non-numeric values in a numeric column do not drop earlier stats."""
+        summarizer = DataSummarizer(chunk_rows=10)
+        summarizer.update([{"v": i} for i in range(20)] + [{"v": "n/a"}, {"v": 20}] * 5)
+        summary = summarizer.summary()
+        
+        assert summary.numeric["v"].count == 25
+        assert summary.numeric["v"].maximum == 20
+        assert dict(summary.categorical["v"].counts) == {"n/a": 5}
+        assert "v (non-numeric, n=5, 1 distinct): n/a=5" in summary.to_prompt()
+    
+    def test_missing_chunk_keeps_numeric_column(self):
+        """Test a chunk of only missing values adds no non-numeric twin."""
+        summarizer = DataSummarizer(chunk_rows=3)
+        summarizer.update([{"a": 1}, {"a": 2}, {"a": 3}, {"a": None}, {"b": 1}, {"b": 2}])
+        summary = summarizer.summary()
+        
+        assert "a" not in summary.categorical
+        assert summary.numeric["a"].count == 3
+        assert "non-numeric" not in summary.to_prompt()
+    
+    def test_column_typed_by_first_present_value(self):
+        """Test a column missing from the first chunk is typed by later values."""
+        summarizer = DataSummarizer(chunk_rows=2)
+        summarizer.update([{"a": None, "b": 0}, {"b": 1}] + [{"a": i, "b": i} for i in range(4)])
+        summary = summarizer.summary()
+        
+        assert "a" not in summary.categorical
+        assert summary.numeric["a"].count == 4
+        assert summary.numeric["a"].maximum == 3
+    
+    def test_period_computed_once(self, monkeypatch):
+        """Test repeated prompt renders reuse the column's period."""
+        summary = summarize([{"value": math.sin(2 * math.pi * i / 7)} for i in range(500)])
+        column = summary.numeric["value"]
+        calls = []
+        compute = column._period
+        monkeypatch.setattr(column, "_period", lambda m: calls.append(m) or compute(m))
+        
+        for _ in range(6):
+            assert "seasonality~7 rows" in summary.to_prompt()
+        
+        assert len(calls) == 1
+    
+    def test_prompt_size_is_bounded(self):
+        """Test prompt length does not grow with row count."""
+        small = summarize({"v": i, "c": "xyz"[i % 3]} for i in range(100)).to_prompt()
+        large = summarize({"v": i, "c": "xyz"[i % 3]} for i in range(100000)).to_prompt()
+        
+        assert len(large) < len(small) + 50
+
+
+class TestUpdateColumns:
+    """Test already-columnar input."""
+    
+    def test_numpy_columns(self):
+        """Test NumPy columns are summarized without row conversion."""
+        summarizer = DataSummarizer(sample_size=2)
+        summarizer.update_columns({
+            "value": np.arange(10, dtype=np.int64),
+            "label": np.array(["a", "b"] * 5)
+        })
+        summary = summarizer.summary()
+        
+        assert summary.rows == 10
+        assert summary.numeric["value"].slope == pytest.approx(1.0)
+        assert dict(summary.categorical["label"].counts) == {"a": 5, "b": 5}
+        assert summary.sample == [{"value": 0, "label": "a"}, {"value": 1, "label": "b"}]